@@ -0,0 +1,345 @@
+import os
+import sqlite3
+import hashlib
+import cPickle
+from collections import OrderedDict
+
+import pandas as pd
+
+import hdf5
+from cache import LRUCache
+from frames import LazyFrame
+from profiling import profiler
+
+INDEX_DIR = os.path.join(os.path.expanduser('~'), '.pandas_viewer', 'archive')
+EXTENSIONS = ('.pickle', '.csv', '.h5', '.hdf5', '.npy', '.npz')
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, size INTEGER, mtime REAL, error TEXT);
+CREATE TABLE IF NOT EXISTS nodes (
+    path TEXT, node BLOB, kind TEXT, columns BLOB, rows INTEGER, start TEXT,
+    stop TEXT);
+CREATE INDEX IF NOT EXISTS nodes_path ON nodes (path);
+'''
+
+
+class ArchiveIndex(object):
+    """SQLite index of the frames in every file under a directory, with the
+    size, mtime, keys, columns and index range of each, so that the archive
+    can be browsed without loading any file.  Rescans only describe the files
+    whose size or mtime changed
+
+    """
+
+    commit_files = 100
+    cache_files = 4
+
+    def __init__(self, root, index_dir=None):
+        """Initiate the index of the directory root
+
+        Parameters
+        ----------
+        root: str
+            The directory of the archive
+        index_dir: str, optional
+            The directory holding the index of each archive, defaults to
+            INDEX_DIR
+
+        Returns
+        -------
+        ArchiveIndex
+        """
+        self.root = os.path.abspath(root)
+        index_dir = INDEX_DIR if index_dir is None else index_dir
+        self.db_path = os.path.join(
+            index_dir, hashlib.sha1(self.root).hexdigest() + '.sqlite')
+        self.loaded = LRUCache(self.cache_files)
+
+    def connect(self):
+        """Return a connection to the index, creating it if it does not exist
+        """
+        if not os.path.exists(os.path.dirname(self.db_path)):
+            os.makedirs(os.path.dirname(self.db_path))
+        connection = sqlite3.connect(self.db_path)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def scan(self, progress=None, cancelled=None):
+        """Describe the files under root that are new or whose size or mtime
+        changed since the last scan and remove the files that no longer exist.
+        The index is committed every commit_files files, so a cancelled scan
+        is resumed by the next
+
+        Parameters
+        ----------
+        progress: callable, optional
+            Called with the integer percentage of the changed files described
+        cancelled: callable, optional
+            Called before each file is described, the scan is abandoned with
+            LoadCancelled if it returns True
+
+        Returns
+        -------
+        int
+            The number of files described
+        """
+        from loading import LoadCancelled
+        with profiler.span('scan_archive'):
+            found = find_files(self.root)
+            connection = self.connect()
+            try:
+                known = dict((path, (size, mtime)) for path, size, mtime in
+                             connection.execute(
+                                 'SELECT path, size, mtime FROM files'))
+                for path in set(known) - set(found):
+                    self._delete(connection, path)
+                changed = [path for path, stat in found.iteritems()
+                           if known.get(path) != stat]
+                changed.sort()
+                for n, path in enumerate(changed):
+                    if cancelled is not None and cancelled():
+                        raise LoadCancelled(self.root)
+                    self._describe(connection, path, found[path])
+                    if (n + 1) % self.commit_files == 0:
+                        connection.commit()
+                    if progress is not None:
+                        progress(100 * (n + 1) // len(changed))
+                connection.commit()
+            finally:
+                connection.close()
+        return len(changed)
+
+    def _delete(self, connection, path):
+        connection.execute('DELETE FROM files WHERE path = ?', (path,))
+        connection.execute('DELETE FROM nodes WHERE path = ?', (path,))
+
+    def _describe(self, connection, path, stat):
+        """Index the frames of the file at path, recording why in the error
+        of the file if it cannot be described, so one bad file does not
+        abandon the scan"""
+        self._delete(connection, path)
+        error = None
+        try:
+            records = describe(open_file(self._filepath(path)))
+            connection.executemany(
+                'INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(path, _dumps(node), kind, _dumps(columns), rows,
+                  _text(start), _text(stop))
+                 for node, kind, columns, rows, start, stop in records])
+        except Exception as e:
+            connection.execute('DELETE FROM nodes WHERE path = ?', (path,))
+            error = _text(_message(e)) or type(e).__name__
+        connection.execute('INSERT INTO files VALUES (?, ?, ?, ?)',
+                           (path,) + stat + (error,))
+
+    def _filepath(self, path):
+        if isinstance(self.root, str):
+            path = path.encode('utf-8')
+        return os.path.join(self.root, path)
+
+    def tree(self):
+        """Return the archive as nested dicts of folders and files holding an
+        ArchiveFrame per frame or series, built from the index alone
+
+        Returns
+        -------
+        OrderedDict
+        """
+        result = OrderedDict()
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                'SELECT path, node, kind, columns, rows, start, stop '
+                'FROM nodes ORDER BY path, rowid')
+            for path, node, kind, columns, n_rows, start, stop in rows:
+                keys = path.split('/') + list(cPickle.loads(str(node)))
+                folder = result
+                for key in keys[:-1]:
+                    folder = folder.setdefault(key, OrderedDict())
+                folder[keys[-1]] = ArchiveFrame(
+                    self, path, keys[len(path.split('/')):],
+                    cPickle.loads(str(columns)), kind == 'series', n_rows,
+                    start, stop)
+        finally:
+            connection.close()
+        return result
+
+    def load(self, path):
+        """Load the file at path, relative to root, keeping the last
+        cache_files files loaded
+
+        Parameters
+        ----------
+        path: str
+
+        Returns
+        -------
+        object
+        """
+        from loading import load_file
+        obj = self.loaded.get(path)
+        if obj is None:
+            obj = load_file(self._filepath(path))
+            self.loaded[path] = obj
+        return obj
+
+
+class ArchiveFrame(LazyFrame):
+    """Frame or series of an archived file, known from the index of the
+    archive.  The file is only loaded when the values are read
+
+    """
+
+    def __init__(self, archive, path, node, columns, series=False, rows=None,
+                 start=None, stop=None):
+        """Initiate the frame from its record in the index
+
+        Parameters
+        ----------
+        archive: ArchiveIndex
+            The index of the archive
+        path: str
+            The path of the file relative to the root of the archive
+        node: list
+            The keys of the frame in the object of the file
+        columns: list
+            The column names
+        series: bool
+            Whether the object is a pd.Series, which is shown as a leaf
+        rows: int, optional
+        start: str, optional
+            The first label of the index
+        stop: str, optional
+            The last label of the index
+
+        Returns
+        -------
+        ArchiveFrame
+        """
+        super(ArchiveFrame, self).__init__([] if series else columns)
+        self.archive = archive
+        self.path = path
+        self.node = list(node)
+        self.rows = rows
+        self.start = start
+        self.stop = stop
+
+    def read(self, columns=None, start=None, stop=None):
+        obj = self.archive.load(self.path)
+        for key in self.node:
+            obj = obj[key] if isinstance(obj, pd.Panel) else obj.get(key)
+        if isinstance(obj, LazyFrame):
+            return obj.read(columns, start, stop)
+        if isinstance(obj, pd.Series):
+            obj = obj.to_frame()
+        if columns is not None:
+            obj = obj[columns]
+        return obj.iloc[start:stop]
+
+
+def find_files(root):
+    """Return the size and mtime of every file with a loadable extension under
+    root keyed by its path relative to root, with '/' separators, as unicode
+
+    Parameters
+    ----------
+    root: str
+
+    Returns
+    -------
+    dict
+    """
+    result = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            if not filename.endswith(EXTENSIONS):
+                continue
+            filepath = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            path = os.path.relpath(filepath, root).replace(os.sep, '/')
+            result[_text(path)] = (stat.st_size, stat.st_mtime)
+    return result
+
+
+def open_file(filepath):
+    """Open filepath for describing, like load_file but without writing a
+    sidecar for pickles or csv files"""
+    from loading import load_file
+    return load_file(filepath, sidecar=False)
+
+
+def describe(obj, node=()):
+    """Yield the keys, kind, columns, number of rows and first and last index
+    label of each frame and series in obj
+
+    Parameters
+    ----------
+    obj: object
+        An object returned by load_file
+    node: tuple
+        The keys of obj
+
+    Returns
+    -------
+    generator((tuple, str, list, int, object, object))
+    """
+    if isinstance(obj, (dict, hdf5.H5Group)):
+        for key, value in obj.iteritems():
+            for record in describe(value, node + (key,)):
+                yield record
+    elif isinstance(obj, pd.Panel):
+        for itm in obj.items:
+            for record in describe(obj[itm], node + (itm,)):
+                yield record
+    elif isinstance(obj, (pd.DataFrame, pd.Series, LazyFrame)):
+        index = _index(obj)
+        if isinstance(obj, pd.Series):
+            kind, columns = 'series', [obj.name]
+        else:
+            kind, columns = 'frame', list(obj.columns)
+        if index is None or len(index) == 0:
+            yield node, kind, columns, None, None, None
+        else:
+            yield node, kind, columns, len(index), index[0], index[-1]
+
+
+def open_archive(root, progress=None, cancelled=None):
+    """Scan the archive at root and return its tree, see ArchiveIndex"""
+    index = ArchiveIndex(root)
+    index.scan(progress, cancelled)
+    return index.tree()
+
+
+def _index(obj):
+    if not isinstance(obj, LazyFrame):
+        return obj.index
+    try:
+        if isinstance(obj, hdf5.H5Frame):
+            return obj.read_index()
+        return obj.read([]).index
+    except Exception:
+        return None
+
+
+def _dumps(obj):
+    return sqlite3.Binary(cPickle.dumps(obj, cPickle.HIGHEST_PROTOCOL))
+
+
+def _text(label):
+    """Return label as unicode, byte strings are decoded as utf-8 with any
+    invalid bytes replaced"""
+    if label is None:
+        return None
+    if isinstance(label, str):
+        return label.decode('utf-8', 'replace')
+    return unicode(label)
+
+
+def _message(e):
+    try:
+        return unicode(e)
+    except UnicodeError:
+        return str(e)
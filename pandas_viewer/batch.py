@@ -0,0 +1,267 @@
+"""Resample every frame of a set of files to csv and render them to png
+without the gui, spreading the files over a process pool, e.g.
+
+    python -m pandas_viewer.batch /archive/random --output /tmp/out --freq H \
+        --agg mean --chart line
+"""
+import os
+import re
+import sys
+import time
+import argparse
+from multiprocessing import Pool, cpu_count
+
+import pandas as pd
+
+from pandas_viewer import hdf5, transform, plotting, decimate
+from pandas_viewer.archive import EXTENSIONS
+from pandas_viewer.frames import LazyFrame
+from pandas_viewer.loading import load_file
+
+
+class Job(object):
+    """The settings applied to every frame of every file"""
+
+    def __init__(self, output_dir, freq=None, agg=None, strip_zeros=False,
+                 csv=True, chart='line', decimation='minmax', size=(10, 6),
+                 dpi=100):
+        """Initiate the settings
+
+        Parameters
+        ----------
+        output_dir: str
+            The directory the csv and png files are written to
+        freq: str, optional
+            The frequency to resample to
+        agg: str, optional
+            The method of aggregation
+        strip_zeros: bool
+            Replace zeros with NaN
+        csv: bool
+            Write each frame to csv
+        chart: str, optional
+            One of plotting.CHART_TYPES, None writes no png
+        decimation: str, optional
+            One of decimate.METHODS, None plots every point
+        size: (float, float)
+            The size of each png in inches
+        dpi: int
+
+        Returns
+        -------
+        Job
+        """
+        self.output_dir = output_dir
+        self.freq = freq
+        self.agg = agg
+        self.strip_zeros = strip_zeros
+        self.csv = csv
+        self.chart = chart
+        self.decimation = decimation
+        self.size = size
+        self.dpi = dpi
+
+
+def find_files(paths):
+    """Return the files with a loadable extension in paths, searching
+    directories recursively
+
+    Parameters
+    ----------
+    paths: list(str)
+
+    Returns
+    -------
+    list(str)
+    """
+    result = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                result.extend(os.path.join(dirpath, filename)
+                              for filename in sorted(filenames)
+                              if filename.endswith(EXTENSIONS))
+        else:
+            result.append(path)
+    return result
+
+
+def iter_frames(obj, path=()):
+    """Yield the path and DataFrame of every frame in obj, Series are yielded
+    as single column frames and Panels as a frame per item
+
+    Parameters
+    ----------
+    obj: object
+        An object returned by load_file
+    path: tuple
+        The keys of obj
+
+    Returns
+    -------
+    generator((tuple, pd.DataFrame))
+    """
+    if isinstance(obj, (dict, hdf5.H5Group)):
+        for key, value in obj.iteritems():
+            for item in iter_frames(value, path + (key,)):
+                yield item
+    elif isinstance(obj, pd.Panel):
+        for itm in obj.items:
+            yield path + (itm,), obj[itm]
+    elif isinstance(obj, LazyFrame):
+        yield path, obj.read()
+    elif isinstance(obj, pd.DataFrame):
+        yield path, obj
+    elif isinstance(obj, pd.Series):
+        yield path, obj.to_frame()
+
+
+def output_name(filepath, path):
+    """Return the file name, without extension, for the frame at path in
+    filepath"""
+    name = '__'.join([os.path.splitext(os.path.basename(filepath))[0]] +
+                     [str(key) for key in path])
+    return re.sub(r'[^\w.-]', '_', name)
+
+
+def render(df, filepath, job):
+    """Plot df as the chart of job and save it to filepath as png
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+    filepath: str
+    job: Job
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=job.size, dpi=job.dpi)
+    FigureCanvasAgg(fig)
+    subplot = fig.add_subplot(111)
+    plotting.plot_frame(subplot, plotting.datenum(df.index), df.values,
+                        job.chart, job.decimation, int(job.size[0] * job.dpi))
+    subplot.legend(df.columns)
+    fig.savefig(filepath)
+
+
+def process_file(args):
+    """Load filepath and write the csv and png of each of its frames
+
+    Parameters
+    ----------
+    args: (str, Job)
+        The file to process and the settings
+
+    Returns
+    -------
+    (str, int, float, str)
+        The file, the number of files written, the time taken and the error
+        message if the file failed
+    """
+    filepath, job = args
+    start = time.time()
+    written = 0
+    try:
+        for path, df in iter_frames(load_file(filepath, sidecar=False)):
+            df = transform.derive(df, job.freq, job.agg, job.strip_zeros)
+            name = os.path.join(job.output_dir, output_name(filepath, path))
+            if job.csv:
+                df.to_csv(name + '.csv')
+                written += 1
+            if job.chart is not None and not df.empty:
+                render(df, name + '.png', job)
+                written += 1
+    except Exception as e:
+        return filepath, written, time.time() - start, str(e)
+    return filepath, written, time.time() - start, None
+
+
+def run(filepaths, job, processes=None, report=None):
+    """Process filepaths over a pool of processes, calling report with the
+    result of process_file for each file as it completes
+
+    Parameters
+    ----------
+    filepaths: list(str)
+    job: Job
+    processes: int, optional
+        The number of processes, defaults to the number of cores, 1 runs in
+        this process
+    report: callable, optional
+
+    Returns
+    -------
+    list
+        The results of process_file in the order completed
+    """
+    if not os.path.exists(job.output_dir):
+        os.makedirs(job.output_dir)
+    tasks = [(filepath, job) for filepath in filepaths]
+    processes = processes or cpu_count()
+    pool = None
+    if processes == 1 or len(tasks) < 2:
+        results = (process_file(task) for task in tasks)
+    else:
+        pool = Pool(min(processes, len(tasks)))
+        results = pool.imap_unordered(process_file, tasks)
+    completed = []
+    try:
+        for result in results:
+            completed.append(result)
+            if report is not None:
+                report(result)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return completed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+',
+                        help='files, or directories searched for files')
+    parser.add_argument('--output', required=True, help='output directory')
+    parser.add_argument('--freq', help='resample frequency, e.g. H')
+    parser.add_argument('--agg', default='mean',
+                        help='resample aggregation, e.g. mean, sum, last')
+    parser.add_argument('--strip-zeros', action='store_true')
+    parser.add_argument('--no-csv', dest='csv', action='store_false')
+    parser.add_argument('--chart', default='line',
+                        choices=plotting.CHART_TYPES + ('none',))
+    parser.add_argument('--decimation', default='minmax',
+                        choices=decimate.METHODS + ('none',))
+    parser.add_argument('--size', type=float, nargs=2, default=(10, 6),
+                        metavar=('WIDTH', 'HEIGHT'), help='png size in inches')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--processes', type=int, help='defaults to cores')
+    args = parser.parse_args(argv)
+    job = Job(args.output, args.freq, args.agg, args.strip_zeros, args.csv,
+              None if args.chart == 'none' else args.chart,
+              None if args.decimation == 'none' else args.decimation,
+              tuple(args.size), args.dpi)
+    filepaths = find_files(args.paths)
+    done = []
+    failed = []
+
+    def report(result):
+        filepath, written, elapsed, error = result
+        done.append(filepath)
+        if error is None:
+            print '[{}/{}] {}: {} files in {:.2f}s'.format(
+                len(done), len(filepaths), filepath, written, elapsed)
+        else:
+            failed.append(filepath)
+            print '[{}/{}] {}: failed, {}'.format(
+                len(done), len(filepaths), filepath, error)
+        sys.stdout.flush()
+
+    start = time.time()
+    run(filepaths, job, args.processes, report)
+    print '{} files in {:.2f}s, {} failed'.format(
+        len(filepaths), time.time() - start, len(failed))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """Bounded mapping that evicts the least recently used entries once the
+    total size of its values exceeds maxsize
+
+    """
+
+    def __init__(self, maxsize=128, sizeof=None):
+        """Initiate an empty cache
+
+        Parameters
+        ----------
+        maxsize: int
+            The maximum total size of the cached values
+        sizeof: callable, optional
+            Function returning the size of a value, defaults to counting each
+            value as 1 so that maxsize is the maximum number of entries
+
+        Returns
+        -------
+        LRUCache
+        """
+        self.maxsize = maxsize
+        self.sizeof = sizeof if sizeof is not None else (lambda value: 1)
+        self.currsize = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        value = self._data.pop(key)
+        self._data[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._data:
+            self.pop(key)
+        size = self.sizeof(value)
+        if size > self.maxsize:
+            return
+        self._data[key] = value
+        self._sizes[key] = size
+        self.currsize += size
+        while self.currsize > self.maxsize:
+            self.pop(next(iter(self._data)))
+
+    def get(self, key, default=None):
+        """Return the value for key, marking it as most recently used, or
+        default if key is not cached
+
+        Parameters
+        ----------
+        key: hashable
+            The key to lookup
+        default: object, optional
+            The value returned if key is not in the cache
+
+        Returns
+        -------
+        object
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, default=None):
+        """Remove key from the cache and return its value
+
+        Parameters
+        ----------
+        key: hashable
+            The key to remove
+        default: object, optional
+            The value returned if key is not in the cache
+
+        Returns
+        -------
+        object
+        """
+        if key not in self._data:
+            return default
+        self.currsize -= self._sizes.pop(key)
+        return self._data.pop(key)
+
+    def keys(self):
+        """Return the cached keys from least to most recently used"""
+        return list(self._data.keys())
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        self._data.clear()
+        self._sizes.clear()
+        self.currsize = 0
@@ -0,0 +1,147 @@
+import csv
+
+import numpy as np
+import pandas as pd
+
+from frames import LazyFrame
+from sidecar import SidecarFrame
+
+
+class CSVFrame(LazyFrame):
+    """Lazy DataFrame backed by a csv file with the index in the first column.
+    Only the header and a sample of rows are read up front, columns are
+    parsed chunksize rows at a time when requested
+
+    """
+
+    chunksize = 2 ** 16
+    sample_rows = 1000
+    sniff_bytes = 2 ** 16
+
+    def __init__(self, filepath, sidecar=None):
+        """Sniff the header, dtypes and index of filepath
+
+        Parameters
+        ----------
+        filepath: str
+            The path of the csv file
+        sidecar: Sidecar, optional
+            Cache of the parsed columns, columns already in the cache are
+            memory-mapped instead of parsed and columns parsed in full are
+            added to it
+
+        Returns
+        -------
+        CSVFrame
+        """
+        self.filepath = filepath
+        self.sidecar = sidecar
+        meta = None if sidecar is None else sidecar.read_meta()
+        self.cached_index, self.cached_arrays = (None, {}) if meta is None \
+            else meta[1:]
+        with open(filepath, 'rb') as f:
+            text = f.read(self.sniff_bytes)
+        try:
+            self.header = 0 if csv.Sniffer().has_header(text) else None
+        except csv.Error:
+            self.header = 0
+        sample = pd.read_csv(filepath, header=self.header, index_col=0,
+                             nrows=self.sample_rows)
+        self.dtypes = {}
+        for column, ts in sample.iteritems():
+            if ts.dtype.kind == 'f':
+                self.dtypes[column] = np.float64
+        self.parse_dates = False
+        if sample.index.dtype.kind not in 'biuf':
+            try:
+                pd.to_datetime(sample.index)
+            except (ValueError, TypeError):
+                pass
+            else:
+                self.parse_dates = True
+        super(CSVFrame, self).__init__(sample.columns)
+        self._positions = dict((c, i + 1) for i, c in enumerate(self.columns))
+
+    def read(self, columns=None, start=None, stop=None):
+        """Parse columns for rows start to stop into a pd.DataFrame, reading
+        chunksize rows at a time so that only the selected columns are held
+        in memory
+
+        Parameters
+        ----------
+        columns: list, optional
+            The columns to read, defaults to every column
+        start: int, optional
+        stop: int, optional
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        if columns is None:
+            columns = self.columns
+        if self.cached_index is not None and all(
+                c in self.cached_arrays for c in columns):
+            try:
+                return SidecarFrame(
+                    self.sidecar, columns, self.cached_arrays,
+                    self.sidecar.decode_index(self.cached_index)).read(
+                    columns, start, stop)
+            except IOError:
+                # the entry has been removed, parse the file again
+                self.cached_index, self.cached_arrays = None, {}
+        try:
+            result = self._parse(columns, start, stop)
+        except ValueError:
+            # a value past the sample is not a float, parse the columns
+            # without a dtype from now on
+            for column in columns:
+                self.dtypes.pop(column, None)
+            result = self._parse(columns, start, stop)
+        if result is None:
+            return pd.DataFrame(columns=columns)
+        if self.parse_dates:
+            try:
+                result.index = pd.to_datetime(result.index)
+            except (ValueError, TypeError):
+                self.parse_dates = False
+        if self.sidecar is not None and start is None and stop is None:
+            self.cache(result)
+        return result
+
+    def _parse(self, columns, start, stop):
+        usecols = [0] + [self._positions[c] for c in columns]
+        skip = 0 if start is None else start
+        first_row = 0 if self.header is None else 1
+        chunks = pd.read_csv(
+            self.filepath, header=self.header, index_col=0, usecols=usecols,
+            dtype=dict((c, self.dtypes[c]) for c in columns
+                       if c in self.dtypes),
+            skiprows=range(first_row, first_row + skip),
+            nrows=None if stop is None else max(stop - skip, 0),
+            chunksize=self.chunksize)
+        result = list(chunks)
+        if not result:
+            return None
+        return pd.concat(result)[columns]
+
+    def cache(self, df):
+        """Add the columns of df, a full length read of the file, to the
+        sidecar
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+        """
+        try:
+            if self.cached_index is None:
+                self.cached_index = self.sidecar.encode_index(df.index)
+            for column, ts in df.iteritems():
+                if column not in self.cached_arrays and \
+                        ts.dtype.kind in 'biuf':
+                    self.cached_arrays[column] = self.sidecar.save_array(
+                        ts.values)
+            self.sidecar.write_meta(
+                ('csv', self.cached_index, self.cached_arrays))
+        except (IOError, OSError):
+            self.cached_index, self.cached_arrays = None, {}
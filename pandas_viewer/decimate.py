@@ -0,0 +1,125 @@
+import numpy as np
+
+METHODS = ('minmax', 'lttb')
+
+
+def minmax_indices(y, n_bins):
+    """Return the indices of the minimum and maximum of y in each of n_bins
+    equal width bins, plus the first and last point, so that the envelope of
+    the series is preserved exactly
+
+    Parameters
+    ----------
+    y: np.ndarray
+        1d array of values
+    n_bins: int
+        The number of bins to reduce y to
+
+    Returns
+    -------
+    np.ndarray
+        Sorted array of at most 2 * n_bins + 2 indices into y
+    """
+    n = len(y)
+    if n <= 2 * n_bins:
+        return np.arange(n)
+    bin_size = -(-n // n_bins)
+    n_bins = -(-n // bin_size)
+    padded = np.empty(n_bins * bin_size, dtype=float)
+    padded[:n] = y
+    padded[n:] = np.nan
+    padded = padded.reshape(n_bins, bin_size)
+    nan = np.isnan(padded)
+    offsets = np.arange(n_bins) * bin_size
+    lo = np.where(nan, np.inf, padded).argmin(axis=1) + offsets
+    hi = np.where(nan, -np.inf, padded).argmax(axis=1) + offsets
+    return np.unique(np.concatenate([[0, n - 1], lo, hi]))
+
+
+def lttb_indices(x, y, n_out):
+    """Return the indices of the points chosen by the Largest-Triangle-Three-
+    Buckets algorithm, which keeps the visual shape of the series with n_out
+    points
+
+    Parameters
+    ----------
+    x: np.ndarray
+        1d array of monotonically increasing x values
+    y: np.ndarray
+        1d array of values
+    n_out: int
+        The number of points to keep
+
+    Returns
+    -------
+    np.ndarray
+        Sorted array of n_out indices into y
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    result = np.empty(n_out, dtype=int)
+    result[0] = 0
+    result[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_stop = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_stop = n - 1, n
+        cx = x[next_start:next_stop].mean()
+        cy = y[next_start:next_stop].mean()
+        area = np.abs((x[a] - cx) * (y[start:stop] - y[a]) -
+                      (x[a] - x[start:stop]) * (cy - y[a]))
+        a = start + area.argmax()
+        result[i + 1] = a
+    return result
+
+
+def decimate(x, y, n_pixels, method='minmax'):
+    """Return the indices of the points of y needed to draw it at a width of
+    n_pixels
+
+    Parameters
+    ----------
+    x: np.ndarray
+        1d array of monotonically increasing x values
+    y: np.ndarray
+        1d array of values
+    n_pixels: int
+        The width of the plot in pixels
+    method: str
+        Either 'minmax' or 'lttb'
+
+    Returns
+    -------
+    np.ndarray
+    """
+    if method == 'minmax':
+        return minmax_indices(y, n_pixels)
+    elif method == 'lttb':
+        return lttb_indices(x, y, 2 * n_pixels)
+    else:
+        raise ValueError('Decimation method %s not recognised' % method)
+
+
+def visible_slice(x, xlim):
+    """Return the slice of the sorted x that lies within xlim, including the
+    point either side so that lines reach the edges of the axes
+
+    Parameters
+    ----------
+    x: np.ndarray
+        1d array of monotonically increasing x values
+    xlim: (float, float)
+        The visible range of x
+
+    Returns
+    -------
+    slice
+    """
+    start = max(np.searchsorted(x, xlim[0]) - 1, 0)
+    stop = min(np.searchsorted(x, xlim[1], side='right') + 1, len(x))
+    return slice(start, stop)
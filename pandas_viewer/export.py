@@ -0,0 +1,200 @@
+import os
+import shutil
+import zipfile
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import hdf5
+import pickling
+
+CHUNK_ROWS = 2 ** 16
+FORMATS = ('.csv', '.npy', '.npz', '.h5', '.hdf5', '.pickle')
+
+
+class ExportCancelled(Exception):
+    """Raised from an export when it has been cancelled"""
+
+
+def export(df, filepath, progress=None, cancelled=None, chunk_rows=CHUNK_ROWS):
+    """Write df to filepath in the format of its extension, chunk_rows rows at
+    a time.  The file is written to a temporary file in the same directory
+    that is renamed to filepath once complete, so filepath is never left half
+    written
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        The dataframe to export
+    filepath: str
+        The path to write, with an extension in FORMATS
+    progress: callable, optional
+        Called with the integer percentage of rows written
+    cancelled: callable, optional
+        Called after each chunk, the export is abandoned with ExportCancelled
+        if it returns True
+    chunk_rows: int
+        The number of rows written at a time
+    """
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError('Export format %s not implemented' % ext)
+    rows = max(len(df), 1)
+
+    def step(written):
+        if cancelled is not None and cancelled():
+            raise ExportCancelled(filepath)
+        if progress is not None:
+            progress(100 * written // rows)
+
+    fd, temp_filepath = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(filepath)), suffix='.tmp')
+    os.close(fd)
+    try:
+        if ext == '.csv':
+            write_csv(df, temp_filepath, step, chunk_rows)
+        elif ext == '.npy':
+            write_npy(df, temp_filepath, step, chunk_rows)
+        elif ext == '.npz':
+            write_npz(df, temp_filepath, step, chunk_rows)
+        elif ext in ('.h5', '.hdf5'):
+            write_hdf5(df, temp_filepath, step, chunk_rows)
+        else:
+            pickling.dump_packed(df, temp_filepath)
+            step(len(df))
+        if os.name == 'nt' and os.path.exists(filepath):
+            os.remove(filepath)
+        os.rename(temp_filepath, filepath)
+    except BaseException:
+        os.remove(temp_filepath)
+        raise
+
+
+def write_csv(df, filepath, step, chunk_rows=CHUNK_ROWS):
+    with open(filepath, 'w') as f:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            stop = min(start + chunk_rows, len(df))
+            df.iloc[start:stop].to_csv(f, header=start == 0)
+            step(stop)
+
+
+def write_npy(df, filepath, step, chunk_rows=CHUNK_ROWS):
+    """Write df as a structured array with an index field and a field per
+    column, read back by read_npy"""
+    index = _index_values(df.index)
+    columns = [_values(df.iloc[:, i]) for i in range(len(df.columns))]
+    dtype = np.dtype([('index', index.dtype)] +
+                     [(str(c), values.dtype)
+                      for c, values in zip(df.columns, columns)])
+    array = np.lib.format.open_memmap(filepath, mode='w+', dtype=dtype,
+                                      shape=(len(df),))
+    try:
+        for start in range(0, len(df), chunk_rows):
+            stop = min(start + chunk_rows, len(df))
+            array['index'][start:stop] = index[start:stop]
+            for name, values in zip(dtype.names[1:], columns):
+                array[name][start:stop] = values[start:stop]
+            step(stop)
+        array.flush()
+    finally:
+        del array
+
+
+def write_npz(df, filepath, step, chunk_rows=CHUNK_ROWS):
+    """Write df as an uncompressed npz of the index, the column names and an
+    array per column, read back by read_npz"""
+    temp_dir = tempfile.mkdtemp(dir=os.path.dirname(filepath))
+    try:
+        members = [('index', _index_values(df.index)),
+                   ('columns', np.array([str(c) for c in df.columns]))]
+        members += [('c{}'.format(i), _values(df.iloc[:, i]))
+                    for i in range(len(df.columns))]
+        with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_STORED,
+                             allowZip64=True) as z:
+            for n, (name, values) in enumerate(members):
+                member = os.path.join(temp_dir, name + '.npy')
+                array = np.lib.format.open_memmap(
+                    member, mode='w+', dtype=values.dtype, shape=values.shape)
+                for start in range(0, len(values), chunk_rows):
+                    stop = min(start + chunk_rows, len(values))
+                    array[start:stop] = values[start:stop]
+                array.flush()
+                del array
+                z.write(member, name + '.npy')
+                os.remove(member)
+                step(len(df) * (n + 1) // len(members))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def write_hdf5(df, filepath, step, chunk_rows=CHUNK_ROWS):
+    """Write df as the frame 'data' read lazily by hdf5.H5Frame"""
+    import h5py
+    with h5py.File(filepath, 'w') as f:
+        hdf5.write_frame(f, 'data', df, chunk_rows, progress=step)
+
+
+def read_npy(filepath):
+    """Read a DataFrame written by write_npy
+
+    Parameters
+    ----------
+    filepath: str
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    array = np.load(filepath, mmap_mode='r')
+    names = array.dtype.names
+    if names is None or names[0] != 'index':
+        return _frame(np.asarray(array))
+    return pd.DataFrame(dict((name, array[name]) for name in names[1:]),
+                        index=_index(array['index']), columns=names[1:])
+
+
+def read_npz(filepath):
+    """Read a DataFrame written by write_npz
+
+    Parameters
+    ----------
+    filepath: str
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    with np.load(filepath) as npz:
+        if 'columns' not in npz.files:
+            return dict((name, _frame(npz[name])) for name in npz.files)
+        columns = list(npz['columns'])
+        data = dict((c, npz['c{}'.format(i)]) for i, c in enumerate(columns))
+        return pd.DataFrame(data, index=_index(npz['index']), columns=columns)
+
+
+def _values(ts):
+    values = np.asarray(ts)
+    if values.dtype.kind == 'O':
+        values = values.astype(unicode)
+    return values
+
+
+def _index_values(index):
+    if isinstance(index, pd.DatetimeIndex) and index.tz is None:
+        return index.values
+    return _values(index)
+
+
+def _frame(values):
+    if values.ndim == 1 and values.dtype.names is None:
+        return pd.Series(values)
+    if values.ndim == 2:
+        return pd.DataFrame(values)
+    return values
+
+
+def _index(values):
+    if values.dtype.kind == 'M':
+        return pd.DatetimeIndex(values)
+    return pd.Index(values)
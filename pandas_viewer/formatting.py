@@ -0,0 +1,166 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = '%d-%b-%y %H:%M'
+SAMPLE_ROWS = 256
+
+
+def format_index(index, date_format=DATE_FORMAT):
+    """Format every label of index to a string in one vectorized pass
+
+    Parameters
+    ----------
+    index: pd.Index
+        The index to format
+    date_format: str
+        The strftime format used for a pd.DatetimeIndex
+
+    Returns
+    -------
+    np.ndarray
+    """
+    if isinstance(index, pd.DatetimeIndex):
+        values = index.format(date_format=date_format)
+    else:
+        values = index.astype(str)
+    return np.asarray(values, dtype=object)
+
+
+def format_values(df):
+    """Format every value of df to a string, column by column, so that the
+    conversion is done by numpy rather than a python call per cell.  Datetime
+    and timedelta columns are formatted per cell by str, as numpy formats
+    them differently from pandas
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        The values to format
+
+    Returns
+    -------
+    np.ndarray
+        Array of str with the same shape as df
+    """
+    result = np.empty(df.shape, dtype=object)
+    for i in range(df.shape[1]):
+        ts = df.iloc[:, i]
+        if ts.dtype.kind in 'mM':
+            result[:, i] = [str(value) for value in ts]
+        else:
+            result[:, i] = ts.values.astype(str)
+    return result
+
+
+def format_block(df, start, stop, date_format=DATE_FORMAT, rows=None):
+    """Format rows start to stop of df with the index as the first column,
+    or the rows at positions rows[start:stop] of df if rows is given
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        The dataframe to format
+    start: int
+        The first row of the block
+    stop: int
+        The row after the last row of the block
+    date_format: str
+        The strftime format used for a pd.DatetimeIndex
+    rows: np.ndarray, optional
+        The positions of the rows of df in the order they are shown
+
+    Returns
+    -------
+    np.ndarray
+        Array of str with shape (stop - start, len(df.columns) + 1)
+    """
+    if rows is None:
+        block = df.iloc[start:stop]
+    else:
+        block = df.iloc[rows[start:stop]]
+    result = np.empty((len(block), len(df.columns) + 1), dtype=object)
+    result[:, 0] = format_index(block.index, date_format)
+    result[:, 1:] = format_values(block)
+    return result
+
+
+def sample_positions(n, size=SAMPLE_ROWS, seed=0):
+    """Return the sorted positions of about size of n rows: the first and last
+    quarter of size and rows at a fixed stride from a random offset between
+    them, or every row if there are no more than size
+
+    Parameters
+    ----------
+    n: int
+        The number of rows
+    size: int
+        The number of rows sampled
+    seed: int
+        The seed of the random offset, so the sample of n rows is repeatable
+
+    Returns
+    -------
+    np.ndarray
+    """
+    if n <= size:
+        return np.arange(n)
+    edge = size // 4
+    middle = size - 2 * edge
+    stride = (n - 2 * edge) // middle
+    offset = np.random.RandomState(seed).randint(stride)
+    return np.concatenate([np.arange(edge),
+                           edge + offset + stride * np.arange(middle),
+                           np.arange(n - edge, n)])
+
+
+def widest_string(strings):
+    """Return the longest of strings, byte strings are measured in
+    characters as UTF-8 with undecodable bytes counted as one each
+
+    Parameters
+    ----------
+    strings: np.ndarray
+        A sample of str or unicode values
+
+    Returns
+    -------
+    str
+    """
+    if len(strings) == 0:
+        return ''
+    lengths = [len(s.decode('utf-8', 'replace')) if isinstance(s, str)
+               else len(s) for s in strings]
+    return strings[int(np.argmax(lengths))]
+
+
+def widest_value(values, positions):
+    """Estimate the widest formatted value of values from the values at
+    positions and, for numbers, the minimum and maximum, without formatting
+    every value
+
+    Parameters
+    ----------
+    values: np.ndarray
+        The values of a column
+    positions: np.ndarray
+        The positions sampled, e.g. from sample_positions
+
+    Returns
+    -------
+    str
+    """
+    sample = values[positions]
+    if values.dtype.kind in 'iuf' and len(values):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            extremes = [np.nanmin(values), np.nanmax(values)]
+        sample = np.concatenate([sample, np.array(extremes, values.dtype)])
+    return widest_string(sample.astype(str))
+
+
+def widest_index(index, positions, date_format=DATE_FORMAT):
+    """Estimate the widest formatted label of index from the labels at
+    positions, see widest_value"""
+    return widest_string(format_index(index[positions], date_format))
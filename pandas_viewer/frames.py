@@ -0,0 +1,80 @@
+from abc import ABCMeta, abstractmethod
+
+
+class LazyFrame(object):
+    """Base class for frames whose columns are known without reading the
+    values, which are only read from the source when requested.  Subclasses
+    implement read
+
+    """
+
+    __metaclass__ = ABCMeta
+
+    def __init__(self, columns):
+        """Initiate the frame with the names of its columns
+
+        Parameters
+        ----------
+        columns: list
+            The column names
+
+        Returns
+        -------
+        LazyFrame
+        """
+        self.columns = list(columns)
+
+    def get(self, column, default=None):
+        """Read column as a pd.Series
+
+        Parameters
+        ----------
+        column: object
+            The name of the column
+        default: object, optional
+            The value returned if column is not in the frame
+
+        Returns
+        -------
+        pd.Series
+        """
+        if column not in self.columns:
+            return default
+        return self.read([column]).iloc[:, 0]
+
+    def pop(self, column, default=None):
+        """Hide column from the frame, the source itself is never modified
+
+        Parameters
+        ----------
+        column: object
+            The name of the column
+        default: object, optional
+            The value returned if column is not in the frame
+
+        Returns
+        -------
+        pd.Series
+        """
+        value = self.get(column, default)
+        if column in self.columns:
+            self.columns.remove(column)
+        return value
+
+    @abstractmethod
+    def read(self, columns=None, start=None, stop=None):
+        """Read columns for rows start to stop into a pd.DataFrame
+
+        Parameters
+        ----------
+        columns: list, optional
+            The columns to read, defaults to every column
+        start: int, optional
+        stop: int, optional
+
+        Returns
+        -------
+        pd.DataFrame
+            The columns in the order given, indexed by the rows start to stop
+            of the index of the source
+        """
@@ -0,0 +1,345 @@
+import numpy as np
+import pandas as pd
+
+from frames import LazyFrame
+
+FRAME = 'frame'
+DATETIME = 'datetime64'
+
+
+class H5Group(object):
+    """Dict-like view of an h5py.Group whose children are wrapped on access,
+    so only the metadata of the file is read until a frame is read
+
+    """
+
+    def __init__(self, group):
+        """Initiate the view of group
+
+        Parameters
+        ----------
+        group: h5py.Group
+            The group to wrap
+
+        Returns
+        -------
+        H5Group
+        """
+        self.group = group
+        self.hidden = set()
+        self.children = {}
+
+    def __iter__(self):
+        for key in self.group:
+            if key not in self.hidden:
+                yield key
+
+    def __len__(self):
+        return len(self.group) - len(self.hidden)
+
+    def __contains__(self, key):
+        return key not in self.hidden and key in self.group
+
+    def get(self, key, default=None):
+        """Return the child key wrapped as a H5Group or H5Frame
+
+        Parameters
+        ----------
+        key: str
+            The name of the child
+        default: object, optional
+            The value returned if key is not a child of the group
+
+        Returns
+        -------
+        H5Group, H5Frame
+        """
+        if key not in self:
+            return default
+        if key not in self.children:
+            self.children[key] = wrap(self.group[key])
+        return self.children[key]
+
+    def pop(self, key, default=None):
+        """Hide key from the view, the file itself is never modified
+
+        Parameters
+        ----------
+        key: str
+            The name of the child
+        default: object, optional
+            The value returned if key is not a child of the group
+
+        Returns
+        -------
+        H5Group, H5Frame
+        """
+        value = self.get(key, default)
+        self.hidden.add(key)
+        return value
+
+    def iteritems(self):
+        for key in self:
+            yield key, self.get(key)
+
+
+class H5Frame(LazyFrame):
+    """Lazy DataFrame backed by a 2d or compound h5py.Dataset.  Columns and
+    row ranges are only read from the file when requested
+
+    """
+
+    chunk_rows = 2 ** 16
+
+    def __init__(self, values, index=None, columns=None):
+        """Initiate the frame from the datasets holding its values and index
+
+        Parameters
+        ----------
+        values: h5py.Dataset
+            1d, 2d or compound dataset of values with a row per timestamp
+        index: h5py.Dataset, optional
+            1d dataset of the index, int64 nanoseconds if its kind attribute
+            is 'datetime64', defaults to a range index
+        columns: list, optional
+            The column names, defaults to the field names of a compound
+            dataset or the column numbers
+
+        Returns
+        -------
+        H5Frame
+        """
+        self.name = values.name
+        self.values = as_array(values)
+        self.index = index
+        if columns is None:
+            if self.values.dtype.names is not None:
+                columns = list(self.values.dtype.names)
+            elif self.values.ndim == 1:
+                columns = [values.name.rsplit('/', 1)[-1]]
+            else:
+                columns = range(self.values.shape[1])
+        super(H5Frame, self).__init__(columns)
+        self._positions = dict((c, i) for i, c in enumerate(self.columns))
+
+    def __len__(self):
+        return len(self.values)
+
+    def read_index(self, start=None, stop=None):
+        """Read rows start to stop of the index
+
+        Parameters
+        ----------
+        start: int, optional
+        stop: int, optional
+
+        Returns
+        -------
+        pd.Index
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if self.index is None:
+            return pd.RangeIndex(start, stop)
+        values = self.index[start:stop]
+        if self.index.attrs.get('kind') == DATETIME:
+            return pd.DatetimeIndex(values.astype('M8[ns]'))
+        return pd.Index(values)
+
+    def read_column(self, column, start=None, stop=None):
+        """Read rows start to stop of column, chunk_rows at a time
+
+        Parameters
+        ----------
+        column: object
+            The name of the column
+        start: int, optional
+        stop: int, optional
+
+        Returns
+        -------
+        np.ndarray
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        position = self._positions[column]
+        names = self.values.dtype.names
+        dtype = self.values.dtype[position] if names else self.values.dtype
+        result = np.empty(max(stop - start, 0), dtype=dtype)
+        for i in range(start, stop, self.chunk_rows):
+            j = min(i + self.chunk_rows, stop)
+            if names is not None:
+                chunk = self.values[i:j][names[position]]
+            elif self.values.ndim == 1:
+                chunk = self.values[i:j]
+            else:
+                chunk = self.values[i:j, position]
+            result[i - start:j - start] = chunk
+        return result
+
+    def read(self, columns=None, start=None, stop=None):
+        """Read columns for rows start to stop into a pd.DataFrame
+
+        Parameters
+        ----------
+        columns: list, optional
+            The columns to read, defaults to every column
+        start: int, optional
+        stop: int, optional
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        if columns is None:
+            columns = self.columns
+        data = dict((c, self.read_column(c, start, stop)) for c in columns)
+        return pd.DataFrame(data, index=self.read_index(start, stop),
+                            columns=columns)
+
+
+def as_array(dataset):
+    """Memory-map dataset if it is stored contiguously and uncompressed,
+    otherwise return the dataset for chunked h5py slicing
+
+    Parameters
+    ----------
+    dataset: h5py.Dataset
+
+    Returns
+    -------
+    np.memmap, h5py.Dataset
+    """
+    offset = dataset.id.get_offset()
+    if dataset.chunks is not None or offset is None:
+        return dataset
+    return np.memmap(dataset.file.filename, dtype=dataset.dtype, mode='r',
+                     offset=offset, shape=dataset.shape)
+
+
+def wrap(node):
+    """Wrap an h5py node as a H5Group or H5Frame.  Datasets that cannot be
+    read as a frame, i.e. scalars and datasets of more than 2 dimensions, are
+    returned unwrapped and shown as leaves
+
+    Parameters
+    ----------
+    node: h5py.Group, h5py.Dataset
+
+    Returns
+    -------
+    H5Group, H5Frame, h5py.Dataset
+    """
+    import h5py
+    if isinstance(node, h5py.Dataset):
+        if not is_frame(node):
+            return node
+        return H5Frame(node, columns=node.attrs.get('columns'))
+    if node.attrs.get('kind') == FRAME:
+        return H5Frame(node['values'], node['index'],
+                       columns=node.attrs.get('columns'))
+    return H5Group(node)
+
+
+def is_frame(dataset):
+    """Return True if dataset is 1d, 2d or a 1d compound dataset, which are
+    read as a H5Frame
+
+    Parameters
+    ----------
+    dataset: h5py.Dataset
+
+    Returns
+    -------
+    bool
+    """
+    if dataset.dtype.names is not None:
+        return dataset.ndim == 1
+    return dataset.ndim in (1, 2)
+
+
+def open_file(filepath):
+    """Open filepath read only without reading any data
+
+    Parameters
+    ----------
+    filepath: str
+
+    Returns
+    -------
+    H5Group
+    """
+    import h5py
+    return H5Group(h5py.File(filepath, 'r'))
+
+
+def write_frame(group, name, df, chunk_rows=H5Frame.chunk_rows, progress=None,
+                **kwargs):
+    """Write df to group as a frame that is read lazily by H5Frame, chunk_rows
+    rows at a time.  A frame whose columns share one numeric dtype is written
+    as a 2d dataset, any other as a compound dataset with a field per column
+
+    Parameters
+    ----------
+    group: h5py.Group
+        The group to write the frame to
+    name: str
+        The name of the frame in group
+    df: pd.DataFrame
+        The dataframe to write, columns and an index that are not numeric
+        are written as text
+    chunk_rows: int
+        The number of rows in each chunk of a column
+    progress: callable, optional
+        Called with the number of rows written after each chunk
+    kwargs:
+        Passed to h5py.Group.create_dataset, e.g. compression
+
+    Returns
+    -------
+    h5py.Group
+    """
+    import h5py
+    text = h5py.special_dtype(vlen=unicode)
+    node = group.create_group(name)
+    node.attrs['kind'] = FRAME
+    node.attrs['columns'] = np.array([str(c) for c in df.columns])
+    numeric = [dtype.kind in 'biuf' for dtype in df.dtypes]
+    if all(numeric) and len(set(df.dtypes)) <= 1:
+        dtype = df.dtypes.iloc[0] if len(df.columns) else np.float64
+        shape = df.shape
+        chunks = (min(len(df), chunk_rows), 1) if len(df) and len(
+            df.columns) else None
+    else:
+        dtype = np.dtype([('c{}'.format(i), df.dtypes.iloc[i] if numeric[i]
+                           else text) for i in range(len(df.columns))])
+        shape = (len(df),)
+        chunks = (min(len(df), chunk_rows),) if len(df) else None
+    values = node.create_dataset('values', shape=shape, dtype=dtype,
+                                 chunks=chunks, **kwargs)
+    for start in range(0, len(df), chunk_rows):
+        stop = min(start + chunk_rows, len(df))
+        if dtype.names is not None:
+            chunk = np.empty(stop - start, dtype)
+            for i in range(len(df.columns)):
+                column = df.iloc[start:stop, i].values
+                chunk['c{}'.format(i)] = column if numeric[i] \
+                    else _text(column)
+            values[start:stop] = chunk
+        elif len(df.columns):
+            values[start:stop] = df.iloc[start:stop].values
+        if progress is not None:
+            progress(stop)
+    if isinstance(df.index, pd.DatetimeIndex):
+        index = node.create_dataset('index', data=df.index.asi8)
+        index.attrs['kind'] = DATETIME
+    elif df.index.dtype.kind in 'biuf':
+        node.create_dataset('index', data=df.index.values)
+    else:
+        node.create_dataset('index', data=_text(df.index.values), dtype=text)
+    return node
+
+
+def _text(values):
+    result = np.empty(len(values), dtype=object)
+    result[:] = [v.decode('utf-8', 'replace') if isinstance(v, str)
+                 else unicode(v) for v in values]
+    return result
@@ -0,0 +1,121 @@
+import os
+
+import hdf5
+from csvfile import CSVFrame
+from sidecar import Sidecar
+from profiling import profiler
+
+
+class LoadCancelled(Exception):
+    """Raised from a read when the load has been cancelled"""
+
+
+class ProgressFile(object):
+    """Read only file wrapper that reports the percentage of the file read
+    and raises LoadCancelled once cancelled returns True
+
+    """
+
+    def __init__(self, filepath, progress=None, cancelled=None):
+        """Open filepath for reading
+
+        Parameters
+        ----------
+        filepath: str
+            The path of the file to open
+        progress: callable, optional
+            Called with the integer percentage read each time it changes
+        cancelled: callable, optional
+            Called on each read, the load is abandoned if it returns True
+
+        Returns
+        -------
+        ProgressFile
+        """
+        self.f = open(filepath, 'rb')
+        self.size = max(os.path.getsize(filepath), 1)
+        self.progress = progress
+        self.cancelled = cancelled
+        self.percent = -1
+
+    def _update(self):
+        if self.cancelled is not None and self.cancelled():
+            raise LoadCancelled(self.f.name)
+        if self.progress is not None:
+            percent = 100 * self.f.tell() // self.size
+            if percent != self.percent:
+                self.percent = percent
+                self.progress(percent)
+
+    def read(self, *args):
+        data = self.f.read(*args)
+        self._update()
+        return data
+
+    def readline(self, *args):
+        data = self.f.readline(*args)
+        self._update()
+        return data
+
+    def __iter__(self):
+        return iter(self.readline, '')
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+@profiler.timed()
+def load_file(filepath, progress=None, cancelled=None, sidecar=True):
+    """Load the object in filepath by its extension, pickles are cached as a
+    sidecar and csv and HDF5 files and archive directories are opened lazily
+
+    Parameters
+    ----------
+    filepath: str
+        The path of a .csv, .pickle, .h5, .hdf5, .npy or .npz file, or of a
+        directory which is opened as an archive, see archive.open_archive
+    progress: callable, optional
+        Called with the integer percentage of a pickle read or of the files
+        of an archive scanned
+    cancelled: callable, optional
+        Called on each read of a pickle or file of an archive scanned, the
+        load is abandoned with LoadCancelled if it returns True
+    sidecar: bool
+        Whether pickles and csv columns are cached in a Sidecar, e.g. False
+        for batch runs, whose processes would evict each other's entries
+
+    Returns
+    -------
+    object
+    """
+    import pickling
+    import export
+    import archive
+    filename, ext = os.path.splitext(filepath)
+    if os.path.isdir(filepath):
+        obj = archive.open_archive(filepath, progress, cancelled)
+    elif ext == '.csv':
+        obj = CSVFrame(filepath, Sidecar(filepath) if sidecar else None)
+    elif ext == '.pickle' and not sidecar:
+        obj = pickling.load(filepath, progress, cancelled)
+    elif ext == '.pickle':
+        entry = Sidecar(filepath)
+        obj = entry.load()
+        if obj is None:
+            obj = pickling.load(filepath, progress, cancelled)
+            entry.store(obj)
+    elif ext in ('.h5', '.hdf5'):
+        obj = hdf5.open_file(filepath)
+    elif ext == '.npy':
+        obj = export.read_npy(filepath)
+    elif ext == '.npz':
+        obj = export.read_npz(filepath)
+    else:
+        raise ValueError('file ext %s not implemented', ext)
+    return obj
@@ -0,0 +1,214 @@
+import os
+import sys
+import shutil
+import atexit
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import hdf5
+import transform
+from frames import LazyFrame
+from sidecar import Sidecar
+
+BUDGET = 4 * 2 ** 30
+
+
+class MemoryBudget(object):
+    """Sizes of the objects loaded in the tree, in order of last selection.
+    Once the total exceeds the budget the least recently selected objects are
+    chosen to be evicted.  Objects that cannot be evicted further are counted
+    in the total but never chosen
+
+    """
+
+    def __init__(self, budget=BUDGET):
+        """Initiate an empty budget
+
+        Parameters
+        ----------
+        budget: int
+            The total size in bytes above which objects are evicted
+
+        Returns
+        -------
+        MemoryBudget
+        """
+        self.budget = budget
+        self.sizes = OrderedDict()
+        self.fixed = {}
+
+    def __contains__(self, key):
+        return key in self.sizes or key in self.fixed
+
+    @property
+    def total(self):
+        return sum(self.sizes.itervalues()) + sum(self.fixed.itervalues())
+
+    def add(self, key, size, evictable=True):
+        """Track the object of key as the most recently selected
+
+        Parameters
+        ----------
+        key: object
+        size: int
+            The size of the object in bytes
+        evictable: bool
+            Whether the object can be chosen to be evicted
+        """
+        self.remove(key)
+        if evictable:
+            self.sizes[key] = size
+        else:
+            self.fixed[key] = size
+
+    def touch(self, key):
+        """Mark the object of key as the most recently selected"""
+        if key in self.sizes:
+            self.sizes[key] = self.sizes.pop(key)
+
+    def remove(self, key):
+        self.sizes.pop(key, None)
+        self.fixed.pop(key, None)
+
+    def over_budget(self, keep=()):
+        """Return the least recently selected keys, other than those in keep,
+        whose eviction brings the total within the budget, or as close to it
+        as possible
+
+        Parameters
+        ----------
+        keep: collection
+            The keys never chosen, e.g. those selected
+
+        Returns
+        -------
+        list
+        """
+        excess = self.total - self.budget
+        result = []
+        for key, size in self.sizes.iteritems():
+            if excess <= 0:
+                break
+            if key not in keep:
+                result.append(key)
+                excess -= size
+        return result
+
+
+class Spill(object):
+    """Temporary directory of sidecar entries of objects evicted from memory
+    that cannot be reloaded from a source file.  The arrays are memory-mapped
+    when loaded, so only the columns read are copied back into memory
+
+    """
+
+    def __init__(self, directory=None):
+        """Initiate the spill, creating a temporary directory that is removed
+        at exit if directory is not given"""
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='pandas_viewer_spill')
+            atexit.register(shutil.rmtree, directory, True)
+        self.directory = directory
+
+    def store(self, obj):
+        """Write obj to a new entry and return the entry
+
+        Parameters
+        ----------
+        obj: object
+
+        Returns
+        -------
+        Sidecar
+        """
+        fd, filepath = tempfile.mkstemp(dir=self.directory, suffix='.spill')
+        os.close(fd)
+        sidecar = Sidecar(filepath, self.directory, float('inf'))
+        sidecar.store(obj)
+        return sidecar
+
+    def remove(self, sidecar):
+        """Remove the entry sidecar returned by store"""
+        shutil.rmtree(sidecar.path, ignore_errors=True)
+        if os.path.exists(sidecar.filepath):
+            os.remove(sidecar.filepath)
+
+
+def evict(obj, filepath=None, spill=None):
+    """Return a disk-backed replacement for obj, whose frames are
+    memory-mapped and read lazily.  The sidecar of filepath, the file obj was
+    loaded from, is used if it is a pickle whose sidecar is current, otherwise
+    obj is written to spill.  The sidecar of a csv file only caches columns,
+    not the object
+
+    Parameters
+    ----------
+    obj: object
+        The object to evict
+    filepath: str, optional
+        The file obj was loaded from by load_file
+    spill: Spill, optional
+        Where to write obj if it has no sidecar, obj is kept if not given
+
+    Returns
+    -------
+    (object, Sidecar)
+        The replacement and the spilled entry, None if nothing was spilled
+    """
+    if filepath is not None and os.path.splitext(filepath)[1] == '.pickle' \
+            and os.path.isfile(filepath):
+        replacement = Sidecar(filepath).load()
+        if replacement is not None:
+            return replacement, None
+    if spill is None:
+        return obj, None
+    sidecar = spill.store(obj)
+    replacement = sidecar.load()
+    if replacement is None:
+        spill.remove(sidecar)
+        return obj, None
+    return replacement, sidecar
+
+
+def object_size(obj):
+    """Return the memory held by obj in bytes, counting lazy frames, HDF5
+    groups and memory-mapped arrays as empty
+
+    Parameters
+    ----------
+    obj: object
+        An object of the tree
+
+    Returns
+    -------
+    int
+    """
+    if isinstance(obj, dict):
+        return sum(object_size(value) for value in obj.itervalues())
+    if isinstance(obj, (LazyFrame, hdf5.H5Group)):
+        return 0
+    if isinstance(obj, pd.DataFrame):
+        return transform.nbytes(obj)
+    if isinstance(obj, pd.Series):
+        size = int(obj.index.memory_usage(deep=True))
+        if not _mapped(obj.values):
+            size += int(obj.memory_usage(index=False, deep=True))
+        return size
+    if isinstance(obj, pd.Panel):
+        if _mapped(obj.values):
+            return 0
+        return sum(transform.nbytes(obj[itm]) for itm in obj.items)
+    if isinstance(obj, np.ndarray):
+        return 0 if _mapped(obj) else obj.nbytes
+    return sys.getsizeof(obj)
+
+
+def _mapped(values):
+    while values is not None:
+        if isinstance(values, np.memmap):
+            return True
+        values = getattr(values, 'base', None)
+    return False
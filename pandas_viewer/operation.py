@@ -1,23 +1,96 @@
-def dict_operation(d1, d2, func):
-    try:
-        result = func(d1, d2)
-    except:
-        if isinstance(d1, dict) and isinstance(d2, dict):
-            result = {}
-            for k, v1 in d1.iteritems():
-                v2 = d2.get(k, None)
-                result[k] = dict_operation(v1, v2, func)
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+UFUNCS = dict(add=np.add, sub=np.subtract, mul=np.multiply,
+              truediv=np.true_divide)
+
+
+def dict_operation(d1, d2, func, processes=None):
+    """Apply the binary function func to every pair of leaves of the nested
+    dicts d1 and d2.  Leaves of d1 without a matching leaf in d2, or for which
+    func fails, are None in the result.
+
+    When func is a pandas arithmetic method made by binary_op, float Series
+    and single dtype float DataFrame leaves are grouped by their indexes so
+    that each group is aligned once, and the arithmetic of the groups is run
+    across a process pool.  The results are identical to applying func to
+    each pair.
+
+    Parameters
+    ----------
+    d1: dict, pd.Series, pd.DataFrame, pd.Panel
+        The left hand side of the operation
+    d2: dict, pd.Series, pd.DataFrame, pd.Panel
+        The right hand side of the operation
+    func: callable
+        Function of the left and right hand leaves
+    processes: int, optional
+        The number of processes for the arithmetic, defaults to running in
+        this process
+
+    Returns
+    -------
+    dict, pd.Series, pd.DataFrame, pd.Panel
+    """
+    leaves = []
+    result = _flatten(d1, d2, (), leaves)
+    attr = getattr(func, 'attr', None)
+    groups = []
+    values = {}
+    for path, lhs, rhs in leaves:
+        if attr in UFUNCS and _is_aligned_float(lhs, rhs):
+            _add_to_group(groups, path, lhs, rhs)
         else:
-            result = None
+            values[path] = _apply_func(func, lhs, rhs)
+    tasks = [(attr, lidx, ridx, [(lhs.values, rhs.values)
+                                 for _, lhs, rhs in members])
+             for _, _, _, lidx, ridx, members in groups]
+    if processes is None or processes == 1 or len(tasks) < 2:
+        outputs = map(_apply_group, tasks)
+    else:
+        pool = Pool(processes)
+        try:
+            outputs = pool.map(_apply_group, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    for (_, _, joined, _, _, members), output in zip(groups, outputs):
+        for (path, lhs, rhs), array in zip(members, output):
+            values[path] = _wrap(array, joined, lhs, rhs)
+    if () in values:
+        return values[()]
+    for path, value in values.iteritems():
+        reduce(lambda x, y: x[y], path[:-1], result)[path[-1]] = value
     return result
 
 
-def dict_plus(d1, d2):
-    return dict_operation(d1, d2, _add)
+def dict_plus(d1, d2, processes=None):
+    return dict_operation(d1, d2, _add, processes)
 
 
-def dict_minus(d1, d2):
-    return dict_operation(d1, d2, _minus)
+def dict_minus(d1, d2, processes=None):
+    return dict_operation(d1, d2, _minus, processes)
+
+
+def binary_op(attr):
+    """Return the function applying the pandas arithmetic method attr of the
+    left hand side to the right hand side along the index
+
+    Parameters
+    ----------
+    attr: str
+        The name of the method, e.g. 'add'
+
+    Returns
+    -------
+    callable
+    """
+    def func(lhs, rhs):
+        return _op(lhs, rhs, attr)
+    func.attr = attr
+    return func
 
 
 def _op(lhs, rhs, attr):
@@ -27,9 +100,82 @@ def _op(lhs, rhs, attr):
         return None
 
 
-def _add(lhs, rhs):
-    return _op(lhs, rhs, 'add')
+_add = binary_op('add')
+_minus = binary_op('sub')
+
+
+def _flatten(d1, d2, path, leaves):
+    if isinstance(d1, dict) and isinstance(d2, dict):
+        return dict((k, _flatten(v1, d2.get(k, None), path + (k,), leaves))
+                    for k, v1 in d1.iteritems())
+    leaves.append((path, d1, d2))
+    return None
+
+
+def _apply_func(func, lhs, rhs):
+    try:
+        return func(lhs, rhs)
+    except Exception:
+        return None
+
+
+def _is_float(obj):
+    if isinstance(obj, pd.Series):
+        return obj.dtype.kind == 'f'
+    if isinstance(obj, pd.DataFrame):
+        # .values of mixed float32 and float64 columns is upcast to float64,
+        # so only frames of one dtype are computed on their values
+        dtypes = set(obj.dtypes)
+        return len(dtypes) == 1 and dtypes.pop().kind == 'f'
+    return False
+
+
+def _is_aligned_float(lhs, rhs):
+    if not (_is_float(lhs) and _is_float(rhs)):
+        return False
+    if isinstance(lhs, pd.Series):
+        return isinstance(rhs, pd.Series)
+    if isinstance(rhs, pd.DataFrame):
+        return lhs.columns.equals(rhs.columns)
+    return True
+
+
+def _add_to_group(groups, path, lhs, rhs):
+    for lhs_index, rhs_index, _, _, _, members in groups:
+        if lhs.index.equals(lhs_index) and rhs.index.equals(rhs_index):
+            members.append((path, lhs, rhs))
+            return
+    if lhs.index.equals(rhs.index):
+        joined, lidx, ridx = lhs.index, None, None
+    else:
+        joined, lidx, ridx = lhs.index.join(rhs.index, how='outer',
+                                            return_indexers=True)
+    groups.append((lhs.index, rhs.index, joined, lidx, ridx,
+                   [(path, lhs, rhs)]))
+
+
+def _take(values, indexer):
+    if indexer is None:
+        return values
+    result = values.take(indexer, axis=0)
+    result[indexer == -1] = np.nan
+    return result
+
+
+def _apply_group(task):
+    attr, lidx, ridx, operands = task
+    ufunc = UFUNCS[attr]
+    result = []
+    for lvalues, rvalues in operands:
+        lvalues, rvalues = _take(lvalues, lidx), _take(rvalues, ridx)
+        if lvalues.ndim == 2 and rvalues.ndim == 1:
+            rvalues = rvalues[:, np.newaxis]
+        result.append(ufunc(lvalues, rvalues))
+    return result
 
 
-def _minus(lhs, rhs):
-    return _op(lhs, rhs, 'minus')
+def _wrap(array, index, lhs, rhs):
+    if isinstance(lhs, pd.Series):
+        name = lhs.name if lhs.name == rhs.name else None
+        return pd.Series(array, index=index, name=name)
+    return pd.DataFrame(array, index=index, columns=lhs.columns)
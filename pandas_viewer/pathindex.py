@@ -0,0 +1,273 @@
+from bisect import bisect_right
+from collections import OrderedDict
+
+import pandas as pd
+
+import hdf5
+from frames import LazyFrame
+
+
+class PathIndex(object):
+    """Flat index of the nodes of the tree keyed by their path, the tuple of
+    keys from the top level down to the node.  Nodes are indexed as they are
+    added or expanded, so the cost of the index follows what is shown.  Each
+    node is resolved from its parent in one lookup.
+
+    The paths are searched as one lower case string.  Below a top level node
+    whose every path has been given by add_walk, usually from walk on a
+    background thread, the search covers nodes not yet expanded
+
+    """
+
+    def __init__(self):
+        self.nodes = OrderedDict()
+        self.children = {}
+        self.expandable = {}
+        self.walked = {}
+        self._text = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, path):
+        return path in self.nodes
+
+    def add(self, path, parent):
+        """Add the node at path, the child path[-1] of parent, replacing any
+        node already at path and the nodes expanded below it
+
+        Parameters
+        ----------
+        path: tuple
+            The keys of the node
+        parent: object
+            The object holding the node, self.obj of the tree for top level
+            nodes
+
+        Returns
+        -------
+        bool
+            Whether the node has children, see has_children
+        """
+        if path in self.nodes:
+            self.remove(path)
+        self._add(path, parent, has_children(parent.get(path[-1])))
+        self._text = None
+        return self.expandable[path]
+
+    def _add(self, path, parent, expandable):
+        self.nodes[path] = (parent, path[-1])
+        self.expandable[path] = expandable
+        self.children.setdefault(path[:-1], []).append(path)
+
+    def expand(self, path):
+        """Add the children of the node at path, if they have not been added
+
+        Parameters
+        ----------
+        path: tuple
+            The keys of the node
+
+        Returns
+        -------
+        list((tuple, bool))
+            The path of each child and whether it has children
+        """
+        if self.expandable.get(path) and path not in self.children:
+            obj = self.resolve(path)
+            children = list(child_keys(obj))
+            self.children[path] = []
+            for key, expandable in children:
+                self._add(path + (key,), obj, expandable)
+            self._text = None
+        return [(child, self.expandable[child])
+                for child in self.children.get(path, [])]
+
+    def add_walk(self, path, paths):
+        """Search paths, every path below the top level node path returned by
+        walk, instead of the nodes indexed below it
+
+        Parameters
+        ----------
+        path: tuple
+            The keys of a top level node
+        paths: list(tuple)
+        """
+        self.walked[path] = paths
+        self._text = None
+
+    def remove(self, path):
+        """Remove the node at path and every node below it
+
+        Parameters
+        ----------
+        path: tuple
+            The keys of the node
+
+        Returns
+        -------
+        list(tuple)
+            The paths removed
+        """
+        removed = []
+        stack = [path]
+        top = path[:1]
+        if path == top:
+            self.walked.pop(top, None)
+        elif top in self.walked:
+            self.walked[top] = [p for p in self.walked[top]
+                                if p[:len(path)] != path]
+        while stack:
+            path = stack.pop()
+            if self.nodes.pop(path, None) is not None:
+                self.expandable.pop(path, None)
+                removed.append(path)
+            stack.extend(self.children.pop(path, []))
+        if removed:
+            siblings = self.children.get(removed[0][:-1], [])
+            if removed[0] in siblings:
+                siblings.remove(removed[0])
+        self._text = None
+        return removed
+
+    def parent(self, path):
+        """Return the object holding the node at path"""
+        return self.nodes[path][0]
+
+    def resolve(self, path):
+        """Return the object of the node at path"""
+        parent, key = self.nodes[path]
+        return parent.get(key)
+
+    def search(self, text, limit=None):
+        """Return the paths containing text, ignoring case, in the order they
+        were added
+
+        Parameters
+        ----------
+        text: str
+            The text to find in the path, with the keys joined by '/'
+        limit: int, optional
+            The maximum number of paths returned
+
+        Returns
+        -------
+        list(tuple)
+        """
+        text = _text(text).lower().replace(u'\n', u'')
+        if not text:
+            return []
+        if self._text is None:
+            self._build()
+        result = []
+        pos = self._text.find(text)
+        while pos >= 0 and (limit is None or len(result) < limit):
+            i = bisect_right(self._starts, pos) - 1
+            result.append(self._paths[i])
+            pos = self._text.find(text, self._starts[i + 1])
+        return result
+
+    def _build(self):
+        self._paths = []
+        for path in self.nodes:
+            top = path[:1]
+            if top not in self.walked:
+                self._paths.append(path)
+            elif path == top:
+                self._paths.extend(self.walked[top])
+        labels = [format_path(path).lower() for path in self._paths]
+        self._starts = []
+        start = 0
+        for label in labels:
+            self._starts.append(start)
+            start += len(label) + 1
+        self._starts.append(start)
+        self._text = u'\n'.join(labels)
+
+
+def format_path(path):
+    """Return the keys of path joined by '/' as unicode"""
+    return u'/'.join(_text(key) for key in path)
+
+
+def _text(key):
+    if isinstance(key, str):
+        return key.decode('utf-8', 'replace')
+    return unicode(key)
+
+
+def walk(path, obj):
+    """Return path and the path of every node below obj, the object of the
+    node at path, in tree order.  Nodes whose children cannot be read, e.g.
+    HDF5 groups with broken links, are returned without them
+
+    Parameters
+    ----------
+    path: tuple
+        The keys of the node
+    obj: object
+        The object held by the node
+
+    Returns
+    -------
+    list(tuple)
+    """
+    result = []
+    stack = [(path, obj)]
+    while stack:
+        path, obj = stack.pop()
+        result.append(path)
+        try:
+            children = list(child_keys(obj))
+            stack.extend((path + (key,), obj.get(key) if expandable else None)
+                         for key, expandable in reversed(children))
+        except (IOError, OSError, KeyError):
+            continue
+    return result
+
+
+def has_children(obj):
+    """Return True if obj is expanded into child nodes in the tree
+
+    Parameters
+    ----------
+    obj: object
+        The object held by a node of the tree
+
+    Returns
+    -------
+    bool
+    """
+    if isinstance(obj, pd.Panel):
+        return len(obj.items) > 0
+    if isinstance(obj, pd.DataFrame):
+        return len(obj.columns) > 0
+    if isinstance(obj, (dict, hdf5.H5Group)):
+        return len(obj) > 0
+    if isinstance(obj, LazyFrame):
+        return len(obj.columns) > 0
+    return False
+
+
+def child_keys(obj):
+    """Yield the key of each child node of obj and whether that child has
+    children of its own, without building the children themselves
+
+    Parameters
+    ----------
+    obj: object
+        The object held by a node of the tree
+
+    Returns
+    -------
+    generator((object, bool))
+    """
+    if isinstance(obj, pd.Panel):
+        for itm in obj.items:
+            yield itm, len(obj.minor_axis) > 0
+    elif isinstance(obj, (pd.DataFrame, LazyFrame)):
+        for column in obj.columns:
+            yield column, False
+    elif isinstance(obj, (dict, hdf5.H5Group)):
+        for key, value in obj.iteritems():
+            yield key, has_children(value)
@@ -1,4 +1,32 @@
+import bz2
+import zlib
+import struct
 import cPickle
+from cStringIO import StringIO
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+from loading import ProgressFile, LoadCancelled
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+MAGIC = 'PVPACK01'
+FOOTER = struct.Struct('<QQ')
+CHUNK_SIZE = 2 ** 22
+MIN_BYTES = 2 ** 10
+OUT_OF_BAND = 'biufcmMSU'
+CODECS = {
+    'none': (lambda data: str(buffer(data)), lambda data: data),
+    'zlib': (lambda data: zlib.compress(data, 1), zlib.decompress),
+    'bz2': (bz2.compress, bz2.decompress),
+}
+if lzma is not None:
+    CODECS['lzma'] = (lzma.compress, lzma.decompress)
 
 
 def dump(obj, filepath):
@@ -6,8 +34,213 @@ def dump(obj, filepath):
         cPickle.dump(obj, f, cPickle.HIGHEST_PROTOCOL)
 
 
-def load(filepath):
-    with open(filepath, 'rb') as f:
-        obj = cPickle.load(f)
+def load(filepath, progress=None, cancelled=None):
+    if is_packed(filepath):
+        return load_packed(filepath, progress=progress, cancelled=cancelled)
+    if progress is None and cancelled is None:
+        with open(filepath, 'rb') as f:
+            obj = cPickle.load(f)
+    else:
+        with ProgressFile(filepath, progress, cancelled) as f:
+            obj = cPickle.load(f)
     return obj
 
+
+def is_packed(filepath):
+    """Return True if filepath was written by dump_packed"""
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def dump_packed(obj, filepath, codec='zlib', chunk_size=CHUNK_SIZE,
+                threads=None):
+    """Pickle obj to filepath with every large numpy array stored out of band
+    as separately compressed chunks, compressed in parallel.  Each value of a
+    dict is written as its own record so it can be loaded alone
+
+    Parameters
+    ----------
+    obj: object
+        The object to pickle
+    filepath: str
+        The path to write to
+    codec: str
+        The compression used for the chunks, one of CODECS
+    chunk_size: int
+        The number of bytes of an array compressed as one chunk
+    threads: int, optional
+        The number of threads compressing chunks, defaults to the number of
+        cores
+    """
+    compress = CODECS[codec][0]
+    pool = ThreadPool(threads or cpu_count())
+    try:
+        with open(filepath, 'wb') as f:
+            f.write(MAGIC)
+            if isinstance(obj, dict):
+                entries = [(k, _write_record(f, v, compress, chunk_size, pool))
+                           for k, v in obj.iteritems()]
+            else:
+                entries = [(None, _write_record(f, obj, compress, chunk_size,
+                                                pool))]
+            index = zlib.compress(cPickle.dumps(
+                dict(codec=codec, is_dict=isinstance(obj, dict),
+                     entries=entries), cPickle.HIGHEST_PROTOCOL))
+            offset = f.tell()
+            f.write(index)
+            f.write(FOOTER.pack(offset, len(index)))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def load_packed(filepath, key=None, threads=None, progress=None,
+                cancelled=None):
+    """Load an object written by dump_packed, decompressing the chunks of its
+    arrays in parallel
+
+    Parameters
+    ----------
+    filepath: str
+        The path to read from
+    key: object, optional
+        Load only the value for key of a pickled dict, without reading the
+        other values
+    threads: int, optional
+        The number of threads decompressing chunks, defaults to the number of
+        cores
+    progress: callable, optional
+        Called with the integer percentage of records loaded
+    cancelled: callable, optional
+        Called before each array is read, the load is abandoned with
+        LoadCancelled if it returns True
+
+    Returns
+    -------
+    object
+    """
+    pool = ThreadPool(threads or cpu_count())
+    try:
+        with open(filepath, 'rb') as f:
+            index = _read_index(f)
+            decompress = CODECS[index['codec']][1]
+            entries = index['entries']
+            if key is not None:
+                entries = [(k, meta) for k, meta in entries if k == key]
+                if not entries:
+                    raise KeyError(key)
+            result = []
+            for i, (k, meta) in enumerate(entries):
+                result.append((k, _read_record(f, meta, decompress, pool,
+                                               cancelled)))
+                if progress is not None:
+                    progress(100 * (i + 1) // len(entries))
+    finally:
+        pool.close()
+        pool.join()
+    if index['is_dict'] and key is None:
+        return dict(result)
+    return result[0][1]
+
+
+def keys(filepath):
+    """Return the keys of a dict written by dump_packed without loading any
+    of the values
+
+    Parameters
+    ----------
+    filepath: str
+
+    Returns
+    -------
+    list
+    """
+    with open(filepath, 'rb') as f:
+        index = _read_index(f)
+    return [k for k, meta in index['entries']] if index['is_dict'] else []
+
+
+def convert(src, dst, **kwargs):
+    """Convert the pickle src to the packed format at dst
+
+    Parameters
+    ----------
+    src: str
+        The path of a pickle written by dump
+    dst: str
+        The path to write the packed pickle to
+    kwargs:
+        Passed to dump_packed
+    """
+    dump_packed(load(src), dst, **kwargs)
+
+
+def _read_index(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError('%s is not a packed pickle' % f.name)
+    f.seek(-FOOTER.size, 2)
+    offset, length = FOOTER.unpack(f.read(FOOTER.size))
+    f.seek(offset)
+    return cPickle.loads(zlib.decompress(f.read(length)))
+
+
+def _write_chunk(f, data):
+    offset = f.tell()
+    f.write(data)
+    return offset, len(data)
+
+
+def _write_record(f, obj, compress, chunk_size, pool):
+    buffers = []
+    ids = {}
+
+    def persistent_id(o):
+        if type(o) is np.ndarray and o.dtype.kind in OUT_OF_BAND \
+                and o.nbytes >= MIN_BYTES:
+            if id(o) not in ids:
+                ids[id(o)] = len(buffers)
+                buffers.append(o)
+            return str(ids[id(o)])
+        return None
+
+    s = StringIO()
+    pickler = cPickle.Pickler(s, cPickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = persistent_id
+    pickler.dump(obj)
+    meta = dict(skeleton=_write_chunk(f, compress(s.getvalue())), buffers=[])
+    for array in buffers:
+        transposed = array.flags.f_contiguous and not array.flags.c_contiguous
+        array = np.ascontiguousarray(array.T if transposed else array)
+        flat = array.reshape(-1).view(np.uint8)
+        chunks = pool.map(compress, [flat[i:i + chunk_size] for i in
+                                     range(0, len(flat), chunk_size)])
+        chunks = [_write_chunk(f, chunk) for chunk in chunks]
+        meta['buffers'].append(
+            (array.dtype.str, array.shape, transposed, chunk_size, chunks))
+    return meta
+
+
+def _read_record(f, meta, decompress, pool, cancelled=None):
+    arrays = []
+    for dtype, shape, transposed, chunk_size, chunks in meta['buffers']:
+        if cancelled is not None and cancelled():
+            raise LoadCancelled(f.name)
+        array = np.empty(shape, dtype=dtype)
+        flat = array.reshape(-1).view(np.uint8)
+        data = []
+        for offset, length in chunks:
+            f.seek(offset)
+            data.append(f.read(length))
+
+        def fill(i):
+            start = i * chunk_size
+            chunk = np.frombuffer(decompress(data[i]), dtype=np.uint8)
+            flat[start:start + len(chunk)] = chunk
+
+        pool.map(fill, range(len(data)))
+        arrays.append(array.T if transposed else array)
+    offset, length = meta['skeleton']
+    f.seek(offset)
+    unpickler = cPickle.Unpickler(StringIO(decompress(f.read(length))))
+    unpickler.persistent_load = lambda pid: arrays[int(pid)]
+    return unpickler.load()
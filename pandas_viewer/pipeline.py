@@ -0,0 +1,101 @@
+from collections import OrderedDict
+
+from profiling import profiler
+
+
+class Pipeline(object):
+    """Chain of named stages where each stage is computed from the value of
+    the stage upstream of it.  Stages are only recomputed when they, or a stage
+    upstream of them, have been invalidated
+
+    Examples
+    --------
+    >>> pipeline = Pipeline()
+    >>> pipeline.add_stage('source', lambda: 2)
+    >>> pipeline.add_stage('square', lambda x: x ** 2, 'source')
+    >>> pipeline.run()
+    >>> pipeline['square']
+    4
+    """
+
+    def __init__(self):
+        self.stages = OrderedDict()
+        self.values = {}
+        self.dirty = set()
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def add_stage(self, name, func, upstream=None):
+        """Add a stage to the end of the pipeline
+
+        Parameters
+        ----------
+        name: str
+            The name of the stage
+        func: callable
+            Called with the value of upstream to compute the value of the
+            stage, or with no arguments if upstream is None
+        upstream: str, optional
+            The name of the stage this stage is computed from
+        """
+        if upstream is not None and upstream not in self.stages:
+            raise KeyError('Upstream stage %s not in pipeline' % upstream)
+        self.stages[name] = (func, upstream)
+        self.dirty.add(name)
+
+    def downstream(self, name):
+        """Return the names of name and every stage computed from it
+
+        Parameters
+        ----------
+        name: str
+            The name of the stage
+
+        Returns
+        -------
+        list(str)
+        """
+        result = [name]
+        for stage, (func, upstream) in self.stages.iteritems():
+            if upstream in result:
+                result.append(stage)
+        return result
+
+    def invalidate(self, name):
+        """Mark name and every stage downstream of it to be recomputed on the
+        next run
+
+        Parameters
+        ----------
+        name: str
+            The name of the stage
+        """
+        self.dirty.update(self.downstream(name))
+
+    def set(self, name, value):
+        """Set the value of stage name, e.g. when it was computed
+        incrementally, and invalidate the stages downstream of it
+
+        Parameters
+        ----------
+        name: str
+            The name of the stage
+        value: object
+        """
+        self.values[name] = value
+        self.invalidate(name)
+        self.dirty.discard(name)
+
+    def run(self):
+        """Recompute every invalidated stage in the order they were added,
+        each stage is timed as a span of the profiler"""
+        for name, (func, upstream) in self.stages.iteritems():
+            if name not in self.dirty:
+                continue
+            with profiler.span(name):
+                if upstream is None:
+                    self.values[name] = func()
+                else:
+                    self.values[name] = func(self.values[upstream])
+            self.dirty.discard(name)
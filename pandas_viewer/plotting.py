@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+import decimate
+
+CHART_TYPES = ('line', 'stack')
+
+
+def datenum(index):
+    """Convert a pd.DatetimeIndex to matplotlib date numbers without creating
+    a datetime object per timestamp
+
+    Parameters
+    ----------
+    index: pd.Index
+        The index to convert
+
+    Returns
+    -------
+    np.ndarray
+    """
+    if isinstance(index, pd.DatetimeIndex):
+        from matplotlib import dates
+        epoch = dates.date2num(pd.Timestamp('1970-01-01').to_pydatetime())
+        return epoch + index.asi8 / 86400e9
+    return np.asarray(index, dtype=float)
+
+
+def plot_frame(subplot, x, values, chart_type='line', decimation=None,
+               n_pixels=1000):
+    """Plot the columns of values against the date numbers x on subplot as
+    lines or a stack.  If decimation is set each series is reduced to the
+    points needed at n_pixels wide
+
+    Parameters
+    ----------
+    subplot: matplotlib.axes.Axes
+        The axes to plot on
+    x: np.ndarray
+        The date numbers of the rows, see datenum
+    values: np.ndarray
+        The 2d array of values with a column per series
+    chart_type: str
+        One of CHART_TYPES
+    decimation: str, optional
+        One of decimate.METHODS, None plots every point
+    n_pixels: int
+        The width of the plot in pixels
+    """
+    if chart_type == 'line':
+        if decimation is None:
+            subplot.plot_date(x, values, '-')
+        else:
+            for i in range(values.shape[1]):
+                y = values[:, i]
+                idx = decimate.decimate(x, y, n_pixels, decimation)
+                subplot.plot_date(x[idx], y[idx], '-')
+    elif chart_type == 'stack':
+        if decimation is not None:
+            cumulative = values.cumsum(axis=1)
+            idx = np.unique(np.concatenate([
+                decimate.decimate(x, cumulative[:, i], n_pixels, decimation)
+                for i in range(values.shape[1])]))
+            x, values = x[idx], values[idx]
+        subplot.stackplot(x, values.transpose())
+        subplot.xaxis_date()
+    else:
+        raise ValueError('Chart type %s not recognised', chart_type)
+
+
+def update_lines(lines, x, values, decimation=None, n_pixels=1000):
+    """Set the data of lines, one per column of values, to what plot_frame
+    would plot as a line chart, so that the lines, legend and axes already on
+    the subplot are reused rather than rebuilt
+
+    Parameters
+    ----------
+    lines: list(matplotlib.lines.Line2D)
+        The lines plotted by plot_frame, in the order of the columns
+    x: np.ndarray
+        The date numbers of the rows, see datenum
+    values: np.ndarray
+        The 2d array of values with a column per series
+    decimation: str, optional
+        One of decimate.METHODS, None sets every point
+    n_pixels: int
+        The width of the plot in pixels
+    """
+    for i, line in enumerate(lines):
+        y = values[:, i]
+        if decimation is None:
+            line.set_data(x, y)
+        else:
+            idx = decimate.decimate(x, y, n_pixels, decimation)
+            line.set_data(x[idx], y[idx])
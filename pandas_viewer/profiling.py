@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from functools import wraps
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+ENV_VAR = 'PANDAS_VIEWER_PROFILE'
+MAX_EVENTS = 10000
+try:
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+
+class Profiler(object):
+    """Rolling trace of timed spans of the hot paths, with the change in
+    resident memory over each span.  Spans cost one attribute lookup when the
+    profiler is disabled
+
+    """
+
+    def __init__(self, enabled=None, max_events=MAX_EVENTS):
+        """Initiate an empty trace
+
+        Parameters
+        ----------
+        enabled: bool, optional
+            Whether spans are recorded, defaults to True if the environment
+            variable PANDAS_VIEWER_PROFILE is set to anything but 0
+        max_events: int
+            The number of spans kept, the oldest are dropped first
+
+        Returns
+        -------
+        Profiler
+        """
+        if enabled is None:
+            enabled = os.environ.get(ENV_VAR, '0') not in ('', '0')
+        self.enabled = enabled
+        self.events = deque(maxlen=max_events)
+        self.listeners = []
+        self._local = threading.local()
+
+    def span(self, name, **args):
+        """Return a context manager recording the time and memory used by its
+        block as the span name
+
+        Parameters
+        ----------
+        name: str
+            The name of the span
+        args:
+            Recorded with the span, e.g. the shape of the data
+
+        Returns
+        -------
+        context manager
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, args)
+
+    def timed(self, name=None):
+        """Return a decorator recording each call of the function as a span,
+        named name or the name of the function"""
+        def decorator(func):
+            span_name = func.__name__ if name is None else name
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def clear(self):
+        self.events.clear()
+
+    def to_json(self, filepath):
+        """Write the spans to filepath as a JSON list"""
+        with open(filepath, 'w') as f:
+            json.dump(list(self.events), f, indent=1)
+
+    def to_chrome_trace(self, filepath):
+        """Write the spans to filepath in the Chrome trace event format, for
+        chrome://tracing or Perfetto"""
+        events = [dict(name=e['name'], ph='X', pid=e['pid'], tid=e['tid'],
+                       ts=e['start'] * 1e6, dur=e['duration'] * 1e6,
+                       args=dict(e['args'], memory=e['memory']))
+                  for e in self.events]
+        with open(filepath, 'w') as f:
+            json.dump(dict(traceEvents=events, displayTimeUnit='ms'), f)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+class _Span(object):
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.event = dict(name=name, args=args, pid=os.getpid(),
+                          tid=threading.current_thread().ident)
+        self.children = []
+
+    def __enter__(self):
+        self.profiler._stack().append(self)
+        self.memory = rss()
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.time() - self.start
+        memory = rss()
+        stack = self.profiler._stack()
+        stack.pop()
+        self.event.update(
+            start=self.start, duration=duration, depth=len(stack),
+            memory=None if memory is None or self.memory is None
+            else memory - self.memory)
+        self.profiler.events.append(self.event)
+        if stack:
+            stack[-1].children.extend(self.children + [self.event])
+        else:
+            for listener in self.profiler.listeners:
+                listener(self.children + [self.event])
+        return False
+
+
+class _NullSpan(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+
+def rss():
+    """Return the resident memory of the process in bytes, or None if it
+    cannot be measured"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (IOError, OSError, IndexError, ValueError):
+        pass
+    if psutil is not None:
+        return psutil.Process(os.getpid()).memory_info().rss
+    return None
+
+
+def format_events(events):
+    """Return a one line summary of the spans of a top level span, the top
+    level span last, e.g. for the status bar
+
+    Parameters
+    ----------
+    events: list(dict)
+
+    Returns
+    -------
+    str
+    """
+    top = events[-1]
+    parts = ['{} {:.1f} ms'.format(e['name'], e['duration'] * 1e3)
+             for e in events[:-1] if e['depth'] == top['depth'] + 1]
+    text = '{} {:.1f} ms'.format(top['name'], top['duration'] * 1e3)
+    if parts:
+        text += ': ' + ', '.join(parts)
+    if top['memory'] is not None:
+        text += ' ({:+.1f} MB)'.format(top['memory'] / 2.0 ** 20)
+    return text
+
+
+profiler = Profiler()
@@ -0,0 +1,214 @@
+import re
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+INDEX = object()
+OPERATORS = OrderedDict([
+    ('==', np.equal), ('!=', np.not_equal), ('<=', np.less_equal),
+    ('>=', np.greater_equal), ('<', np.less), ('>', np.greater),
+    ('contains', None)])
+FILTER = re.compile(r'^\s*(==|!=|<=|>=|=|<|>|contains\b)?\s*(.*?)\s*$')
+
+
+class RowView(object):
+    """Sorted and filtered order of the rows of a DataFrame, held as an array
+    of row positions so that the DataFrame itself is never copied.  The
+    argsort of each column and the mask of each filter are cached, so
+    changing the direction of a sort or removing a filter costs no more than
+    indexing the cached arrays.  Columns are given by position, so columns
+    with the same label are sorted and filtered apart
+
+    """
+
+    def __init__(self, df):
+        """Initiate the view with the rows of df in their original order
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+
+        Returns
+        -------
+        RowView
+        """
+        self.df = df
+        self.sort_column = None
+        self.ascending = True
+        self.filters = OrderedDict()
+        self.rows = None
+        self._argsorts = {}
+        self._masks = {}
+
+    def __len__(self):
+        return len(self.df) if self.rows is None else len(self.rows)
+
+    def values(self, column):
+        """Return the values of column, or of the index if column is INDEX
+
+        Parameters
+        ----------
+        column: int
+            The position of the column
+
+        Returns
+        -------
+        np.ndarray
+        """
+        if column is INDEX:
+            return self.df.index.values
+        return self.df.iloc[:, column].values
+
+    def has_column(self, column):
+        return column is INDEX or column is not None and \
+            0 <= column < len(self.df.columns)
+
+    def sort(self, column, ascending=True):
+        """Order the rows by column, or the original order if column is None
+
+        Parameters
+        ----------
+        column: int
+            The position of the column, INDEX or None
+        ascending: bool
+        """
+        self.sort_column = column
+        self.ascending = ascending
+        self.update()
+
+    def add_filter(self, column, op, value):
+        """Show only the rows where the value of column compares to value with
+        op, as well as passing any other filter
+
+        Parameters
+        ----------
+        column: int
+            The position of the column or INDEX
+        op: str
+            One of OPERATORS, or None for == on numbers and dates and
+            contains on anything else
+        value: str
+            The value to compare to, converted to the dtype of the column
+        """
+        if op is None:
+            op = '==' if self.values(column).dtype.kind in 'biufmM' \
+                else 'contains'
+        op = '==' if op == '=' else op
+        self._mask(column, op, value)
+        self.filters[column] = (op, value)
+        self.update()
+
+    def remove_filter(self, column):
+        self.filters.pop(column, None)
+        self.update()
+
+    def clear_filters(self):
+        self.filters.clear()
+        self.update()
+
+    def restore(self, other):
+        """Apply the sort and filters of other to the columns this view shares
+        with it, e.g. when the DataFrame shown is recomputed.  Columns are
+        matched by label, the nth column with a label to the nth column with
+        the same label.  Filters whose value cannot be compared with the new
+        column are dropped
+
+        Parameters
+        ----------
+        other: RowView
+        """
+        for column, (op, value) in other.filters.iteritems():
+            column = self._match(other, column)
+            if column is not None:
+                try:
+                    self._mask(column, op, value)
+                except (ValueError, TypeError):
+                    continue
+                self.filters[column] = (op, value)
+        column = self._match(other, other.sort_column)
+        if column is not None:
+            self.sort_column = column
+            self.ascending = other.ascending
+        self.update()
+
+    def _match(self, other, column):
+        if column is INDEX or column is None:
+            return column
+        labels = list(other.df.columns)
+        label = labels[column]
+        occurrence = labels[:column].count(label)
+        for position, c in enumerate(self.df.columns):
+            if c == label:
+                if occurrence == 0:
+                    return position
+                occurrence -= 1
+        return None
+
+    def position(self, row):
+        """Return the position in the DataFrame of row of the view"""
+        return row if self.rows is None else int(self.rows[row])
+
+    def update(self):
+        """Recompute the rows from the cached argsort and filter masks"""
+        mask = None
+        for column, (op, value) in self.filters.iteritems():
+            m = self._mask(column, op, value)
+            mask = m if mask is None else mask & m
+        if self.sort_column is None:
+            self.rows = None if mask is None else np.flatnonzero(mask)
+        else:
+            order = self._order(self.sort_column, self.ascending)
+            self.rows = order if mask is None else order[mask[order]]
+
+    def _order(self, column, ascending):
+        if column not in self._argsorts:
+            values = self.values(column)
+            order = values.argsort()
+            if values.dtype.kind == 'f':
+                valid = int(np.count_nonzero(~np.isnan(values)))
+            else:
+                valid = len(values)
+            self._argsorts[column] = (order, valid)
+        order, valid = self._argsorts[column]
+        if ascending:
+            return order
+        return np.concatenate([order[:valid][::-1], order[valid:]])
+
+    def _mask(self, column, op, value):
+        key = (column, op, value)
+        if key not in self._masks:
+            values = self.values(column)
+            if op == 'contains':
+                mask = pd.Series(values).astype(unicode).str.contains(
+                    value, case=False, regex=False).values
+            else:
+                mask = OPERATORS[op](values, _convert(value, values.dtype))
+            self._masks[key] = np.asarray(mask, dtype=bool)
+        return self._masks[key]
+
+
+def parse_filter(text):
+    """Split the text of a filter such as '> 5' or 'contains abc' into the
+    operator, None if there is none, and the value
+
+    Parameters
+    ----------
+    text: str
+
+    Returns
+    -------
+    (str, str)
+    """
+    op, value = FILTER.match(text).groups()
+    return op, value
+
+
+def _convert(value, dtype):
+    if dtype.kind in 'biuf':
+        return float(value)
+    if dtype.kind == 'M':
+        return np.datetime64(pd.Timestamp(value))
+    if dtype.kind == 'O':
+        return value
+    return np.array(value).astype(dtype)
@@ -0,0 +1,277 @@
+import numpy as np
+import pandas as pd
+
+
+class Selection(object):
+    """Columns selected in the tree, held in one growable block per dtype over
+    a shared index.  Adding an item only copies the columns of that item
+    unless its index differs from the shared index, and extending the items
+    with rows only copies the new rows.  The blocks are never modified under
+    a frame already returned, so frames can be read on other threads
+
+    """
+
+    def __init__(self, capacity=16):
+        """Initiate an empty selection
+
+        Parameters
+        ----------
+        capacity: int
+            The number of columns allocated before a block has to grow
+
+        Returns
+        -------
+        Selection
+        """
+        self.capacity = capacity
+        self.clear()
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __contains__(self, keys):
+        return any(column[0] == keys for column in self.columns)
+
+    def clear(self):
+        """Remove every column from the selection"""
+        self.index = None
+        self.blocks = {}
+        self.counts = {}
+        self.columns = []
+
+    def keys(self):
+        """Return the keys of the selected items in the order they were added
+        """
+        result = []
+        for column in self.columns:
+            if column[0] not in result:
+                result.append(column[0])
+        return result
+
+    def column_keys(self):
+        """Return the keys of the tree item and the label of each column of
+        frame, in the order of its columns
+        """
+        return [(column[0], column[1]) for column in self.columns]
+
+    def add(self, keys, obj):
+        """Add the columns of obj, the object of the tree item with keys
+
+        Parameters
+        ----------
+        keys: tuple
+            The keys of the tree item
+        obj: pd.Series, pd.DataFrame, pd.Panel
+            The object selected
+        """
+        for label, ts in _columns(obj):
+            if ts.dtype.kind in 'biuf' and ts.index.is_unique:
+                self._add_column(keys, label, ts)
+            else:
+                self.columns.append((keys, label, ts.index, None,
+                                     ts.rename(label)))
+
+    def remove(self, keys):
+        """Remove the columns added for the tree item with keys
+
+        Parameters
+        ----------
+        keys: tuple
+            The keys of the tree item
+        """
+        keep = [column for column in self.columns if column[0] != keys]
+        if len(keep) == len(self.columns):
+            return
+        index = self.index
+        if any(column[3] is not None and not column[2].equals(self.index)
+               for column in self.columns if column[0] == keys):
+            indexes = [column[2] for column in keep if column[3] is not None]
+            index = indexes[0] if indexes else None
+            for other in indexes[1:]:
+                if not other.equals(index):
+                    index = index.union(other)
+        self._pack(index, keep)
+
+    def extend(self, rows):
+        """Append rows to the selected items without copying the rows already
+        selected, if every item selected is in rows and their new rows share
+        an index following the shared index
+
+        Parameters
+        ----------
+        rows: dict
+            The new rows of each selected item keyed by its keys, with the
+            columns and dtypes the item was added with
+
+        Returns
+        -------
+        bool
+            False if the selection is unchanged and the items have to be
+            added again instead
+        """
+        if self.index is None or set(self.keys()) != set(rows):
+            return False
+        new = dict((keys, list(_columns(obj)))
+                   for keys, obj in rows.iteritems())
+        index = None
+        values = []
+        for column in self.columns:
+            keys, label, _, dtype, _ = column
+            if dtype is None or not new[keys]:
+                return False
+            new_label, ts = new[keys].pop(0)
+            if index is None:
+                index = ts.index
+            if new_label != label or ts.dtype != dtype or \
+                    not ts.index.equals(index):
+                return False
+            values.append(ts.values)
+        if any(new.values()) or not index.is_monotonic_increasing or \
+                not self.index.is_monotonic_increasing or \
+                (len(index) and index[0] <= self.index[-1]):
+            return False
+        n = len(self.index)
+        self.index = self.index.append(index)
+        for dtype, block in self.blocks.items():
+            if block.shape[0] < len(self.index):
+                grown = np.empty((max(2 * block.shape[0], len(self.index)),
+                                  block.shape[1]), dtype)
+                grown[:n, :self.counts[dtype]] = block[:n, :self.counts[dtype]]
+                self.blocks[dtype] = grown
+        for i, column in enumerate(self.columns):
+            keys, label, _, dtype, position = column
+            self.blocks[dtype][n:len(self.index), position] = values[i]
+            self.columns[i] = (keys, label, self.index, dtype, position)
+        return True
+
+    def frame(self):
+        """Return the selected columns as a pd.DataFrame in the order they were
+        added, a view of the block if every column has the same numeric dtype
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        if not self.columns:
+            return pd.DataFrame()
+        labels = [column[1] for column in self.columns]
+        if len(self.blocks) == 1 and all(
+                column[3] is not None for column in self.columns):
+            values = self.blocks.values()[0][:len(self.index),
+                                             :len(self.columns)]
+            return pd.DataFrame(values, index=self.index, columns=labels,
+                                copy=False)
+        df = pd.DataFrame(pd.concat([self._series(column)
+                                     for column in self.columns], axis=1))
+        df.columns = labels
+        return df
+
+    def _series(self, column):
+        keys, label, _, dtype, location = column
+        if dtype is None:
+            return location
+        return pd.Series(self.blocks[dtype][:len(self.index), location],
+                         self.index, name=label)
+
+    def _add_column(self, keys, label, ts):
+        if self.index is None:
+            self.index = ts.index
+        elif not ts.index.equals(self.index):
+            index = self.index.union(ts.index)
+            if not index.equals(self.index):
+                self._reindex(index)
+        values = ts.values
+        aligned = ts.index.equals(self.index)
+        if not aligned and values.dtype.kind == 'b':
+            # missing rows make a bool column object, as in pd.concat
+            self.columns.append((keys, label, ts.index, None,
+                                 ts.rename(label)))
+            return
+        if not aligned and values.dtype.kind in 'iu':
+            values = values.astype(np.float64)
+        position = self._allocate(values.dtype)
+        block = self.blocks[values.dtype][:len(self.index)]
+        if aligned:
+            block[:, position] = values
+        else:
+            block[:, position] = np.nan
+            block[self.index.get_indexer(ts.index), position] = values
+        self.columns.append((keys, label, ts.index, values.dtype, position))
+
+    def _allocate(self, dtype):
+        n = self.counts.get(dtype, 0)
+        block = self.blocks.get(dtype)
+        if block is None:
+            block = np.empty((len(self.index), self.capacity), dtype)
+        elif n == block.shape[1]:
+            block = np.empty((block.shape[0], 2 * max(n, 1)), dtype)
+            block[:len(self.index), :n] = self.blocks[dtype][:len(self.index),
+                                                             :n]
+        self.blocks[dtype] = block
+        self.counts[dtype] = n + 1
+        return n
+
+    def _reindex(self, index):
+        self._pack(index, self.columns)
+
+    def _pack(self, index, columns):
+        """Copy columns into new blocks over index, which every column of a
+        block is reindexed to"""
+        aligned = []
+        for keys, label, ts_index, dtype, location in columns:
+            values = location
+            if dtype is not None:
+                values = _reindex(
+                    self.blocks[dtype][:len(self.index), location], self.index,
+                    index, label)
+            aligned.append((keys, label, ts_index, values))
+        counts = {}
+        for _, _, _, values in aligned:
+            if isinstance(values, np.ndarray):
+                counts[values.dtype] = counts.get(values.dtype, 0) + 1
+        self.index = index if counts else None
+        self.blocks = dict(
+            (dtype, np.empty((len(index), max(n, self.capacity)), dtype))
+            for dtype, n in counts.iteritems())
+        self.counts = dict.fromkeys(counts, 0)
+        self.columns = []
+        for keys, label, ts_index, values in aligned:
+            if not isinstance(values, np.ndarray):
+                self.columns.append((keys, label, ts_index, None, values))
+                continue
+            position = self.counts[values.dtype]
+            self.blocks[values.dtype][:, position] = values
+            self.counts[values.dtype] += 1
+            self.columns.append((keys, label, ts_index, values.dtype,
+                                 position))
+
+
+def _reindex(values, index, new_index, label):
+    """Return values over index reindexed to new_index, ints become floats
+    and bools a pd.Series of objects if rows are missing, as in pd.concat"""
+    if new_index is None or new_index.equals(index):
+        return values
+    indexer = index.get_indexer(new_index)
+    found = indexer >= 0
+    if found.all():
+        return values[indexer]
+    if values.dtype.kind == 'b':
+        return pd.Series(values.copy(), index, name=label).reindex(new_index)
+    if values.dtype.kind in 'iu':
+        values = values.astype(np.float64)
+    result = np.empty(len(new_index), values.dtype)
+    result[~found] = np.nan
+    result[found] = values[indexer[found]]
+    return result
+
+
+def _columns(obj):
+    if isinstance(obj, pd.Panel):
+        for itm in obj.items:
+            for item in _columns(obj.get(itm)):
+                yield item
+    elif isinstance(obj, pd.DataFrame):
+        for i, label in enumerate(obj.columns):
+            yield label, obj.iloc[:, i]
+    else:
+        yield obj.name, obj
@@ -0,0 +1,360 @@
+import os
+import shutil
+import hashlib
+import tempfile
+import cPickle
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from frames import LazyFrame
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.pandas_viewer', 'sidecar')
+MAX_BYTES = 10 * 2 ** 30
+META = 'meta.pickle'
+SOURCE = 'source'
+NUMERIC = 'biufcmM'
+
+_instances = weakref.WeakSet()
+
+
+class Sidecar(object):
+    """On disk cache of the arrays of a source file, one .npy per column, that
+    is memory-mapped when the file is opened again.  Entries are keyed by the
+    path, mtime and size of the source so a changed source is never read from
+    a stale entry.  Entries of the Sidecar instances alive in the process are
+    never evicted
+
+    """
+
+    def __init__(self, filepath, cache_dir=None, max_bytes=None):
+        """Initiate the cache entry for filepath
+
+        Parameters
+        ----------
+        filepath: str
+            The path of the source file
+        cache_dir: str, optional
+            The directory holding every entry, defaults to CACHE_DIR
+        max_bytes: int, optional
+            The total size of cache_dir above which the least recently used
+            entries are removed, defaults to MAX_BYTES
+
+        Returns
+        -------
+        Sidecar
+        """
+        self.filepath = os.path.abspath(filepath)
+        self.cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+        self.max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+        stat = os.stat(self.filepath)
+        # repr keeps every digit of the mtime, str only 12
+        key = '{}|{!r}|{}'.format(_encode(self.filepath), stat.st_mtime,
+                                  stat.st_size)
+        self.path = os.path.join(self.cache_dir, hashlib.sha1(key).hexdigest())
+        self._count = 0
+        self._arrays = {}
+        _instances.add(self)
+
+    def exists(self):
+        return os.path.exists(os.path.join(self.path, META))
+
+    def array(self, name):
+        """Memory-map the array name of the entry
+
+        Parameters
+        ----------
+        name: str
+
+        Returns
+        -------
+        np.memmap
+        """
+        if name not in self._arrays:
+            self._arrays[name] = np.load(
+                os.path.join(self.path, name + '.npy'), mmap_mode='r')
+        return self._arrays[name]
+
+    def save_array(self, values):
+        """Save values to a new .npy file in the entry
+
+        Parameters
+        ----------
+        values: np.ndarray
+
+        Returns
+        -------
+        str
+            The name to pass to array to load values
+        """
+        self._makedirs()
+        name = 'a{}'.format(self._count)
+        while os.path.exists(os.path.join(self.path, name + '.npy')):
+            self._count += 1
+            name = 'a{}'.format(self._count)
+        self._count += 1
+        _atomic_write(os.path.join(self.path, name + '.npy'),
+                      lambda f: np.save(f, np.ascontiguousarray(values)))
+        return name
+
+    def read_meta(self):
+        """Return the description of the cached object, or None if there is no
+        entry for the source.  Reading marks the entry as recently used
+        """
+        filepath = os.path.join(self.path, META)
+        try:
+            with open(filepath, 'rb') as f:
+                meta = cPickle.load(f)
+        except (IOError, EOFError):
+            return None
+        os.utime(filepath, None)
+        return meta
+
+    def write_meta(self, meta):
+        """Write the description of the cached object, marking the entry as
+        complete, then evict entries for older versions of the source and the
+        least recently used entries beyond max_bytes
+
+        Parameters
+        ----------
+        meta: tuple
+        """
+        self._makedirs()
+        _atomic_write(os.path.join(self.path, META),
+                      lambda f: cPickle.dump(meta, f,
+                                             cPickle.HIGHEST_PROTOCOL))
+        evict(self.cache_dir, self.max_bytes, keep=self.path)
+
+    def load(self):
+        """Return the cached object with its arrays memory-mapped, or None if
+        the source has not been cached
+
+        Returns
+        -------
+        object
+        """
+        meta = self.read_meta()
+        if meta is None:
+            return None
+        return self._decode(meta)
+
+    def store(self, obj):
+        """Cache obj, the object loaded from the source.  Failing to write the
+        cache never raises, the entry is removed instead
+
+        Parameters
+        ----------
+        obj: object
+        """
+        try:
+            self.write_meta(self._encode(obj))
+        except (IOError, OSError):
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def reload(self, keys):
+        """Load the source pickle again and return the object at keys in it,
+        for an entry removed since it was loaded, e.g. by another process
+
+        Parameters
+        ----------
+        keys: tuple
+            The keys of the object in the source
+
+        Returns
+        -------
+        object
+        """
+        import pickling
+        obj = pickling.load(self.filepath)
+        for key in keys:
+            obj = obj[key]
+        return obj
+
+    def _makedirs(self):
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+            with open(os.path.join(self.path, SOURCE), 'w') as f:
+                f.write(_encode(self.filepath))
+
+    def encode_index(self, index):
+        if isinstance(index, pd.DatetimeIndex) and index.tz is None:
+            return 'datetime', self.save_array(index.asi8), index.name
+        if index.dtype.kind in NUMERIC:
+            return 'array', self.save_array(index.values), index.name
+        return 'object', index
+
+    def decode_index(self, meta):
+        kind = meta[0]
+        if kind == 'datetime':
+            return pd.DatetimeIndex(self.array(meta[1]).view('M8[ns]'),
+                                    name=meta[2])
+        if kind == 'array':
+            return pd.Index(self.array(meta[1]), name=meta[2])
+        return meta[1]
+
+    def _encode(self, obj):
+        if isinstance(obj, dict):
+            return 'dict', [(k, self._encode(v)) for k, v in obj.iteritems()]
+        if isinstance(obj, pd.DataFrame) and obj.columns.is_unique and all(
+                dtype.kind in NUMERIC for dtype in obj.dtypes):
+            arrays = dict((c, self.save_array(obj[c].values))
+                          for c in obj.columns)
+            return ('frame', self.encode_index(obj.index), list(obj.columns),
+                    arrays)
+        if isinstance(obj, pd.Series) and obj.dtype.kind in NUMERIC:
+            return ('series', self.encode_index(obj.index), obj.name,
+                    self.save_array(obj.values))
+        if isinstance(obj, pd.Panel) and all(
+                dtype.kind in NUMERIC for dtype in obj.dtypes):
+            return ('panel', list(obj.items),
+                    self.encode_index(obj.major_axis), list(obj.minor_axis),
+                    self.save_array(obj.values))
+        return 'object', obj
+
+    def _decode(self, meta, keys=()):
+        kind = meta[0]
+        if kind == 'dict':
+            return dict((k, self._decode(v, keys + (k,))) for k, v in meta[1])
+        if kind == 'frame':
+            return SidecarFrame(self, meta[2], meta[3],
+                                self.decode_index(meta[1]), keys)
+        if kind == 'series':
+            return pd.Series(self.array(meta[3]), self.decode_index(meta[1]),
+                             name=meta[2])
+        if kind == 'panel':
+            return pd.Panel(self.array(meta[4]), items=meta[1],
+                            major_axis=self.decode_index(meta[2]),
+                            minor_axis=meta[3])
+        return meta[1]
+
+
+class SidecarFrame(LazyFrame):
+    """DataFrame whose columns are memory-mapped from a Sidecar entry, only the
+    columns read are copied into memory.  If the entry has been removed the
+    frame is loaded from the source instead
+
+    """
+
+    def __init__(self, sidecar, columns, arrays, index, keys=None):
+        """Initiate the frame from the arrays of a Sidecar
+
+        Parameters
+        ----------
+        sidecar: Sidecar
+            The entry holding the arrays
+        columns: list
+            The column names in order
+        arrays: dict
+            The name of the array of each column
+        index: pd.Index
+        keys: tuple, optional
+            The keys of the frame in the source pickle, loaded again if the
+            entry has been removed.  IOError is raised instead if not given
+
+        Returns
+        -------
+        SidecarFrame
+        """
+        super(SidecarFrame, self).__init__(columns)
+        self.sidecar = sidecar
+        self.arrays = arrays
+        self.index = index
+        self.keys = keys
+        self.source = None
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, column, default=None):
+        if column not in self.columns:
+            return default
+        return pd.Series(self.values(column), self.index, name=column)
+
+    def read(self, columns=None, start=None, stop=None):
+        if columns is None:
+            columns = self.columns
+        rows = slice(start, stop)
+        data = dict((c, self.values(c)[rows]) for c in columns)
+        return pd.DataFrame(data, index=self.index[rows], columns=columns)
+
+    def values(self, column):
+        """Return the memory-mapped array of column, or its values in the
+        source if the entry has been removed"""
+        if self.source is None:
+            try:
+                return self.sidecar.array(self.arrays[column])
+            except IOError:
+                if self.keys is None:
+                    raise
+                self.source = self.sidecar.reload(self.keys)
+        return self.source[column].values
+
+
+def entry_size(path):
+    """Return the total size of the files in the entry directory path"""
+    return sum(os.path.getsize(os.path.join(path, name))
+               for name in os.listdir(path))
+
+
+def evict(cache_dir, max_bytes, keep=None):
+    """Remove entries for sources that have changed since they were cached,
+    then remove the least recently used entries until cache_dir is no larger
+    than max_bytes
+
+    Parameters
+    ----------
+    cache_dir: str
+        The directory holding every entry
+    max_bytes: int
+        The maximum total size of the entries
+    keep: str, optional
+        The path of an entry that is never removed, besides the entries of the
+        Sidecar instances alive in the process
+    """
+    kept = set(sidecar.path for sidecar in list(_instances))
+    if keep is not None:
+        kept.add(keep)
+    entries = []
+    total = 0
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if path in kept:
+            if os.path.isdir(path):
+                total += entry_size(path)
+            continue
+        try:
+            with open(os.path.join(path, SOURCE)) as f:
+                source = f.read()
+            if not os.path.exists(source) or Sidecar(
+                    source, cache_dir).path != path:
+                shutil.rmtree(path, ignore_errors=True)
+                continue
+            used = os.path.getmtime(os.path.join(path, META))
+        except (IOError, OSError):
+            continue
+        entries.append((used, path, entry_size(path)))
+    total += sum(size for _, _, size in entries)
+    for used, path, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def _encode(filepath):
+    if isinstance(filepath, unicode):
+        return filepath.encode('utf-8')
+    return filepath
+
+
+def _atomic_write(filepath, write):
+    dirpath = os.path.dirname(filepath)
+    fd, temp_filepath = tempfile.mkstemp(dir=dirpath, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.rename(temp_filepath, filepath)
+    except Exception:
+        os.remove(temp_filepath)
+        raise
@@ -0,0 +1,44 @@
+import numpy as np
+
+STATISTICS = ('count', 'min', 'max', 'mean', 'std', 'zeros', 'nan_ratio')
+
+
+def column_stats(values):
+    """Return the statistics of a column with vectorized reductions over its
+    values, only a column with NaNs is copied to drop them
+
+    Parameters
+    ----------
+    values: np.ndarray
+        The 1d values of the column
+
+    Returns
+    -------
+    tuple
+        The value of each of STATISTICS, NaN where the statistic does not
+        apply to the dtype
+    """
+    n = len(values)
+    if values.dtype.kind not in 'biuf':
+        if values.dtype.kind == 'O':
+            nans = sum(1 for value in values
+                       if value is None or value != value)
+        else:
+            nans = 0
+        return (n - nans, np.nan, np.nan, np.nan, np.nan, np.nan,
+                nans / float(n) if n else np.nan)
+    if values.dtype.kind == 'f':
+        valid = ~np.isnan(values)
+        count = int(np.count_nonzero(valid))
+        if count < n:
+            values = values[valid]
+    else:
+        count = n
+    zeros = len(values) - int(np.count_nonzero(values))
+    if count == 0:
+        return (0, np.nan, np.nan, np.nan, np.nan, zeros,
+                1.0 if n else np.nan)
+    mean = values.mean(dtype=np.float64)
+    std = values.std(dtype=np.float64, ddof=1) if count > 1 else np.nan
+    return (count, float(values.min()), float(values.max()), float(mean),
+            float(std), zeros, (n - count) / float(n))
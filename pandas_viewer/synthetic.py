@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+import hdf5
+import pickling
+
+CHUNK_ROWS = 2 ** 16
+START = '1-Sep-15'
+FREQ = 'T'
+
+
+def frame_chunks(rows, cols, seed=0, chunk_rows=CHUNK_ROWS, start=START,
+                 freq=FREQ):
+    """Yield a DataFrame of cols random walks over rows dates, chunk_rows rows
+    at a time.  The walks take integer steps of hundredths so the values
+    depend only on seed, not on chunk_rows
+
+    Parameters
+    ----------
+    rows: int
+        The total number of rows
+    cols: int
+        The number of columns, named c0, c1, ...
+    seed: int
+        The seed of the random walks
+    chunk_rows: int
+        The number of rows in each chunk
+    start: str
+        The first date of the index
+    freq: str
+        The frequency of the index
+
+    Returns
+    -------
+    generator(pd.DataFrame)
+    """
+    state = np.random.RandomState(seed)
+    offset = to_offset(freq)
+    first = pd.Timestamp(start)
+    last = np.zeros(cols, dtype=np.int64)
+    columns = ['c{}'.format(i) for i in range(cols)]
+    for i in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - i)
+        steps = state.randint(-100, 101, (n, cols)).astype(np.int64)
+        level = last + steps.cumsum(axis=0)
+        last = level[-1]
+        index = pd.date_range(first + i * offset, periods=n, freq=offset,
+                              name='date')
+        yield pd.DataFrame(level / 100.0, index=index, columns=columns)
+
+
+def synthetic_frame(rows, cols, seed=0, **kwargs):
+    """Return the DataFrame of cols random walks over rows dates
+
+    Parameters
+    ----------
+    rows: int
+    cols: int
+    seed: int
+    kwargs:
+        Passed to frame_chunks
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    chunks = list(frame_chunks(rows, cols, seed, **kwargs))
+    if not chunks:
+        return pd.DataFrame(columns=['c{}'.format(i) for i in range(cols)])
+    return pd.concat(chunks)
+
+
+def leaf_paths(depth, width):
+    """Yield the keys of every leaf of a tree of dicts depth levels deep with
+    width children at each level, groups are named g0, g1, ... and leaves
+    df0, df1, ...
+
+    Parameters
+    ----------
+    depth: int
+        The number of levels of dicts, 0 for a single leaf
+    width: int
+        The number of children of each dict
+
+    Returns
+    -------
+    generator(tuple)
+    """
+    if depth == 0:
+        yield ()
+        return
+    prefix = 'df' if depth == 1 else 'g'
+    for i in range(width):
+        for path in leaf_paths(depth - 1, width):
+            yield ('{}{}'.format(prefix, i),) + path
+
+
+def synthetic_dict(rows, cols, depth, width, seed=0, **kwargs):
+    """Return a tree of dicts of synthetic frames, the leaf n of leaf_paths is
+    seeded with seed + n
+
+    Parameters
+    ----------
+    rows: int
+    cols: int
+    depth: int
+    width: int
+    seed: int
+    kwargs:
+        Passed to frame_chunks
+
+    Returns
+    -------
+    dict, pd.DataFrame
+        A single frame if depth is 0
+    """
+    result = {}
+    for n, path in enumerate(leaf_paths(depth, width)):
+        df = synthetic_frame(rows, cols, seed + n, **kwargs)
+        if not path:
+            return df
+        d = result
+        for key in path[:-1]:
+            d = d.setdefault(key, {})
+        d[path[-1]] = df
+    return result
+
+
+def write_csv(filepath, rows, cols, seed=0, chunk_rows=CHUNK_ROWS, **kwargs):
+    """Write a synthetic frame to filepath chunk_rows rows at a time
+
+    Parameters
+    ----------
+    filepath: str
+    rows: int
+    cols: int
+    seed: int
+    chunk_rows: int
+    kwargs:
+        Passed to frame_chunks
+    """
+    with open(filepath, 'w') as f:
+        for i, chunk in enumerate(frame_chunks(rows, cols, seed, chunk_rows,
+                                               **kwargs)):
+            chunk.to_csv(f, header=i == 0)
+
+
+def write_hdf5(filepath, rows, cols, depth, width, seed=0, **kwargs):
+    """Write a tree of synthetic frames to filepath as groups of frames read
+    lazily by hdf5.open_file, holding one frame in memory at a time
+
+    Parameters
+    ----------
+    filepath: str
+    rows: int
+    cols: int
+    depth: int
+        The number of levels of groups, at least 1
+    width: int
+    seed: int
+    kwargs:
+        Passed to hdf5.write_frame
+    """
+    import h5py
+    with h5py.File(filepath, 'w') as f:
+        for n, path in enumerate(leaf_paths(depth, width)):
+            group = f
+            for key in path[:-1]:
+                group = group.require_group(key)
+            hdf5.write_frame(group, path[-1],
+                             synthetic_frame(rows, cols, seed + n), **kwargs)
+
+
+def write_pickle(filepath, rows, cols, depth, width, seed=0, packed=False,
+                 **kwargs):
+    """Write a tree of synthetic frames to filepath with pickling.dump, or
+    pickling.dump_packed if packed
+
+    Parameters
+    ----------
+    filepath: str
+    rows: int
+    cols: int
+    depth: int
+    width: int
+    seed: int
+    packed: bool
+    kwargs:
+        Passed to pickling.dump_packed
+    """
+    obj = synthetic_dict(rows, cols, depth, width, seed)
+    if packed:
+        pickling.dump_packed(obj, filepath, **kwargs)
+    else:
+        pickling.dump(obj, filepath)
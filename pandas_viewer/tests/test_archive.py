@@ -0,0 +1,98 @@
+import os
+
+import pandas as pd
+import pytest
+from numpy import testing
+
+from .. import archive as archive_module, pickling, sidecar
+from ..archive import *
+
+
+@pytest.fixture
+def archive(tmpdir, monkeypatch, df, ts):
+    monkeypatch.setattr(sidecar, 'CACHE_DIR', str(tmpdir.join('sidecar')))
+    root = tmpdir.mkdir('archive')
+    root.mkdir('sub')
+    df.columns = ['a', 'b']
+    pickling.dump(dict(df=df, nested=dict(ts=ts)),
+                  str(root.join('sub', 'd.pickle')))
+    df.to_csv(str(root.join('df.csv')))
+    root.join('notes.txt').write('skipped')
+    return ArchiveIndex(str(root), str(tmpdir.join('index')))
+
+
+def test_scan(archive, df, ts):
+    assert archive.scan() == 2
+    tree = archive.tree()
+    assert list(tree) == ['df.csv', 'sub']
+    frame = tree['df.csv']
+    assert isinstance(frame, ArchiveFrame)
+    assert frame.columns == ['a', 'b']
+    assert frame.rows == len(df) and frame.start == str(df.index[0])
+    assert sorted(tree['sub']['d.pickle']) == ['df', 'nested']
+    series = tree['sub']['d.pickle']['nested']['ts']
+    assert series.columns == [] and series.rows == len(ts)
+    assert archive.scan() == 0
+
+
+def test_read(archive, df, ts):
+    archive.scan()
+    tree = archive.tree()
+    assert not archive.loaded.keys()
+    result = tree['sub']['d.pickle']['df'].read(['b'])
+    testing.assert_array_equal(result.values[:, 0], df['b'].values)
+    result = tree['sub']['d.pickle']['nested']['ts'].read()
+    testing.assert_array_equal(result.values[:, 0], ts.values)
+    assert list(archive.loaded.keys()) == ['sub/d.pickle']
+    result = tree['df.csv'].get('a')
+    testing.assert_array_almost_equal(result.values, df['a'].values)
+
+
+def test_rescan(archive, df):
+    archive.scan()
+    root = archive.root
+    os.remove(os.path.join(root, 'df.csv'))
+    with open(os.path.join(root, 'bad.pickle'), 'w') as f:
+        f.write('not a pickle')
+    df.iloc[:5].to_pickle(os.path.join(root, 'sub', 'new.pickle'))
+    percents = []
+    assert archive.scan(percents.append) == 2
+    assert percents == [50, 100]
+    tree = archive.tree()
+    assert list(tree) == ['sub']
+    assert tree['sub']['new.pickle'].rows == 5
+    connection = archive.connect()
+    error, = connection.execute(
+        "SELECT error FROM files WHERE path = 'bad.pickle'").fetchone()
+    connection.close()
+    assert error
+
+
+def test_scan_unicode(archive, df):
+    df = df.iloc[:3].copy()
+    df.index = ['caf\xc3\xa9', 'b', '\xff']
+    df.to_pickle(os.path.join(archive.root, 'caf\xc3\xa9.pickle'))
+    assert archive.scan() == 3
+    frame = archive.tree()[u'caf\xe9.pickle']
+    assert frame.start == u'caf\xe9' and frame.stop == u'\ufffd'
+    testing.assert_array_equal(frame.read().values, df.values)
+    assert archive.scan() == 0
+
+
+def test_describe_error(archive, monkeypatch):
+    def describe(obj, node=()):
+        yield ('df',), 'frame', [lambda: None], 1, None, None
+    monkeypatch.setattr(archive_module, 'describe', describe)
+    assert archive.scan() == 2
+    assert archive.tree() == {}
+    connection = archive.connect()
+    errors = connection.execute('SELECT error FROM files').fetchall()
+    connection.close()
+    assert len(errors) == 2 and all(error for error, in errors)
+
+
+def test_cancelled(archive):
+    from ..loading import LoadCancelled
+    with pytest.raises(LoadCancelled):
+        archive.scan(cancelled=lambda: True)
+    assert archive.tree() == {}
@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+import pytest
+from numpy import testing
+
+from ..batch import *
+from .. import pickling, sidecar
+
+
+@pytest.fixture
+def files(tmpdir, monkeypatch, df, ts):
+    monkeypatch.setattr(sidecar, 'CACHE_DIR', str(tmpdir.join('sidecar')))
+    input_dir = tmpdir.mkdir('input')
+    pickling.dump(dict(a=pd.DataFrame(df), b=dict(c=pd.Series(ts))),
+                  str(input_dir.join('d.pickle')))
+    pickling.dump(pd.DataFrame(df), str(input_dir.join('df.pickle')))
+    return str(input_dir)
+
+
+def test_find_and_iter(files, df):
+    filepaths = find_files([files])
+    assert [os.path.basename(f) for f in filepaths] == ['d.pickle',
+                                                         'df.pickle']
+    paths = sorted(path for path, _ in iter_frames(
+        pickling.load(filepaths[0])))
+    assert paths == [('a',), ('b', 'c')]
+    assert output_name(filepaths[0], ('b', 'c')) == 'd__b__c'
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_run(files, tmpdir, df, processes):
+    output_dir = str(tmpdir.join('output'))
+    job = Job(output_dir, freq='W', agg='sum', chart=None)
+    results = run(find_files([files]), job, processes)
+    assert sorted(written for _, written, _, _ in results) == [1, 2]
+    assert all(error is None for _, _, _, error in results)
+    assert not os.path.exists(str(tmpdir.join('sidecar')))
+    result = pd.read_csv(os.path.join(output_dir, 'df.csv'), index_col=0,
+                         parse_dates=True)
+    testing.assert_allclose(result.values, df.resample('W').sum().values)
+
+
+def test_render(files, tmpdir):
+    pytest.importorskip('matplotlib')
+    output_dir = str(tmpdir.join('output'))
+    run(find_files([files]), Job(output_dir, csv=False), 1)
+    assert os.path.exists(os.path.join(output_dir, 'd__a.png'))
+
+
+def test_failure(tmpdir):
+    filepath = str(tmpdir.join('bad.pickle'))
+    with open(filepath, 'w') as f:
+        f.write('not a pickle')
+    job = Job(str(tmpdir.join('output')), chart=None)
+    (result,) = run([filepath], job, 1)
+    assert result[0] == filepath and result[3]
@@ -0,0 +1,31 @@
+from ..cache import *
+
+
+def test_maxsize():
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    cache['c'] = 3
+    assert 'a' not in cache
+    assert cache.keys() == ['b', 'c']
+
+
+def test_get_marks_recently_used():
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+    cache['c'] = 3
+    assert cache.keys() == ['a', 'c']
+
+
+def test_sizeof():
+    cache = LRUCache(10, sizeof=len)
+    cache['a'] = 'x' * 6
+    cache['b'] = 'x' * 4
+    assert cache.currsize == 10
+    cache['c'] = 'x'
+    assert 'a' not in cache
+    assert cache.currsize == 5
+    cache['d'] = 'x' * 11
+    assert 'd' not in cache
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from numpy import testing
+
+from ..csvfile import *
+
+
+def test_columns(tmpdir, df):
+    filepath = str(tmpdir.join('df.csv'))
+    df.columns = ['a', 'b']
+    df.to_csv(filepath)
+    frame = CSVFrame(filepath)
+    assert frame.columns == ['a', 'b']
+    assert frame.parse_dates
+
+
+def test_read(tmpdir, df):
+    filepath = str(tmpdir.join('df.csv'))
+    df.columns = ['a', 'b']
+    df.to_csv(filepath)
+    frame = CSVFrame(filepath)
+    frame.chunksize = 7
+    result = frame.read()
+    testing.assert_array_almost_equal(result.values, df.values)
+    testing.assert_array_equal(result.index, df.index)
+    result = frame.read(['b', 'a'], 3, 12)
+    assert list(result.columns) == ['b', 'a']
+    testing.assert_array_almost_equal(result.values,
+                                      df.iloc[3:12, ::-1].values)
+    testing.assert_array_equal(result.index, df.index[3:12])
+
+
+def test_no_header(tmpdir, ts):
+    filepath = str(tmpdir.join('ts.csv'))
+    ts.to_csv(filepath, header=False)
+    frame = CSVFrame(filepath)
+    assert frame.header is None
+    series = frame.get(frame.columns[0])
+    testing.assert_array_almost_equal(series.values, ts.values)
+    testing.assert_array_equal(series.index, ts.index)
+
+
+def test_numeric_index_and_dtypes(tmpdir):
+    filepath = str(tmpdir.join('numbers.csv'))
+    df = pd.DataFrame({'i': [2 ** 60 + 1, 2, 3], 'f': [0.5, 1.5, 2.5]},
+                      columns=['i', 'f'])
+    df.to_csv(filepath)
+    frame = CSVFrame(filepath)
+    assert not frame.parse_dates
+    result = frame.read()
+    assert result.index.dtype.kind == 'i'
+    assert result['i'].dtype == np.int64
+    assert result['i'].iloc[0] == 2 ** 60 + 1
+
+
+def test_late_string_value(tmpdir, monkeypatch):
+    filepath = str(tmpdir.join('late.csv'))
+    values = [str(float(i)) for i in range(20)] + ['n/a?']
+    with open(filepath, 'w') as f:
+        f.write('index,a\n')
+        for i, value in enumerate(values):
+            f.write('{},{}\n'.format(i, value))
+    monkeypatch.setattr(CSVFrame, 'sample_rows', 5)
+    frame = CSVFrame(filepath)
+    assert frame.dtypes == {'a': np.float64}
+    result = frame.read()
+    assert list(result['a'].iloc[-2:]) == ['19.0', 'n/a?']
+    assert frame.dtypes == {}
@@ -0,0 +1,39 @@
+import numpy as np
+
+from ..decimate import *
+
+
+def test_minmax_keeps_envelope():
+    y = np.random.rand(10000)
+    idx = minmax_indices(y, 100)
+    assert len(idx) <= 202
+    assert y[idx].min() == y.min()
+    assert y[idx].max() == y.max()
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+
+
+def test_minmax_short_series():
+    y = np.random.rand(50)
+    np.testing.assert_array_equal(minmax_indices(y, 100), np.arange(50))
+
+
+def test_minmax_nan():
+    y = np.random.rand(1000)
+    y[:100] = np.nan
+    idx = minmax_indices(y, 10)
+    assert np.nanmax(y[idx]) == np.nanmax(y)
+
+
+def test_lttb():
+    x = np.arange(10000, dtype=float)
+    y = np.sin(x / 100.)
+    idx = lttb_indices(x, y, 500)
+    assert len(idx) == 500
+    assert (np.diff(idx) > 0).all()
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+
+
+def test_visible_slice():
+    x = np.arange(100, dtype=float)
+    visible = visible_slice(x, (10.5, 20.5))
+    assert visible == slice(10, 22)
@@ -0,0 +1,55 @@
+import os
+
+import pandas as pd
+import pytest
+from numpy import testing
+
+from ..export import *
+from ..loading import load_file
+from .. import hdf5, pickling, sidecar
+
+
+@pytest.mark.parametrize('ext', ['.csv', '.npy', '.npz', '.h5', '.pickle'])
+def test_round_trip(tmpdir, monkeypatch, df, ext):
+    monkeypatch.setattr(sidecar, 'CACHE_DIR', str(tmpdir.join('sidecar')))
+    df = pd.DataFrame(df)
+    df.columns = ['a', 'b']
+    filepath = str(tmpdir.join('df' + ext))
+    percents = []
+    export(df, filepath, progress=percents.append, chunk_rows=7)
+    assert percents[-1] == 100 and percents == sorted(percents)
+    assert os.listdir(str(tmpdir)) == ['df' + ext]
+    result = load_file(filepath)
+    if isinstance(result, hdf5.H5Group):
+        result = result.get('data').read()
+    elif not isinstance(result, pd.DataFrame):
+        result = result.read()
+    testing.assert_allclose(result.values, df.values)
+    testing.assert_array_equal(result.index, df.index)
+    assert list(result.columns) == ['a', 'b']
+
+
+def test_object_columns(tmpdir, df):
+    df = pd.DataFrame(df)
+    df['label'] = 'x'
+    filepath = str(tmpdir.join('df.npy'))
+    export(df, filepath)
+    result = read_npy(filepath)
+    assert list(result['label']) == ['x'] * len(df)
+
+
+def test_cancelled_keeps_existing_file(tmpdir, df):
+    filepath = str(tmpdir.join('df.csv'))
+    with open(filepath, 'w') as f:
+        f.write('old')
+    with pytest.raises(ExportCancelled):
+        export(pd.DataFrame(df), filepath, cancelled=lambda: True,
+               chunk_rows=7)
+    assert os.listdir(str(tmpdir)) == ['df.csv']
+    with open(filepath) as f:
+        assert f.read() == 'old'
+
+
+def test_unknown_format(tmpdir, df):
+    with pytest.raises(ValueError):
+        export(df, str(tmpdir.join('df.xls')))
@@ -0,0 +1,57 @@
+from ..formatting import *
+
+
+def test_format_block(df):
+    block = format_block(df, 2, 5)
+    assert block.shape == (3, len(df.columns) + 1)
+    for i in range(3):
+        row = i + 2
+        assert block[i, 0] == df.index[row].strftime(DATE_FORMAT)
+        for j in range(len(df.columns)):
+            assert float(block[i, j + 1]) == df.iloc[row, j]
+
+
+def test_format_block_past_end(df):
+    block = format_block(df, len(df) - 1, len(df) + 10)
+    assert block.shape == (1, len(df.columns) + 1)
+
+
+def test_format_block_rows():
+    df = pd.DataFrame(dict(a=[1, 2, 3]), index=['x', 'y', 'z'])
+    block = format_block(df, 1, 3, rows=np.array([2, 0, 1]))
+    assert block.tolist() == [['x', '1'], ['y', '2']]
+
+
+def test_format_values_datetime():
+    df = pd.DataFrame(dict(
+        t=pd.to_datetime(['2014-01-01', '2014-01-02 03:04:05.5', None]),
+        d=pd.to_timedelta(['1 days', '2 hours', None])), columns=['t', 'd'])
+    assert format_values(df).tolist() == [
+        ['2014-01-01 00:00:00', '1 days 00:00:00'],
+        ['2014-01-02 03:04:05.500000', '0 days 02:00:00'],
+        ['NaT', 'NaT']]
+
+
+def test_sample_positions():
+    assert list(sample_positions(5, 8)) == range(5)
+    positions = sample_positions(10 ** 8, 256)
+    assert len(positions) == 256
+    assert positions[0] == 0 and positions[-1] == 10 ** 8 - 1
+    assert (np.diff(positions) > 0).all()
+    assert (positions == sample_positions(10 ** 8, 256)).all()
+
+
+def test_widest_value():
+    values = np.zeros(10000, dtype=np.int64)
+    values[5001] = -123456
+    positions = sample_positions(len(values), 16)
+    assert 5001 not in positions
+    assert widest_value(values, positions) == '-123456'
+    assert widest_value(np.array(['a', 'abc', 'ab'], dtype=object),
+                        np.arange(3)) == 'abc'
+    assert widest_value(np.array([np.nan]), np.arange(1)) == 'nan'
+    assert widest_string(np.array([], dtype=object)) == ''
+    strings = np.array(['\xc3\xa9\xc3\xa9', 'abc', u'\xe9'], dtype=object)
+    assert widest_string(strings) == 'abc'
+    index = pd.date_range('2016-01-01', periods=3)
+    assert widest_index(index, np.arange(3)) == '01-Jan-16 00:00'
@@ -0,0 +1,97 @@
+import h5py
+import numpy as np
+import pandas as pd
+from numpy import testing
+
+from ..hdf5 import *
+
+
+def test_write_frame(tmpdir, df):
+    filepath = str(tmpdir.join('df.h5'))
+    with h5py.File(filepath, 'w') as f:
+        write_frame(f.create_group('group'), 'df', df, chunk_rows=4)
+    root = open_file(filepath)
+    assert list(root) == ['group']
+    frame = root.get('group').get('df')
+    assert isinstance(frame, H5Frame)
+    assert frame.columns == [str(c) for c in df.columns]
+    result = frame.read()
+    testing.assert_array_equal(result.values, df.values)
+    testing.assert_array_equal(result.index, df.index)
+
+
+def test_read_projection(tmpdir, df):
+    filepath = str(tmpdir.join('df.h5'))
+    with h5py.File(filepath, 'w') as f:
+        write_frame(f, 'df', df, chunk_rows=4)
+    frame = open_file(filepath).get('df')
+    result = frame.read(['1'], 3, 10)
+    testing.assert_array_equal(result.values[:, 0], df.iloc[3:10, 1].values)
+    testing.assert_array_equal(result.index, df.index[3:10])
+    series = frame.get('0')
+    testing.assert_array_equal(series.values, df.iloc[:, 0].values)
+
+
+def test_memmap_dataset(tmpdir):
+    filepath = str(tmpdir.join('values.h5'))
+    values = np.random.rand(20, 3)
+    with h5py.File(filepath, 'w') as f:
+        f.create_dataset('values', data=values)
+    frame = open_file(filepath).get('values')
+    assert isinstance(frame.values, np.memmap)
+    assert frame.columns == [0, 1, 2]
+    testing.assert_array_equal(frame.read().values, values)
+
+
+def test_compound_dataset(tmpdir):
+    filepath = str(tmpdir.join('compound.h5'))
+    values = np.zeros(10, dtype=[('x', 'f8'), ('y', 'i4')])
+    values['x'] = np.random.rand(10)
+    values['y'] = np.arange(10)
+    with h5py.File(filepath, 'w') as f:
+        f.create_dataset('values', data=values, chunks=(4,))
+    frame = open_file(filepath).get('values')
+    assert frame.columns == ['x', 'y']
+    testing.assert_array_equal(frame.read(['y'], 2, 7).values[:, 0],
+                               np.arange(2, 7))
+
+
+def test_pop_hides(tmpdir, df):
+    filepath = str(tmpdir.join('df.h5'))
+    with h5py.File(filepath, 'w') as f:
+        write_frame(f, 'df', df)
+    root = open_file(filepath)
+    root.get('df').pop('0')
+    assert root.get('df').columns == ['1']
+    root.pop('df')
+    assert len(root) == 0
+
+
+def test_unframed_datasets_are_leaves(tmpdir):
+    filepath = str(tmpdir.join('leaves.h5'))
+    with h5py.File(filepath, 'w') as f:
+        f.create_dataset('scalar', data=1.5)
+        f.create_dataset('cube', data=np.zeros((2, 3, 4)))
+        f.create_dataset('values', data=np.arange(5))
+    root = open_file(filepath)
+    children = dict(root.iteritems())
+    assert isinstance(children['scalar'], h5py.Dataset)
+    assert isinstance(children['cube'], h5py.Dataset)
+    assert isinstance(children['values'], H5Frame)
+
+
+def test_write_mixed_frame(tmpdir, df):
+    filepath = str(tmpdir.join('mixed.h5'))
+    df = pd.DataFrame(df)
+    df['i'] = np.arange(len(df))
+    df['s'] = ['\xc3\xa9{}'.format(i) for i in range(len(df))]
+    with h5py.File(filepath, 'w') as f:
+        write_frame(f, 'df', df, chunk_rows=4)
+    frame = open_file(filepath).get('df')
+    assert frame.columns == ['0', '1', 'i', 's']
+    result = frame.read()
+    testing.assert_array_equal(result.iloc[:, :2].values,
+                               df.iloc[:, :2].values)
+    testing.assert_array_equal(result['i'].values, df['i'].values)
+    assert result['s'].iloc[3] == u'\xe93'
+    testing.assert_array_equal(result.index, df.index)
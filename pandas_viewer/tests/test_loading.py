@@ -0,0 +1,31 @@
+import pytest
+import pandas as pd
+from numpy import testing
+
+from .. import pickling
+from ..loading import *
+
+
+def test_progress(tmpdir, df):
+    filepath = str(tmpdir.join('df.pickle'))
+    pickling.dump(df, filepath)
+    percents = []
+    result = pickling.load(filepath, progress=percents.append)
+    testing.assert_array_equal(result.values, df.values)
+    assert percents == sorted(percents)
+    assert percents[-1] == 100
+
+
+def test_cancelled(tmpdir, df):
+    filepath = str(tmpdir.join('df.pickle'))
+    pickling.dump(df, filepath)
+    with pytest.raises(LoadCancelled):
+        pickling.load(filepath, cancelled=lambda: True)
+
+
+def test_csv(tmpdir, df):
+    filepath = str(tmpdir.join('df.csv'))
+    df.to_csv(filepath)
+    with ProgressFile(filepath) as f:
+        result = pd.read_csv(f, index_col=0, parse_dates=True)
+    testing.assert_array_almost_equal(result.values, df.values)
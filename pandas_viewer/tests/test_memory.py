@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+from numpy import testing
+
+from .. import pickling, sidecar
+from ..csvfile import CSVFrame
+from ..frames import LazyFrame
+from ..loading import load_file
+from ..memory import *
+
+
+def test_budget():
+    budget = MemoryBudget(100)
+    for key in 'abc':
+        budget.add(key, 40)
+    budget.add('d', 30, evictable=False)
+    assert budget.total == 150 and 'd' in budget
+    assert budget.over_budget() == ['a', 'b']
+    budget.touch('a')
+    assert budget.over_budget() == ['b', 'c']
+    assert budget.over_budget(keep={'b'}) == ['c', 'a']
+    budget.remove('b')
+    assert budget.over_budget() == ['c']
+    budget.budget = 200
+    assert budget.over_budget() == []
+
+
+def test_object_size(tmpdir, df, ts):
+    assert object_size(df) == df.memory_usage(index=True, deep=True).sum()
+    assert object_size(dict(a=df, b=dict(c=ts))) == object_size(df) + \
+        object_size(ts)
+    values = np.arange(10.)
+    assert object_size(values) == values.nbytes
+    filepath = str(tmpdir.join('df.csv'))
+    df.to_csv(filepath)
+    assert object_size(CSVFrame(filepath)) == 0
+
+
+def test_evict_spill(tmpdir, df, ts):
+    spill = Spill(str(tmpdir))
+    obj = dict(df=df, ts=ts, text=pd.Series(['a', 'b']))
+    replacement, entry = evict(obj, spill=spill)
+    assert entry is not None
+    assert isinstance(replacement['df'], LazyFrame)
+    testing.assert_array_equal(replacement['df'].read().values, df.values)
+    testing.assert_array_equal(replacement['ts'].values, ts.values)
+    assert object_size(replacement) < object_size(obj)
+    assert object_size(replacement) == object_size(obj['text']) + int(
+        ts.index.memory_usage(deep=True))
+    spill.remove(entry)
+    assert not tmpdir.listdir()
+    assert evict(obj) == (obj, None)
+
+
+def test_evict_source(tmpdir, monkeypatch, df):
+    monkeypatch.setattr(sidecar, 'CACHE_DIR', str(tmpdir.join('sidecar')))
+    filepath = str(tmpdir.join('df.pickle'))
+    pickling.dump(dict(df=df), filepath)
+    load_file(filepath)
+    replacement, entry = evict(pickling.load(filepath), filepath,
+                               Spill(str(tmpdir.mkdir('spill'))))
+    assert entry is None
+    assert isinstance(replacement['df'], LazyFrame)
+    testing.assert_array_equal(replacement['df'].read().values, df.values)
+
+
+def test_evict_csv(tmpdir, monkeypatch, df):
+    monkeypatch.setattr(sidecar, 'CACHE_DIR', str(tmpdir.join('sidecar')))
+    filepath = str(tmpdir.join('df.csv'))
+    df.to_csv(filepath)
+    load_file(filepath).read()
+    spill = Spill(str(tmpdir.mkdir('spill')))
+    replacement, entry = evict(df, filepath, spill)
+    assert entry is not None
+    assert isinstance(replacement, LazyFrame)
+    testing.assert_array_equal(replacement.read().values, df.values)
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from numpy import testing
 
@@ -41,3 +42,39 @@ def test_random_dict(random_dict):
         testing.assert_array_equal(v.values, test_obj.values)
         attr = 'items' if isinstance(v, pd.Panel) else 'index'
         testing.assert_array_equal(getattr(v, attr), getattr(test_obj, attr))
+
+
+def test_df_minus(df):
+    df2 = random.RandomDataFrame()
+    result = dict_minus(df, df2)
+    testing.assert_array_equal(result.values, (df - df2).values)
+
+
+def test_misaligned_dict():
+    d1 = dict(a=random.RandomSeries(end='20-Sep-15'),
+              b=dict(c=random.RandomDataFrame(start='5-Sep-15'),
+                     d=random.RandomDataFrame(start='5-Sep-15')),
+              e=random.RandomSeries())
+    d2 = dict(a=random.RandomSeries(start='10-Sep-15'),
+              b=dict(c=random.RandomSeries(end='25-Sep-15'),
+                     d=random.RandomDataFrame(end='25-Sep-15')))
+    result = dict_plus(d1, d2, processes=2)
+    for keys in [('a',), ('b', 'c'), ('b', 'd')]:
+        lhs = reduce(lambda x, y: x[y], keys, d1)
+        rhs = reduce(lambda x, y: x[y], keys, d2)
+        value = reduce(lambda x, y: x[y], keys, result)
+        test_obj = lhs.add(rhs, axis=0)
+        testing.assert_array_equal(value.values, test_obj.values)
+        testing.assert_array_equal(value.index, test_obj.index)
+    assert result['e'] is None
+
+
+def test_mixed_float_dtypes(df):
+    df = df.astype('float32')
+    df[df.columns[0]] = df[df.columns[0]].astype('float64')
+    df2 = random.RandomDataFrame().astype('float32')
+    result = dict_plus(dict(a=df, b=df2), dict(a=df2, b=df2))
+    expected = df.add(df2, axis=0)
+    assert list(result['a'].dtypes) == list(expected.dtypes)
+    testing.assert_array_equal(result['a'].values, expected.values)
+    assert set(result['b'].dtypes) == {np.dtype('float32')}
@@ -0,0 +1,67 @@
+from ..pathindex import *
+
+
+def test_add_resolve(random_dict):
+    index = PathIndex()
+    assert index.add(('d',), dict(d=random_dict))
+    assert len(index) == 1
+    df = random_dict['df']
+    assert ('d', 'df') not in index
+    assert (('d', 'df'), True) in index.expand(('d',))
+    children = index.expand(('d', 'df'))
+    assert children == [(('d', 'df', c), False) for c in df.columns]
+    assert index.parent(('d', 'df', df.columns[0])) is df
+    assert index.resolve(('d', 'df', df.columns[0])).equals(
+        df[df.columns[0]])
+    assert index.expand(('d', 'df', df.columns[0])) == []
+    assert len(index) == 1 + 3 + len(df.columns)
+
+
+def test_walk(random_dict):
+    df, pl = random_dict['df'], random_dict['pl']
+    paths = walk(('d',), random_dict)
+    assert paths[0] == ('d',)
+    assert ('d', 'df', df.columns[0]) in paths
+    assert ('d', 'pl', pl.items[0], pl.minor_axis[0]) in paths
+    assert len(paths) == 1 + 3 + len(df.columns) + len(pl.items) * (
+        1 + len(pl.minor_axis))
+
+
+def test_search(random_dict):
+    index = PathIndex()
+    index.add(('d',), dict(d=random_dict))
+    assert index.search('D/T') == []
+    index.expand(('d',))
+    assert index.search('D/T') == [('d', 'ts')]
+    index.add_walk(('d',), walk(('d',), random_dict))
+    pl = random_dict['pl']
+    assert ('d', 'pl', pl.items[0], pl.minor_axis[0]) in index.search('pl')
+    assert len(index.search('d', limit=2)) == 2
+    assert index.search('missing') == []
+    assert index.search('') == []
+
+
+def test_remove(random_dict):
+    index = PathIndex()
+    index.add(('d',), dict(d=random_dict))
+    index.expand(('d',))
+    index.expand(('d', 'df'))
+    index.add_walk(('d',), walk(('d',), random_dict))
+    removed = index.remove(('d', 'df'))
+    assert ('d', 'df') in removed
+    assert not any(path[:2] == ('d', 'df') for path in index.nodes)
+    assert ('d', 'df') not in index.children[('d',)]
+    assert index.search('df') == []
+    index.remove(('d',))
+    assert index.walked == {} and len(index) == 0
+
+
+def test_search_unicode(df):
+    index = PathIndex()
+    index.add((u'caf\xe9',), {u'caf\xe9': dict(df=df)})
+    index.add(('na\xc3\xafve',), {'na\xc3\xafve': dict(df=df)})
+    index.add_walk((u'caf\xe9',), walk((u'caf\xe9',), dict(df=df)))
+    index.add_walk(('na\xc3\xafve',), walk(('na\xc3\xafve',), dict(df=df)))
+    assert index.search(u'CAF\xc9/df')[0] == (u'caf\xe9', 'df')
+    assert index.search('\xc3\xaf')[0] == ('na\xc3\xafve',)
+    assert format_path((u'caf\xe9', 1)) == u'caf\xe9/1'
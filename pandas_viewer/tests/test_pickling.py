@@ -0,0 +1,45 @@
+import pytest
+import numpy as np
+import pandas as pd
+from numpy import testing
+
+from ..pickling import *
+
+
+@pytest.mark.parametrize('codec', sorted(CODECS))
+def test_packed_roundtrip(tmpdir, random_dict, codec):
+    filepath = str(tmpdir.join('dict.pickle'))
+    dump_packed(random_dict, filepath, codec=codec, chunk_size=64)
+    assert is_packed(filepath)
+    result = load(filepath)
+    assert sorted(result) == sorted(random_dict)
+    for k, v in result.iteritems():
+        testing.assert_array_equal(v.values, random_dict[k].values)
+    testing.assert_array_equal(result['df'].index, random_dict['df'].index)
+
+
+def test_packed_key(tmpdir, random_dict):
+    filepath = str(tmpdir.join('dict.pickle'))
+    dump_packed(random_dict, filepath)
+    assert sorted(keys(filepath)) == ['df', 'pl', 'ts']
+    result = load_packed(filepath, key='df')
+    testing.assert_array_equal(result.values, random_dict['df'].values)
+    with pytest.raises(KeyError):
+        load_packed(filepath, key='missing')
+
+
+def test_packed_fortran_order(tmpdir):
+    filepath = str(tmpdir.join('array.pickle'))
+    array = np.asfortranarray(np.random.rand(300, 7))
+    dump_packed(array, filepath, chunk_size=1000)
+    result = load_packed(filepath)
+    testing.assert_array_equal(result, array)
+
+
+def test_convert(tmpdir, df):
+    src = str(tmpdir.join('df.pickle'))
+    dst = str(tmpdir.join('df_packed.pickle'))
+    dump(df, src)
+    assert not is_packed(src)
+    convert(src, dst)
+    testing.assert_array_equal(load(dst).values, df.values)
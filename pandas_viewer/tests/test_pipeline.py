@@ -0,0 +1,56 @@
+from ..pipeline import *
+
+
+def make_pipeline(calls):
+    def stage(name, func):
+        def wrapped(*args):
+            calls.append(name)
+            return func(*args)
+        return wrapped
+    pipeline = Pipeline()
+    pipeline.add_stage('source', stage('source', lambda: 2))
+    pipeline.add_stage('double', stage('double', lambda x: 2 * x), 'source')
+    pipeline.add_stage('square', stage('square', lambda x: x ** 2), 'double')
+    pipeline.add_stage('negate', stage('negate', lambda x: -x), 'double')
+    return pipeline
+
+
+def test_run():
+    calls = []
+    pipeline = make_pipeline(calls)
+    pipeline.run()
+    assert calls == ['source', 'double', 'square', 'negate']
+    assert pipeline['square'] == 16
+    assert pipeline['negate'] == -4
+
+
+def test_invalidate_downstream_only():
+    calls = []
+    pipeline = make_pipeline(calls)
+    pipeline.run()
+    del calls[:]
+    pipeline.invalidate('square')
+    pipeline.run()
+    assert calls == ['square']
+    del calls[:]
+    pipeline.invalidate('double')
+    pipeline.run()
+    assert calls == ['double', 'square', 'negate']
+
+
+def test_downstream():
+    pipeline = make_pipeline([])
+    assert pipeline.downstream('double') == ['double', 'square', 'negate']
+
+
+def test_set():
+    calls = []
+    pipeline = Pipeline()
+    pipeline.add_stage('source', lambda: 1)
+    pipeline.add_stage('double', lambda x: calls.append(x) or 2 * x, 'source')
+    pipeline.add_stage('add', lambda x: x + 1, 'double')
+    pipeline.run()
+    pipeline.set('double', 10)
+    pipeline.run()
+    assert pipeline['add'] == 11
+    assert calls == [1]
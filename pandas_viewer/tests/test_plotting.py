@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from ..plotting import *
+
+
+@pytest.fixture
+def subplot():
+    pytest.importorskip('matplotlib')
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig.add_subplot(111)
+
+
+@pytest.mark.parametrize('decimation', [None, 'minmax'])
+def test_update_lines(subplot, decimation):
+    x = np.arange(10000, dtype=float)
+    values = np.random.RandomState(0).randn(len(x), 3)
+    plot_frame(subplot, x, values, 'line', decimation, 100)
+    lines = subplot.get_lines()
+    assert len(lines) == 3
+    x, values = x[::10], values[::10] * 2
+    update_lines(lines, x, values, decimation, 100)
+    assert subplot.get_lines() == lines
+    expected = subplot.figure.add_subplot(111, label='expected')
+    plot_frame(expected, x, values, 'line', decimation, 100)
+    for line, other in zip(lines, expected.get_lines()):
+        np.testing.assert_array_equal(line.get_xdata(), other.get_xdata())
+        np.testing.assert_array_equal(line.get_ydata(), other.get_ydata())
@@ -0,0 +1,52 @@
+import json
+
+from ..profiling import *
+
+
+def test_disabled():
+    profiler = Profiler(enabled=False)
+    with profiler.span('load'):
+        pass
+    assert len(profiler.events) == 0
+
+
+def test_nested_spans():
+    profiler = Profiler(enabled=True)
+    reported = []
+    profiler.listeners.append(reported.append)
+    with profiler.span('dataframe_changed', shape=[2, 3]):
+        with profiler.span('resample'):
+            pass
+        with profiler.span('draw'):
+            pass
+    assert [e['name'] for e in profiler.events] == [
+        'resample', 'draw', 'dataframe_changed']
+    assert [e['depth'] for e in profiler.events] == [1, 1, 0]
+    assert len(reported) == 1
+    assert reported[0][-1]['args'] == dict(shape=[2, 3])
+    assert format_events(reported[0]).startswith('dataframe_changed')
+    assert 'resample' in format_events(reported[0])
+
+
+def test_timed_and_max_events():
+    profiler = Profiler(enabled=True, max_events=2)
+    func = profiler.timed()(lambda x: x + 1)
+    assert [func(i) for i in range(3)] == [1, 2, 3]
+    assert len(profiler.events) == 2
+    assert profiler.events[0]['name'] == '<lambda>'
+
+
+def test_export(tmpdir):
+    profiler = Profiler(enabled=True)
+    with profiler.span('load_file', filepath='df.pickle'):
+        pass
+    filepath = str(tmpdir.join('trace.json'))
+    profiler.to_chrome_trace(filepath)
+    with open(filepath) as f:
+        trace = json.load(f)
+    event = trace['traceEvents'][0]
+    assert event['ph'] == 'X' and event['name'] == 'load_file'
+    assert event['args']['filepath'] == 'df.pickle'
+    profiler.to_json(filepath)
+    with open(filepath) as f:
+        assert json.load(f)[0]['name'] == 'load_file'
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..rowview import *
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(dict(a=[3., np.nan, 1., 2.], b=['x', 'yz', 'Y', 'w']),
+                        index=pd.date_range('2016-01-01', periods=4),
+                        columns=['a', 'b'])
+
+
+def test_sort(df):
+    view = RowView(df)
+    assert view.rows is None and len(view) == 4
+    view.sort(0)
+    assert list(view.rows) == [2, 3, 0, 1]
+    view.sort(0, ascending=False)
+    assert list(view.rows) == [0, 3, 2, 1]
+    view.sort(INDEX, ascending=False)
+    assert list(view.rows) == [3, 2, 1, 0]
+    view.sort(None)
+    assert view.rows is None
+    assert set(view._argsorts) == {0, INDEX}
+
+
+def test_filter(df):
+    view = RowView(df)
+    view.add_filter(0, *parse_filter('>= 2'))
+    assert list(view.rows) == [0, 3]
+    view.sort(0)
+    assert list(view.rows) == [3, 0]
+    assert view.position(0) == 3
+    view.add_filter(1, *parse_filter('w'))
+    assert list(view.rows) == [3]
+    view.remove_filter(1)
+    view.add_filter(1, *parse_filter('contains y'))
+    assert len(view) == 0
+    view.clear_filters()
+    assert list(view.rows) == [2, 3, 0, 1]
+    view.add_filter(INDEX, '<', '2016-01-03')
+    assert list(view.rows) == [0, 1]
+    with pytest.raises(ValueError):
+        view.add_filter(0, '>', 'abc')
+    assert list(view.filters) == [INDEX]
+
+
+def test_restore(df):
+    view = RowView(df)
+    view.sort(1, ascending=False)
+    view.add_filter(0, '>', '1')
+    view.add_filter(INDEX, '>', '2016-01-01')
+    restored = RowView(df[['b']])
+    restored.restore(view)
+    assert restored.sort_column == 0 and not restored.ascending
+    assert list(restored.filters) == [INDEX]
+    assert list(restored.rows) == [1, 3, 2]
+
+
+def test_duplicate_labels():
+    df = pd.DataFrame([[1., 3.], [2., 1.], [3., 2.]], columns=['a', 'a'])
+    view = RowView(df)
+    view.sort(1)
+    assert list(view.rows) == [1, 2, 0]
+    view.add_filter(1, '>', '1')
+    assert list(view.rows) == [2, 0]
+    restored = RowView(pd.concat([pd.Series(0., name='b'), df], axis=1))
+    restored.restore(view)
+    assert restored.sort_column == 2 and list(restored.filters) == [2]
+    assert list(restored.rows) == [2, 0]
+
+
+def test_parse_filter():
+    assert parse_filter(' > 1.5 ') == ('>', '1.5')
+    assert parse_filter('=abc') == ('=', 'abc')
+    assert parse_filter('contains a b') == ('contains', 'a b')
+    assert parse_filter('abc') == (None, 'abc')
+    assert parse_filter('') == (None, '')
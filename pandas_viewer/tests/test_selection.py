@@ -0,0 +1,125 @@
+import pandas as pd
+from numpy import testing
+
+from ..selection import *
+from .. import random
+
+
+def test_add_remove(df):
+    selection = Selection(capacity=1)
+    selection.add(('df', 0), df[0])
+    selection.add(('df', 1), df[1])
+    result = selection.frame()
+    testing.assert_array_equal(result.values, df.values)
+    assert list(result.columns) == [0, 1]
+    selection.remove(('df', 0))
+    result = selection.frame()
+    testing.assert_array_equal(result.values[:, 0], df[1].values)
+    assert selection.keys() == [('df', 1)]
+
+
+def test_shared_index_is_view(df):
+    selection = Selection()
+    selection.add(('df',), df)
+    result = selection.frame()
+    assert result.values.base is not None
+    testing.assert_array_equal(result.values, df.values)
+
+
+def test_misaligned(df):
+    ts = random.RandomSeries(start='20-Sep-15', end='10-Oct-15')
+    selection = Selection()
+    selection.add(('df',), df)
+    selection.add(('ts',), ts)
+    test_df = pd.concat([pd.DataFrame(df), pd.Series(ts)], axis=1)
+    result = selection.frame()
+    testing.assert_array_equal(result.values, test_df.values)
+    testing.assert_array_equal(result.index, test_df.index)
+    selection.remove(('ts',))
+    result = selection.frame()
+    testing.assert_array_equal(result.values, df.values)
+    testing.assert_array_equal(result.index, df.index)
+
+
+def test_panel(pl):
+    selection = Selection()
+    selection.add(('pl',), pl)
+    test_df = pd.concat([pl.get(itm) for itm in pl.items], axis=1)
+    testing.assert_array_equal(selection.frame().values, test_df.values)
+
+
+def test_non_numeric(df):
+    selection = Selection()
+    selection.add(('df',), df)
+    selection.add(('names',), pd.Series('x', df.index, name='names'))
+    result = selection.frame()
+    assert list(result.columns) == [0, 1, 'names']
+    selection.remove(('names',))
+    assert list(selection.frame().columns) == [0, 1]
+
+
+def test_column_keys(df):
+    selection = Selection()
+    selection.add(('df',), df)
+    selection.add(('ts',), pd.Series(['a'] * len(df), df.index, name='s'))
+    assert selection.column_keys() == [(('df',), 0), (('df',), 1),
+                                       (('ts',), 's')]
+    assert len(selection.frame().columns) == 3
+
+
+def test_remove_keeps_returned_frame(df):
+    selection = Selection()
+    selection.add(('a',), df)
+    selection.add(('b',), df * 2)
+    before = selection.frame()
+    expected = before.values.copy()
+    selection.remove(('a',))
+    testing.assert_array_equal(before.values, expected)
+
+
+def test_dtypes_and_order(df):
+    selection = Selection()
+    selection.add(('f',), df[0])
+    selection.add(('s',), pd.Series('x', df.index, name='s'))
+    selection.add(('i',), pd.Series(2 ** 60 + 1, df.index, name='i'))
+    selection.add(('b',), pd.Series(True, df.index, name='b'))
+    result = selection.frame()
+    assert list(result.columns) == [0, 's', 'i', 'b']
+    assert [dtype.kind for dtype in result.dtypes] == ['f', 'O', 'i', 'b']
+    assert result['i'].iloc[0] == 2 ** 60 + 1
+    selection.remove(('s',))
+    assert list(selection.frame().columns) == [0, 'i', 'b']
+
+
+def test_misaligned_int(df):
+    selection = Selection()
+    selection.add(('i',), pd.Series(1, df.index[:5], name='i'))
+    selection.add(('f',), df[0])
+    result = selection.frame()
+    test_df = pd.concat([pd.Series(1, df.index[:5], name='i'), df[0]], axis=1)
+    testing.assert_array_equal(result.values, test_df.values)
+    assert result['i'].dtype.kind == 'f'
+    selection.add(('b',), pd.Series(True, df.index[:5], name='b'))
+    assert selection.frame()['b'].dtype.kind == 'O'
+
+
+def test_extend(df):
+    selection = Selection()
+    selection.add(('df',), df.iloc[:10])
+    selection.add(('df', 1), df[1].iloc[:10])
+    before = selection.frame()
+    assert selection.extend({('df',): df.iloc[10:15],
+                             ('df', 1): df[1].iloc[10:15]})
+    assert selection.extend({('df',): df.iloc[15:],
+                             ('df', 1): df[1].iloc[15:]})
+    result = selection.frame()
+    testing.assert_array_equal(result.values[:, :2], df.values)
+    testing.assert_array_equal(result.values[:, 2], df[1].values)
+    assert result.index.equals(df.index)
+    testing.assert_array_equal(before.values[:, :2], df.values[:10])
+    assert not selection.extend({('df',): df.iloc[:5],
+                                 ('df', 1): df[1].iloc[:5]})
+    assert not selection.extend({('df',): df.iloc[:5]})
+    selection.add(('other',), df[0].iloc[:3])
+    testing.assert_array_equal(selection.frame().values[:, :3],
+                               result.values)
@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy import testing
+
+from .. import pickling
+from ..csvfile import CSVFrame
+from ..sidecar import *
+
+
+def test_store_load(tmpdir, random_dict):
+    filepath = str(tmpdir.join('dict.pickle'))
+    pickling.dump(random_dict, filepath)
+    cache_dir = str(tmpdir.join('cache'))
+    assert Sidecar(filepath, cache_dir).load() is None
+    Sidecar(filepath, cache_dir).store(random_dict)
+    result = Sidecar(filepath, cache_dir).load()
+    assert sorted(result) == ['df', 'pl', 'ts']
+    assert isinstance(result['df'], SidecarFrame)
+    testing.assert_array_equal(result['df'].read().values,
+                               random_dict['df'].values)
+    testing.assert_array_equal(result['df'].read().index,
+                               random_dict['df'].index)
+    testing.assert_array_equal(result['ts'].values, random_dict['ts'].values)
+    testing.assert_array_equal(result['pl'].values, random_dict['pl'].values)
+
+
+def test_invalidated(tmpdir, df):
+    filepath = str(tmpdir.join('df.pickle'))
+    cache_dir = str(tmpdir.join('cache'))
+    pickling.dump(df, filepath)
+    Sidecar(filepath, cache_dir).store(df)
+    old_path = Sidecar(filepath, cache_dir).path
+    os.utime(filepath, (time.time() + 10, time.time() + 10))
+    sidecar = Sidecar(filepath, cache_dir)
+    assert sidecar.load() is None
+    sidecar.store(df)
+    assert not os.path.exists(old_path)
+
+
+def test_evict(tmpdir, df):
+    cache_dir = str(tmpdir.join('cache'))
+    paths = []
+    for i in range(3):
+        filepath = str(tmpdir.join('df{}.pickle'.format(i)))
+        pickling.dump(df, filepath)
+        sidecar = Sidecar(filepath, cache_dir, max_bytes=2 ** 40)
+        sidecar.store(df)
+        os.utime(os.path.join(sidecar.path, META), (i, i))
+        paths.append(sidecar.path)
+    max_bytes = entry_size(paths[0]) * 2
+    evict(cache_dir, max_bytes)
+    assert [os.path.exists(path) for path in paths] == [False, True, True]
+
+
+def test_csv(tmpdir, df):
+    filepath = str(tmpdir.join('df.csv'))
+    cache_dir = str(tmpdir.join('cache'))
+    df.columns = ['a', 'b']
+    df.to_csv(filepath)
+    CSVFrame(filepath, Sidecar(filepath, cache_dir)).read(['b'])
+    frame = CSVFrame(filepath, Sidecar(filepath, cache_dir))
+    assert frame.cached_arrays.keys() == ['b']
+    result = frame.read(['b'], 2, 5)
+    testing.assert_array_almost_equal(result.values[:, 0], df['b'].values[2:5])
+    testing.assert_array_equal(result.index, df.index[2:5])
+
+
+def test_evict_keeps_open_entries(tmpdir, df):
+    cache_dir = str(tmpdir.join('cache'))
+    filepaths = []
+    for i in range(3):
+        filepaths.append(str(tmpdir.join('df{}.pickle'.format(i))))
+        pickling.dump(df, filepaths[-1])
+    Sidecar(filepaths[0], cache_dir).store(df)
+    frame = Sidecar(filepaths[0], cache_dir).load()
+    path = frame.sidecar.path
+    max_bytes = entry_size(path)
+    Sidecar(filepaths[1], cache_dir, max_bytes).store(df)
+    assert os.path.exists(path)
+    testing.assert_array_equal(frame.read().values, df.values)
+    del frame
+    Sidecar(filepaths[2], cache_dir, max_bytes).store(df)
+    assert not os.path.exists(path)
+
+
+def test_removed_entry_reloads(tmpdir, random_dict):
+    filepath = str(tmpdir.join('dict.pickle'))
+    cache_dir = str(tmpdir.join('cache'))
+    pickling.dump(random_dict, filepath)
+    Sidecar(filepath, cache_dir).store(random_dict)
+    result = Sidecar(filepath, cache_dir).load()
+    shutil.rmtree(result['df'].sidecar.path)
+    testing.assert_array_equal(result['df'].read().values,
+                               random_dict['df'].values)
+
+
+def test_csv_removed_entry(tmpdir, df):
+    filepath = str(tmpdir.join('df.csv'))
+    cache_dir = str(tmpdir.join('cache'))
+    df.columns = ['a', 'b']
+    df.to_csv(filepath)
+    CSVFrame(filepath, Sidecar(filepath, cache_dir)).read()
+    frame = CSVFrame(filepath, Sidecar(filepath, cache_dir))
+    shutil.rmtree(frame.sidecar.path)
+    testing.assert_array_almost_equal(frame.read().values, df.values)
+
+
+@pytest.mark.skipif(
+    sys.getfilesystemencoding().lower() not in ('utf-8', 'utf8'),
+    reason='unicode paths need a utf-8 filesystem encoding')
+def test_unicode_path(tmpdir, df):
+    filepath = str(tmpdir.mkdir('caf\xc3\xa9').join('df.pickle')).decode(
+        'utf-8')
+    pickling.dump(df, filepath)
+    cache_dir = str(tmpdir.join('cache'))
+    Sidecar(filepath, cache_dir).store(df)
+    result = Sidecar(filepath, cache_dir).load()
+    testing.assert_array_equal(result.read().values, df.values)
+    evict(cache_dir, 0)
+    assert Sidecar(filepath.encode('utf-8'), cache_dir).exists()
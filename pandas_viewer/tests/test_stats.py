@@ -0,0 +1,29 @@
+import numpy as np
+from numpy import testing
+
+from ..stats import *
+
+
+def test_column_stats():
+    values = np.array([0., 1., np.nan, 3., 0.])
+    result = dict(zip(STATISTICS, column_stats(values)))
+    assert result['count'] == 4
+    assert result['min'] == 0 and result['max'] == 3
+    testing.assert_allclose(result['mean'], 1.)
+    testing.assert_allclose(result['std'], np.std([0, 1, 3, 0], ddof=1))
+    assert result['zeros'] == 2
+    testing.assert_allclose(result['nan_ratio'], .2)
+
+
+def test_ints_and_objects():
+    result = dict(zip(STATISTICS, column_stats(np.arange(4))))
+    assert result['count'] == 4 and result['zeros'] == 1
+    result = dict(zip(STATISTICS, column_stats(
+        np.array(['a', None], dtype=object))))
+    assert result['count'] == 1 and np.isnan(result['mean'])
+    assert result['nan_ratio'] == .5
+
+
+def test_all_nan():
+    result = dict(zip(STATISTICS, column_stats(np.array([np.nan]))))
+    assert result['count'] == 0 and result['nan_ratio'] == 1
@@ -0,0 +1,39 @@
+import pandas as pd
+from numpy import testing
+
+from ..synthetic import *
+from ..csvfile import CSVFrame
+from .. import hdf5
+
+
+def test_chunks_are_deterministic():
+    df = synthetic_frame(100, 3, seed=1, chunk_rows=100)
+    chunked = synthetic_frame(100, 3, seed=1, chunk_rows=7)
+    testing.assert_array_equal(df.values, chunked.values)
+    testing.assert_array_equal(df.index, chunked.index)
+    assert df.index.is_monotonic_increasing and df.index.is_unique
+    assert not synthetic_frame(100, 3, seed=2).equals(df)
+
+
+def test_synthetic_dict():
+    d = synthetic_dict(10, 2, depth=2, width=3)
+    assert sorted(d) == ['g0', 'g1', 'g2']
+    assert sorted(d['g1']) == ['df0', 'df1', 'df2']
+    assert d['g1']['df2'].shape == (10, 2)
+    assert len(list(leaf_paths(3, 2))) == 8
+    assert isinstance(synthetic_dict(10, 2, depth=0, width=3), pd.DataFrame)
+
+
+def test_write_csv(tmpdir):
+    filepath = str(tmpdir.join('synthetic.csv'))
+    write_csv(filepath, 50, 2, chunk_rows=8)
+    result = CSVFrame(filepath).read()
+    testing.assert_allclose(result.values, synthetic_frame(50, 2).values)
+
+
+def test_write_hdf5(tmpdir):
+    filepath = str(tmpdir.join('synthetic.h5'))
+    write_hdf5(filepath, 20, 2, depth=2, width=2, seed=3)
+    frame = hdf5.open_file(filepath).get('g1').get('df0')
+    testing.assert_array_equal(frame.read().values,
+                               synthetic_frame(20, 2, seed=5).values)
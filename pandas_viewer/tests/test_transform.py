@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+import numpy as np
+
+from ..transform import *
+
+
+def test_derive_unchanged(df):
+    assert derive(df) is df
+
+
+def test_strip_zeros(df):
+    df.iloc[:5, 0] = 0
+    result = derive(df, strip=True)
+    assert result.iloc[:5, 0].isnull().all()
+    assert (df.iloc[:5, 0] == 0).all()
+    np.testing.assert_array_equal(result.iloc[5:].values, df.iloc[5:].values)
+
+
+def test_resample(df):
+    result = derive(df, freq='W', agg='sum')
+    test_df = df.resample('W', how='sum')
+    np.testing.assert_array_equal(result.values, test_df.values)
+
+
+def test_nbytes(df):
+    assert nbytes(df) == df.memory_usage(index=True, deep=True).sum()
+
+
+@pytest.mark.parametrize('freq', ['D', 'W', 'M'])
+def test_resample_append(freq):
+    df = pd.DataFrame(
+        np.random.RandomState(0).randn(2000, 2),
+        index=pd.date_range('2016-01-01', periods=2000, freq='H'))
+    for start in [10, 700, 1500, 1999, 2000]:
+        resampled = resample(df.iloc[:start], freq, 'mean')
+        result = resample_append(resampled, df, start, freq, 'mean')
+        expected = resample(df, freq, 'mean')
+        pd.testing.assert_frame_equal(result, expected)
+    assert resample_append(df, df, 0, None, None) is df
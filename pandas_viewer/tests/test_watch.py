@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..csvfile import CSVFrame
+from ..watch import *
+
+
+def test_file_watch(tmpdir):
+    filepath = str(tmpdir.join('a.pickle'))
+    with open(filepath, 'w') as f:
+        f.write('a')
+    watch = FileWatch(filepath)
+    assert not watch.changed()
+    with open(filepath, 'a') as f:
+        f.write('b')
+    assert watch.changed()
+    assert not watch.changed()
+    os.remove(filepath)
+    assert not watch.changed()
+    with open(filepath, 'w') as f:
+        f.write('c')
+    assert watch.changed()
+
+
+def test_csv_tail(tmpdir, df):
+    filepath = str(tmpdir.join('df.csv'))
+    df.columns = ['a', 'b']
+    df.index.name = 'time'
+    df.iloc[:10].to_csv(filepath)
+    tail = CSVTail(CSVFrame(filepath))
+    result = tail.read()
+    np.testing.assert_array_almost_equal(result.values, df.iloc[:10].values)
+    np.testing.assert_array_equal(result.index, df.index[:10])
+    assert result.index.name == 'time'
+    assert tail.read() is None
+    text = df.iloc[10:20].to_csv(header=False)
+    with open(filepath, 'a') as f:
+        f.write(text[:-5])
+    result = tail.read()
+    np.testing.assert_array_almost_equal(result.values, df.iloc[10:19].values)
+    assert list(result.columns) == ['a', 'b']
+    assert isinstance(result.index, pd.DatetimeIndex)
+    with open(filepath, 'a') as f:
+        f.write(text[-5:])
+    result = tail.read()
+    np.testing.assert_array_equal(result.index, df.index[19:20])
+    df.iloc[5:30].to_csv(filepath)
+    with pytest.raises(FileRewritten):
+        tail.read()
+
+
+def test_csv_tail_start(tmpdir, df):
+    filepath = str(tmpdir.join('df.csv'))
+    df.columns = ['a', 'b']
+    df.index.name = 'time'
+    df.iloc[:10].to_csv(filepath)
+    frame = CSVFrame(filepath)
+    with open(filepath, 'a') as f:
+        f.write(df.iloc[10:12].to_csv(header=False))
+    tail = CSVTail(frame)
+    tail_frame = tail.start()
+    assert len(tail_frame) == 12
+    result = tail_frame.read()
+    np.testing.assert_array_almost_equal(result.values, df.iloc[:12].values)
+    assert tail.read() is None
+    for rows in (slice(12, 14), slice(14, 15)):
+        with open(filepath, 'a') as f:
+            f.write(df.iloc[rows].to_csv(header=False))
+        tail_frame.append(tail.read())
+    assert len(tail_frame.chunks) == 2
+    result = tail_frame.read(['b'])
+    np.testing.assert_array_almost_equal(result.values, df.iloc[:15][['b']])
+    np.testing.assert_array_equal(result.index, df.index[:15])
+    assert result.index.name == 'time'
+    result = tail_frame.read(['a'], 11, 13)
+    np.testing.assert_array_equal(result.index, df.index[11:13])
+    df.iloc[5:30].to_csv(filepath)
+    with pytest.raises(FileRewritten):
+        tail.read()
+
+
+def test_csv_tail_appended_text(tmpdir, df):
+    filepath = str(tmpdir.join('df.csv'))
+    df.columns = ['a', 'b']
+    df.iloc[:10].to_csv(filepath)
+    frame = CSVFrame(filepath)
+    tail = CSVTail(frame)
+    tail.start()
+    with open(filepath, 'a') as f:
+        f.write('2015-01-01,x,1.5\n')
+    result = tail.read()
+    assert list(result['a']) == ['x'] and list(result['b']) == [1.5]
+    assert tail.read() is None
+
+
+def test_csv_tail_start_blank_and_quoted(tmpdir):
+    filepath = str(tmpdir.join('df.csv'))
+    with open(filepath, 'w') as f:
+        f.write('i,a,b\n1,1.0,"x\ny"\n\n2,2.0,z\n')
+    tail = CSVTail(CSVFrame(filepath))
+    assert len(tail.start()) == 2
+    assert tail.read() is None
+    with open(filepath, 'a') as f:
+        f.write('3,3.0,w\n')
+    result = tail.read()
+    assert list(result.index) == [3] and list(result['b']) == ['w']
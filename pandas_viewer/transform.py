@@ -0,0 +1,113 @@
+import pandas as pd
+
+
+def resample(df, freq, agg):
+    """Resample df to frequency freq using aggregation agg
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        The dataframe to resample
+    freq: str or None
+        The frequency to resample to, None returns df unchanged
+    agg: str or None
+        The method of aggregation, passed as resample parameter how
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    return df if freq is None else df.resample(freq, how=agg)
+
+
+def resample_append(resampled, df, start, freq, agg):
+    """Return the resample of df, where resampled is the resample of the rows
+    of df before start and the rows from start on were appended since.  Only
+    the last two bins of resampled and the bins of the appended rows are
+    recomputed, falling back to resampling every row if the appended rows do
+    not follow the existing bins
+
+    Parameters
+    ----------
+    resampled: pd.DataFrame
+        The resample of df.iloc[:start]
+    df: pd.DataFrame
+        The dataframe with the rows appended
+    start: int
+        The position of the first appended row
+    freq: str or None
+        The frequency to resample to, None returns df unchanged
+    agg: str or None
+        The method of aggregation, passed as resample parameter how
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    if freq is None:
+        return df
+    if start >= len(df):
+        return resampled
+    if len(resampled) < 3 or not df.index.is_monotonic_increasing or \
+            list(resampled.columns) != list(df.columns) or \
+            df.index[start] < resampled.index[-2]:
+        return resample(df, freq, agg)
+    window = df.iloc[df.index.searchsorted(resampled.index[-3]):]
+    tail = resample(window, freq, agg)
+    keep = resampled.index[-2]
+    return pd.concat([resampled[resampled.index < keep],
+                      tail[tail.index >= keep]])
+
+
+def strip_zeros(df):
+    """Return a copy of df with every zero replaced by NaN
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        The dataframe to strip
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    return df.where(df != 0)
+
+
+def derive(df, freq=None, agg=None, strip=False):
+    """Return the view of df displayed by the viewer for the given freq, agg
+    and strip zeros settings
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        The selected dataframe
+    freq: str, optional
+        The frequency to resample to
+    agg: str, optional
+        The method of aggregation
+    strip: bool, optional
+        Replace zeros with NaN
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    result = resample(df, freq, agg)
+    if strip:
+        result = strip_zeros(result)
+    return result
+
+
+def nbytes(df):
+    """Return the memory used by df including the index and object values
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+
+    Returns
+    -------
+    int
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
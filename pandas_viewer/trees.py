@@ -2,8 +2,16 @@ from PySide import QtGui, QtCore
 import pandas as pd
 import os
 from functools import partial
+from collections import OrderedDict
 
-import pickling
+from frames import LazyFrame
+from csvfile import CSVFrame
+from selection import Selection
+from pathindex import PathIndex, walk
+from loading import LoadCancelled, load_file
+from profiling import profiler
+from watch import FileWatch, CSVTail, FileRewritten, TailFrame
+from memory import MemoryBudget, Spill, evict, object_size, BUDGET
 
 
 class PandasTreeWidgetItem(QtGui.QTreeWidgetItem):
@@ -23,6 +31,90 @@ class PandasTreeWidgetItem(QtGui.QTreeWidgetItem):
         """
         super(PandasTreeWidgetItem, self).__init__([str(args[-1])])
         self.keys = args
+        self.populated = False
+
+
+class LoadingTreeWidgetItem(QtGui.QTreeWidgetItem):
+    """Placeholder node shown while a file is loaded in the background"""
+
+    def __init__(self, filepath, thread):
+        """Initiate the placeholder with a progress bar and cancel button
+
+        Parameters
+        ----------
+        filepath: str
+            The path of the file being loaded
+        thread: LoadThread
+            The thread loading the file
+
+        Returns
+        -------
+        LoadingTreeWidgetItem
+        """
+        super(LoadingTreeWidgetItem, self).__init__([])
+        self.setFlags(QtCore.Qt.ItemIsEnabled)
+        self.thread = thread
+        self.widget = QtGui.QWidget()
+        layout = QtGui.QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(QtGui.QLabel(os.path.basename(filepath)))
+        self.progress_bar = QtGui.QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        layout.addWidget(self.progress_bar)
+        self.cancel_button = QtGui.QToolButton()
+        self.cancel_button.setText('Cancel')
+        layout.addWidget(self.cancel_button)
+        self.widget.setLayout(layout)
+        thread.progress.connect(self.progress_bar.setValue)
+        self.cancel_button.clicked.connect(thread.cancel)
+
+
+class LoadThread(QtCore.QThread):
+    """Thread that loads a file with load_file, or another function taking
+    the same arguments, emitting its progress"""
+
+    progress = QtCore.Signal(int)
+    loaded = QtCore.Signal(str, object)
+    failed = QtCore.Signal(str, str)
+
+    def __init__(self, filepath, parent=None, load=load_file):
+        QtCore.QThread.__init__(self, parent)
+        self.filepath = filepath
+        self.load = load
+        self.cancelled = False
+        self.finished.connect(self.deleteLater)
+
+    def cancel(self):
+        """Abandon the load at the next read from the file"""
+        self.cancelled = True
+
+    def run(self):
+        try:
+            obj = self.load(self.filepath, self.progress.emit,
+                            lambda: self.cancelled)
+        except LoadCancelled:
+            self.failed.emit(self.filepath, '')
+        except Exception as e:
+            self.failed.emit(self.filepath, str(e))
+        else:
+            self.loaded.emit(self.filepath, obj)
+
+
+class WalkThread(QtCore.QThread):
+    """Thread that lists every path below a top level node for the filter"""
+
+    walked = QtCore.Signal(object, int, object)
+
+    def __init__(self, key, obj, walk_id, parent=None):
+        QtCore.QThread.__init__(self, parent)
+        self.key = key
+        self.obj = obj
+        self.walk_id = walk_id
+        self.finished.connect(self.deleteLater)
+
+    def run(self):
+        self.walked.emit(self.key, self.walk_id,
+                         walk((self.key,), self.obj))
 
 
 class PandasTreeWidget(QtGui.QTreeWidget):
@@ -31,6 +123,15 @@ class PandasTreeWidget(QtGui.QTreeWidget):
     """
 
     selection_made = QtCore.Signal((pd.DataFrame, ))
+    selection_updated = QtCore.Signal(pd.DataFrame, bool)
+    tree_changed = QtCore.Signal()
+    rows_appended = QtCore.Signal(str)
+    memory_changed = QtCore.Signal(object)
+    expand_batch_size = 200
+    filter_delay = 150
+    max_filter_matches = 1000
+    watch_interval = 1000
+    memory_budget = BUDGET
 
     def __init__(self, parent=None, obj=None):
         """Initiate the tree structure with the obj
@@ -53,12 +154,36 @@ class PandasTreeWidget(QtGui.QTreeWidget):
         self.setColumnCount(1)
         self.setHeaderLabels(['Pandas Variables'])
         self.obj = {}
+        self.paths = PathIndex()
+        self.items = {}
+        self.selection = Selection()
+        self.selection_key = ()
+        self.loading = {}
+        self.filepaths = {}
+        self.watches = {}
+        self.reloading = set()
+        self.memory = MemoryBudget(self.memory_budget)
+        self.spill = None
+        self.spilled = {}
+        self._expand_queue = []
+        self._walk_ids = {}
+        self._visible = None
+        self._filter_text = ''
+        self._filter_timer = QtCore.QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.timeout.connect(self.apply_filter)
+        self._watch_timer = QtCore.QTimer(self)
+        self._watch_timer.timeout.connect(self.poll_watches)
+        self.itemExpanded.connect(self.populate_item)
         self.add_obj_to_tree(obj)
         self.setSelectionMode(QtGui.QAbstractItemView.ExtendedSelection)
 
     def selectionChanged(self, selected, deselected):
-        """Construct a DataFrame from selections in the tree and pass to
-        dataframe_changed to populate the table widget and pass to the plot.
+        """Update the selection with the items added to and removed from the
+        tree selection and pass the DataFrame to dataframe_changed to populate
+        the table widget and pass to the plot.  Only the objects of newly
+        selected items are read, the columns of a lazy frame selected together
+        are read in one pass
 
         A signal is emitted to instigate dataframe_changed
 
@@ -69,20 +194,38 @@ class PandasTreeWidget(QtGui.QTreeWidget):
         deselected: list(PandasTreeWidgetItem)
             List of WidgetItems deselected
         """
-        result = []
-        for item in self.selectedItems():
-            obj = reduce(lambda x, y: x.get(y), (self.obj,) + item.keys)
-            if isinstance(obj, pd.Panel):
-                for itm in obj.items:
-                    df = obj.get(itm)
-                    result.append(df)
-            else:
-                result.append(obj)
-        if len(result) == 1 and isinstance(result[0], pd.DataFrame):
-            result = result[0]
-        else:
-            result = pd.DataFrame(pd.concat(result, axis=1))
-        self.selection_made.emit(result)
+        with profiler.span('selectionChanged'):
+            keys = [item.keys for item in self.selectedItems()]
+            selected_keys = set(keys)
+            for k in set(k[0] for k in keys):
+                self.memory.touch(k)
+            for k in self.selection.keys():
+                if k not in selected_keys:
+                    self.selection.remove(k)
+            current = set(self.selection.keys())
+            projections = OrderedDict()
+            with profiler.span('read'):
+                for k in keys:
+                    if k in current:
+                        continue
+                    parent = self.paths.parent(k)
+                    if isinstance(parent, LazyFrame):
+                        projections.setdefault(
+                            id(parent), (parent, []))[1].append(k)
+                        continue
+                    obj = self.paths.resolve(k)
+                    if isinstance(obj, LazyFrame):
+                        obj = obj.read()
+                    if isinstance(obj, (pd.Series, pd.DataFrame, pd.Panel)):
+                        self.selection.add(k, obj)
+                for parent, columns in projections.itervalues():
+                    df = parent.read([k[-1] for k in columns])
+                    for i, k in enumerate(columns):
+                        self.selection.add(k, df.iloc[:, i])
+            with profiler.span('assemble'):
+                df = self.selection.frame()
+            self.selection_key = tuple(self.selection.keys())
+        self.selection_made.emit(df)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -108,30 +251,378 @@ class PandasTreeWidget(QtGui.QTreeWidget):
             event.ignore()
 
     def add_file_to_tree(self, filepath):
-        filename = os.path.basename(filepath)
-        obj = load_file(filepath)
-        self.add_obj_to_tree({filename: obj})
+        """Load filepath on a background thread, showing a placeholder node
+        with the progress of the load until the file is added to the tree
+
+        Parameters
+        ----------
+        filepath: str
+            The path of the file to load
+        """
+        if filepath in self.loading:
+            return
+        thread = LoadThread(filepath, self)
+        item = LoadingTreeWidgetItem(filepath, thread)
+        self.addTopLevelItem(item)
+        self.setItemWidget(item, 0, item.widget)
+        self.loading[filepath] = item
+        thread.loaded.connect(self._file_loaded)
+        thread.failed.connect(self._load_failed)
+        thread.start()
+
+    def _remove_placeholder(self, filepath):
+        item = self.loading.pop(filepath)
+        self.takeTopLevelItem(self.indexOfTopLevelItem(item))
+
+    def _file_loaded(self, filepath, obj):
+        self._remove_placeholder(filepath)
+        self.filepaths[os.path.basename(filepath)] = filepath
+        self.add_obj_to_tree({os.path.basename(filepath): obj})
+
+    def _load_failed(self, filepath, message):
+        self._remove_placeholder(filepath)
+        if message:
+            QtGui.QMessageBox.warning(
+                self, 'Load failed', '{}\n{}'.format(filepath, message))
+
+    def set_watched(self, key, watched):
+        """Follow the file of the top level node key, polled every
+        watch_interval milliseconds.  Only the lines appended to a csv file are
+        parsed and appended to its frame, the tail of which is started at the
+        end of the rows of its CSVFrame on a background thread.  Other files,
+        and csv files that are rewritten, are reloaded when their modification
+        time or size changes
+
+        Parameters
+        ----------
+        key: str
+            The key of the top level node of the file
+        watched: bool
+        """
+        if not watched:
+            self.watches.pop(key, None)
+            if not self.watches:
+                self._watch_timer.stop()
+            return
+        filepath = self.filepaths[key]
+        self.watches[key] = (FileWatch(filepath), None)
+        if filepath.lower().endswith('.csv'):
+            obj = self.obj[key]
+            if isinstance(obj, TailFrame):
+                obj = obj.frame
+            if isinstance(obj, CSVFrame):
+                self._start_tail(key, obj)
+            else:
+                self.reload_file(key)
+        self._watch_timer.start(self.watch_interval)
+
+    def poll_watches(self):
+        """Append the new lines of the watched csv files that changed and
+        reload the other watched files that changed on a background thread.
+        Files still being reloaded are polled once they are loaded.  A file
+        whose appended lines cannot be parsed is no longer watched
+        """
+        for key, (watch, tail) in self.watches.items():
+            if watch.filepath in self.reloading or not watch.changed():
+                continue
+            if tail is None:
+                self.reload_file(key)
+                continue
+            try:
+                df = tail.read()
+            except FileRewritten:
+                self.reload_file(key)
+            except (ValueError, TypeError) as e:
+                self.set_watched(key, False)
+                QtGui.QMessageBox.warning(
+                    self, 'Watch stopped', '{}\n{}'.format(watch.filepath, e))
+            else:
+                if df is not None:
+                    self._append_rows(key, df)
+
+    def _start_tail(self, key, frame):
+        filepath = self.filepaths[key]
+        tail = CSVTail(frame)
+        self.watches[key] = (self.watches[key][0], tail)
+        self.reloading.add(filepath)
+        thread = LoadThread(filepath, self, lambda *args: tail.start())
+        thread.loaded.connect(self._file_reloaded)
+        thread.failed.connect(self._reload_failed)
+        thread.start()
+
+    def _append_rows(self, key, df):
+        """Append df, the rows read by the tail of the watched csv file of the
+        top level node key, to its TailFrame and to the selected items under
+        it, which are only read again if the selection cannot be extended
+        with the new rows.  The paths under the node are unchanged, so the
+        node is not indexed again"""
+        with profiler.span('append_rows', rows=len(df)):
+            self.obj[key].append(df)
+            keys = [k for k in self.selection.keys() if k[0] == key]
+            rows = dict((k, df if len(k) == 1 else df.get(k[1]))
+                        for k in keys)
+            if keys and not self.selection.extend(rows):
+                self._read_selected(key)
+            df = self.selection.frame()
+        self.rows_appended.emit(key)
+        if keys:
+            self.selection_updated.emit(df, True)
+
+    def reload_file(self, key):
+        """Load the file of the top level node key again on a background
+        thread, replacing the object of the node once loaded"""
+        filepath = self.filepaths[key]
+        if filepath in self.reloading:
+            return
+        self.reloading.add(filepath)
+        thread = LoadThread(filepath, self)
+        thread.loaded.connect(self._file_reloaded)
+        thread.failed.connect(self._reload_failed)
+        thread.start()
+
+    def _file_reloaded(self, filepath, obj):
+        self.reloading.discard(filepath)
+        key = os.path.basename(filepath)
+        if key not in self.obj:
+            return
+        if key in self.watches and isinstance(obj, CSVFrame):
+            self._start_tail(key, obj)
+        else:
+            self._update_obj(key, obj, False)
+
+    def _reload_failed(self, filepath, message):
+        self.reloading.discard(filepath)
+        key = os.path.basename(filepath)
+        if key in self.watches:
+            self.watches[key] = (self.watches[key][0], None)
+            self.watches[key][0].stat = None
+
+    def _update_obj(self, key, obj, appended):
+        """Replace the object of the top level node key, keeping the items
+        whose paths still exist, and read the selected items under it again
+
+        Parameters
+        ----------
+        key: str
+            The key of the top level node
+        obj: object
+            The new object of the node
+        appended: bool
+            Whether obj only has rows appended to the previous object
+        """
+        if obj is None:
+            return
+        with profiler.span('update_obj', appended=appended):
+            self.obj[key] = obj
+            self._index_obj(key)
+            self._track(key, obj)
+            keys = self._read_selected(key)
+            df = self.selection.frame()
+        self.evict_objects([key])
+        self.tree_changed.emit()
+        if keys:
+            self.selection_updated.emit(df, appended)
+
+    def _read_selected(self, key):
+        """Read the selected items under the top level node key again,
+        returning their keys"""
+        keys = [k for k in self.selection.keys() if k[0] == key]
+        for k in keys:
+            self.selection.remove(k)
+            if k in self.paths:
+                obj = self.paths.resolve(k)
+                if isinstance(obj, LazyFrame):
+                    obj = obj.read()
+                self.selection.add(k, obj)
+        return keys
+
+    def evict_objects(self, keep=()):
+        """Replace the least recently selected top level objects with
+        disk-backed ones while the total size of the objects exceeds the
+        memory budget.  The sidecar of the file an object was loaded from is
+        memory-mapped if current, otherwise the object is spilled to a
+        temporary sidecar.  The frames of the replacement are read lazily, so
+        items under it are read back transparently when selected
+
+        Parameters
+        ----------
+        keep: collection
+            Keys not evicted besides the selected and watched objects
+        """
+        keep = set(keep) | set(self.watches) | set(
+            k[0] for k in self.selection.keys())
+        for key in self.memory.over_budget(keep):
+            with profiler.span('evict', size=self.memory.sizes[key]):
+                if self.spill is None:
+                    self.spill = Spill()
+                obj, entry = evict(self.obj[key], self.filepaths.get(key),
+                                   self.spill)
+                self.obj[key] = obj
+                self._index_obj(key)
+                if entry is not None:
+                    self.spilled[key] = entry
+                self.memory.add(key, object_size(obj), evictable=False)
+        self.memory_changed.emit(self.memory.total)
+
+    def _index_obj(self, key):
+        """Index the object of the top level node key again after it has been
+        replaced, expanding the populated items under it, removing those
+        whose paths no longer exist and adding any new children.  The paths
+        below it are walked again for the filter on a background thread"""
+        self.paths.add((key,), self.obj)
+        for path in sorted(self.items, key=len):
+            item = self.items.get(path)
+            if path[0] != key or item is None:
+                continue
+            if path not in self.paths:
+                for p in [p for p in self.items if p[:len(path)] == path]:
+                    del self.items[p]
+                if item.parent() is not None:
+                    item.parent().removeChild(item)
+            elif item.populated:
+                for child, expandable in self.paths.expand(path):
+                    if child not in self.items:
+                        self._add_item(item, child, expandable)
+        self._walk(key)
+
+    def _walk(self, key):
+        walk_id = self._walk_ids.get(key, 0) + 1
+        self._walk_ids[key] = walk_id
+        thread = WalkThread(key, self.obj[key], walk_id, self)
+        thread.walked.connect(self._walked)
+        thread.start()
+
+    def _walked(self, key, walk_id, paths):
+        if self._walk_ids.get(key) != walk_id:
+            return
+        self.paths.add_walk((key,), paths)
+        if self._filter_text:
+            self.apply_filter()
+
+    def _track(self, key, obj):
+        self._release(key)
+        self.memory.add(key, object_size(obj))
+
+    def _release(self, key):
+        entry = self.spilled.pop(key, None)
+        if entry is not None:
+            self.spill.remove(entry)
 
     def add_obj_to_tree(self, d, root=None):
+        """Add the top level of d to the tree, the children of each node are
+        only created when the node is first expanded
+
+        Parameters
+        ----------
+        d: dict
+            The objects to add keyed by name
+        root: QtGui.QTreeWidgetItem, optional
+            The item to add the nodes to, defaults to the invisible root
+        """
         if root is None:
             root = self.invisibleRootItem()
         for key, value in d.iteritems():
+            for k in self.selection.keys():
+                if k[0] == key:
+                    self.selection.remove(k)
             self.obj[key] = value
-            base = PandasTreeWidgetItem(key)
-            root.addChild(base)
-            if isinstance(value, pd.DataFrame):
-                for column in value.columns:
-                    leaf = PandasTreeWidgetItem(key, column)
-                    base.addChild(leaf)
-            if isinstance(value, pd.Panel):
-                for itm in value.items:
-                    twig = PandasTreeWidgetItem(key, itm)
-                    base.addChild(twig)
-                    for mi in value.minor_axis:
-                        leaf = PandasTreeWidgetItem(key, itm, mi)
-                        twig.addChild(leaf)
-            if isinstance(value, dict):
-                self.add_obj_to_tree(value, base)
+            expandable = self.paths.add((key,), self.obj)
+            self._track(key, value)
+            self._add_item(root, (key,), expandable)
+            self._walk(key)
+        self.evict_objects(d)
+        self.tree_changed.emit()
+
+    def _add_item(self, parent, keys, expandable):
+        item = PandasTreeWidgetItem(*keys)
+        if expandable:
+            item.setChildIndicatorPolicy(QtGui.QTreeWidgetItem.ShowIndicator)
+        else:
+            item.populated = True
+        if self._visible is not None and keys not in self._visible:
+            item.setHidden(True)
+        parent.addChild(item)
+        self.items[keys] = item
+        return item
+
+    def populate_item(self, item):
+        """Create the children of item the first time it is expanded
+
+        Parameters
+        ----------
+        item: PandasTreeWidgetItem
+            The item being expanded
+        """
+        if item.populated:
+            return
+        item.populated = True
+        for keys, expandable in self.paths.expand(item.keys):
+            self._add_item(item, keys, expandable)
+        item.setChildIndicatorPolicy(
+            QtGui.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+
+    def expandAll(self):
+        """Expand every node in the tree, populating expand_batch_size nodes at
+        a time so that the event loop keeps running for large objects
+        """
+        root = self.invisibleRootItem()
+        self._expand_queue = [root.child(i) for i in range(root.childCount())]
+        self._expand_next_batch()
+
+    def _expand_next_batch(self):
+        batch = self._expand_queue[:self.expand_batch_size]
+        del self._expand_queue[:self.expand_batch_size]
+        for item in batch:
+            indicator = item.childIndicatorPolicy()
+            if indicator == QtGui.QTreeWidgetItem.ShowIndicator or \
+                    item.childCount():
+                item.setExpanded(True)
+                self._expand_queue.extend(
+                    item.child(i) for i in range(item.childCount()))
+        if self._expand_queue:
+            QtCore.QTimer.singleShot(0, self._expand_next_batch)
+
+    def collapseAll(self):
+        """Stop any Expand All in progress and collapse every node"""
+        self._expand_queue = []
+        super(PandasTreeWidget, self).collapseAll()
+
+    def set_filter(self, text):
+        """Show only the nodes whose path contains text, and their ancestors,
+        once text has not changed for filter_delay milliseconds
+
+        Parameters
+        ----------
+        text: str
+            The text to find, the filter is cleared if empty
+        """
+        self._filter_text = text
+        self._filter_timer.start(self.filter_delay)
+
+    def apply_filter(self):
+        """Hide the nodes not matching the filter text, using the path index
+        to find the matches and expanding their ancestors.  Nodes not yet
+        expanded are found once the walk of their top level node has finished.
+        At most max_filter_matches nodes are shown
+        """
+        if not self._filter_text:
+            self._visible = None
+            for item in self.items.itervalues():
+                item.setHidden(False)
+            return
+        visible = set()
+        ancestors = set()
+        for path in self.paths.search(self._filter_text,
+                                      self.max_filter_matches):
+            visible.update(path[:i] for i in range(1, len(path) + 1))
+            ancestors.update(path[:i] for i in range(1, len(path)))
+        self._visible = visible
+        for path, item in self.items.iteritems():
+            item.setHidden(path not in visible)
+        for path in sorted(ancestors, key=len):
+            item = self.items.get(path)
+            if item is not None:
+                item.setExpanded(True)
 
     def mousePressEvent(self, event):
         if event.button() is QtCore.Qt.MouseButton.RightButton:
@@ -142,10 +633,24 @@ class PandasTreeWidget(QtGui.QTreeWidget):
 
     def context_menu(self, pos):
         item = self.itemAt(pos)
+        if item is None:
+            return
         menu = QtGui.QMenu()
-        remove = QtGui.QAction('Remove', menu)
-        remove.triggered.connect(partial(self.remove_item, item))
-        menu.addAction(remove)
+        if isinstance(item, LoadingTreeWidgetItem):
+            cancel = QtGui.QAction('Cancel', menu)
+            cancel.triggered.connect(item.thread.cancel)
+            menu.addAction(cancel)
+        else:
+            if len(item.keys) == 1 and item.keys[0] in self.filepaths:
+                watched = item.keys[0] in self.watches
+                watch = QtGui.QAction('Watch', menu, checkable=True)
+                watch.setChecked(watched)
+                watch.triggered.connect(
+                    partial(self.set_watched, item.keys[0], not watched))
+                menu.addAction(watch)
+            remove = QtGui.QAction('Remove', menu)
+            remove.triggered.connect(partial(self.remove_item, item))
+            menu.addAction(remove)
         menu.exec_(self.viewport().mapToGlobal(pos))
 
     def remove_item(self, item):
@@ -154,18 +659,18 @@ class PandasTreeWidget(QtGui.QTreeWidget):
         if parent is None:
             parent = self.invisibleRootItem()
         parent.removeChild(item)
-        obj = reduce(lambda x, y: x.get(y), (self.obj,) + keys[:-1])
-        obj.pop(keys[-1])
+        self.paths.parent(keys).pop(keys[-1])
+        if len(keys) == 1:
+            self._walk_ids.pop(keys[0], None)
+            self.set_watched(keys[0], False)
+            self.memory.remove(keys[0])
+            self._release(keys[0])
+            self.memory_changed.emit(self.memory.total)
+        for path in self.paths.remove(keys):
+            self.items.pop(path, None)
+        if len(keys) > 1 and keys[0] in self._walk_ids:
+            self._walk(keys[0])
+        self.tree_changed.emit()
         if parent.childCount() == 0 and parent is not self.invisibleRootItem():
             self.remove_item(parent)
         print 'Done'
-
-def load_file(filepath):
-    filename, ext = os.path.splitext(filepath)
-    if ext == '.csv':
-        obj = pd.read_csv(filepath)
-    elif ext == '.pickle':
-        obj = pickling.load(filepath)
-    else:
-        raise ValueError('file ext %s not implemented', ext)
-    return obj
@@ -0,0 +1,229 @@
+import csv
+import os
+from StringIO import StringIO
+
+import pandas as pd
+
+from frames import LazyFrame
+
+
+class FileRewritten(Exception):
+    """Raised when the bytes of a followed file already read have changed, so
+    the file has been rewritten rather than appended to"""
+
+
+def file_stat(filepath):
+    """Return the modification time and size of filepath, or None if it does
+    not exist"""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
+
+
+class FileWatch(object):
+    """Detects changes of a file by polling its modification time and size"""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.stat = file_stat(filepath)
+
+    def changed(self):
+        """Return True if the file has changed since the last call, a file
+        that is missing, e.g. while being replaced, is not reported until it
+        exists again"""
+        stat = file_stat(self.filepath)
+        if stat == self.stat:
+            return False
+        self.stat = stat
+        return stat is not None
+
+
+class CSVTail(object):
+    """Follows a csv file that is only appended to, parsing only the complete
+    lines added since the last read with the dtypes and index of a CSVFrame
+    of the file
+
+    """
+
+    check_bytes = 64
+
+    def __init__(self, frame):
+        """Initiate the tail at the start of the file of frame, see start to
+        begin at the end of the rows of frame instead
+
+        Parameters
+        ----------
+        frame: CSVFrame
+            The frame of the csv file
+
+        Returns
+        -------
+        CSVTail
+        """
+        self.frame = frame
+        self.offset = 0
+        self.names = None
+        self._last = ''
+
+    def start(self):
+        """Move the tail to the end of the rows of frame, only the index of
+        which is read, memory-mapped if its sidecar has it.  The records of
+        the file are counted up to those rows, skipping blank lines and
+        following quoted newlines as read_csv does, so that the tail only
+        parses the lines appended after them
+
+        Returns
+        -------
+        TailFrame
+            The rows of frame followed by the rows read by the tail
+        """
+        index = self.frame.read([]).index
+        records = len(index) + (0 if self.frame.header is None else 1)
+        read = [0]
+        with open(self.frame.filepath, 'rb') as f:
+            def lines():
+                for line in f:
+                    read[0] += len(line)
+                    yield line
+            if records:
+                for row in csv.reader(lines()):
+                    if row:
+                        records -= 1
+                        if not records:
+                            break
+            offset = read[0]
+            f.seek(max(offset - self.check_bytes, 0))
+            self._last = f.read(offset - f.tell())
+        self.offset = offset
+        self.names = ['index'] + list(self.frame.columns)
+        return TailFrame(self.frame, len(index), index.name)
+
+    def read(self):
+        """Parse the lines appended since the last read, every line on the
+        first read unless the tail was started.  An incomplete last line is
+        left for the next read.  The columns are parsed without a dtype from
+        then on if a value appended is not of the dtype of the CSVFrame
+
+        Returns
+        -------
+        pd.DataFrame
+            The new rows, None if there are none
+
+        Raises
+        ------
+        FileRewritten
+            If the last bytes read have changed since
+        """
+        with open(self.frame.filepath, 'rb') as f:
+            if self._last:
+                f.seek(self.offset - len(self._last))
+                if f.read(len(self._last)) != self._last:
+                    raise FileRewritten(self.frame.filepath)
+            data = f.read()
+        data = data[:data.rfind('\n') + 1]
+        if not data:
+            return None
+        try:
+            df = self._parse(data)
+        except ValueError:
+            # as in CSVFrame.read, a value is not of the dtype of the sample
+            for column in self.frame.columns:
+                self.frame.dtypes.pop(column, None)
+            df = self._parse(data)
+        index_name = df.index.name
+        if self.names is None:
+            self.names = ['index'] + list(df.columns)
+        else:
+            df.columns = self.names[1:]
+            index_name = None
+        if self.frame.parse_dates:
+            df.index = pd.to_datetime(df.index)
+        df.index.name = index_name
+        self.offset += len(data)
+        self._last = (self._last + data)[-self.check_bytes:]
+        return df if len(df) else None
+
+    def _parse(self, data):
+        if self.names is None:
+            return pd.read_csv(StringIO(data), header=self.frame.header,
+                               index_col=0, dtype=self._dtypes())
+        return pd.read_csv(StringIO(data), header=None, names=self.names,
+                           index_col=0, dtype=self._dtypes())
+
+    def _dtypes(self):
+        return dict((c, dtype) for c, dtype in self.frame.dtypes.iteritems()
+                    if c in self.frame.columns)
+
+
+class TailFrame(LazyFrame):
+    """Lazy frame of a followed csv file, the rows of its CSVFrame up to where
+    the tail started followed by the rows appended since, which are held in
+    memory as the chunks read and only concatenated when read.  The columns
+    read from the CSVFrame are kept so that appending rows does not parse the
+    file again
+
+    """
+
+    def __init__(self, frame, rows, index_name=None):
+        """Initiate the frame with the first rows of frame
+
+        Parameters
+        ----------
+        frame: CSVFrame
+            The frame of the csv file
+        rows: int
+            The number of rows of frame before the tail
+        index_name: object, optional
+            The name of the index, which the rows appended take
+
+        Returns
+        -------
+        TailFrame
+        """
+        super(TailFrame, self).__init__(frame.columns)
+        self.frame = frame
+        self.rows = rows
+        self.index_name = index_name
+        self.chunks = []
+        self.appended_rows = 0
+        self._read = {}
+
+    def __len__(self):
+        return self.rows + self.appended_rows
+
+    def append(self, df):
+        """Append df, rows read by the tail
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+        """
+        df.index.name = self.index_name
+        self.chunks.append(df)
+        self.appended_rows += len(df)
+
+    def read(self, columns=None, start=None, stop=None):
+        if columns is None:
+            columns = self.columns
+        start, stop, _ = slice(start, stop).indices(len(self))
+        missing = [c for c in columns if c not in self._read]
+        if missing:
+            df = self.frame.read(missing, 0, self.rows)
+            for column in missing:
+                self._read[column] = df[column]
+        parts = []
+        if start < self.rows:
+            parts.append(pd.DataFrame(
+                dict((c, self._read[c]) for c in columns), columns=columns
+            ).iloc[start:min(stop, self.rows)])
+        if stop > self.rows:
+            if len(self.chunks) > 1:
+                self.chunks = [pd.concat(self.chunks)]
+            parts.append(self.chunks[0][columns].iloc[
+                max(start - self.rows, 0):stop - self.rows])
+        result = pd.concat(parts) if len(parts) > 1 else \
+            parts[0] if parts else pd.DataFrame(columns=columns)
+        result.index.name = self.index_name
+        return result
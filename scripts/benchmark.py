@@ -0,0 +1,375 @@
+"""Time the hot paths of the viewer on seeded synthetic data and write the
+results to JSON, e.g.
+
+    PYTHONPATH=. python scripts/benchmark.py --rows 1000000 --output old.json
+    PYTHONPATH=. python scripts/benchmark.py --rows 1000000 --compare old.json
+
+Cases that build widgets create a QApplication, without a display run them
+under xvfb-run.  They are recorded as skipped if PySide cannot be imported.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from pandas_viewer import synthetic, transform, formatting, sidecar
+from pandas_viewer.loading import load_file
+from pandas_viewer.pathindex import PathIndex, walk
+from pandas_viewer.selection import Selection
+from pandas_viewer.rowview import RowView
+
+CASES = OrderedDict()
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHOW_WINDOW = '''
+from PySide import QtGui
+import viewer_gui
+app = QtGui.QApplication([])
+window = viewer_gui.PandasViewer()
+window.show()
+app.processEvents()
+'''
+
+
+class Skipped(Exception):
+    pass
+
+
+def case(func):
+    """Register func as a benchmark case.  func is called with the Context and
+    returns the function to time and optionally a setup function called
+    before each repeat, whose result is passed to the timed function
+    """
+    CASES[func.__name__] = func
+    return func
+
+
+class Context(object):
+    """The scale of the synthetic data and the files written for it"""
+
+    def __init__(self, rows, cols, depth, width, seed, output_dir):
+        self.rows = rows
+        self.cols = cols
+        self.depth = depth
+        self.width = width
+        self.seed = seed
+        self.output_dir = output_dir
+        self.sidecar_dir = os.path.join(output_dir, 'sidecar')
+        self._frame = None
+        self._dict = None
+        self._files = {}
+        self._app = None
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            self._frame = synthetic.synthetic_frame(self.rows, self.cols,
+                                                    self.seed)
+        return self._frame
+
+    @property
+    def dict(self):
+        if self._dict is None:
+            self._dict = synthetic.synthetic_dict(
+                self.rows // self.width ** self.depth or 1, self.cols,
+                self.depth, self.width, self.seed)
+        return self._dict
+
+    def file(self, ext):
+        """Return the path of the synthetic file with extension ext, writing
+        it the first time"""
+        if ext not in self._files:
+            filepath = os.path.join(self.output_dir, 'synthetic' + ext)
+            rows = self.rows // self.width ** self.depth or 1
+            if ext == '.csv':
+                synthetic.write_csv(filepath, self.rows, self.cols, self.seed)
+            elif ext == '.h5':
+                synthetic.write_hdf5(filepath, rows, self.cols,
+                                     max(self.depth, 1), self.width, self.seed)
+            else:
+                synthetic.write_pickle(filepath, rows, self.cols, self.depth,
+                                       self.width, self.seed,
+                                       packed=ext == '_packed.pickle')
+            self._files[ext] = filepath
+        return self._files[ext]
+
+    def clear_sidecar(self):
+        shutil.rmtree(self.sidecar_dir, ignore_errors=True)
+
+    def gui(self):
+        """Import the gui modules, creating the QApplication the first time"""
+        try:
+            from PySide import QtGui
+            import viewer_gui
+            from pandas_viewer import trees
+        except ImportError as e:
+            raise Skipped(str(e))
+        if self._app is None:
+            self._app = QtGui.QApplication.instance() or \
+                QtGui.QApplication([])
+        return viewer_gui, trees
+
+
+def _load(ctx, ext, warm):
+    filepath = ctx.file(ext)
+    if warm:
+        ctx.clear_sidecar()
+        load_file(filepath)
+        setup = None
+    else:
+        setup = ctx.clear_sidecar
+    return lambda *args: load_file(filepath), setup
+
+
+@case
+def startup(ctx):
+    """Time a new interpreter from start to the main window being shown"""
+    ctx.gui()
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return lambda *args: subprocess.check_call(
+        [sys.executable, '-c', SHOW_WINDOW], cwd=ROOT, env=env), None
+
+
+@case
+def load_file_pickle(ctx):
+    return _load(ctx, '.pickle', False)
+
+
+@case
+def load_file_pickle_sidecar(ctx):
+    return _load(ctx, '.pickle', True)
+
+
+@case
+def load_file_packed_pickle(ctx):
+    return _load(ctx, '_packed.pickle', False)
+
+
+@case
+def load_file_csv(ctx):
+    filepath = ctx.file('.csv')
+    return lambda *args: load_file(filepath).read(), ctx.clear_sidecar
+
+
+@case
+def load_file_hdf5(ctx):
+    return _load(ctx, '.h5', False)
+
+
+@case
+def add_obj_to_tree(ctx):
+    viewer_gui, trees = ctx.gui()
+    return (lambda tree: tree.add_obj_to_tree(dict(synthetic=ctx.dict)),
+            trees.PandasTreeWidget)
+
+
+@case
+def index_tree(ctx):
+    """Time indexing the synthetic dict for the tree and its filter, the part
+    of add_obj_to_tree that does not need Qt"""
+    obj = dict(synthetic=ctx.dict)
+
+    def index(*args):
+        PathIndex().add(('synthetic',), obj)
+        return walk(('synthetic',), ctx.dict)
+    return index, None
+
+
+@case
+def selection_changed(ctx):
+    viewer_gui, trees = ctx.gui()
+    from PySide import QtGui
+    tree = trees.PandasTreeWidget(obj=dict(synthetic=ctx.frame))
+    item = tree.topLevelItem(0)
+    item.setExpanded(True)
+    selection = QtGui.QItemSelection(
+        tree.indexFromItem(item.child(0)),
+        tree.indexFromItem(item.child(item.childCount() - 1)))
+
+    def select(*args):
+        tree.selectionModel().select(selection,
+                                     QtGui.QItemSelectionModel.Select)
+    return select, tree.clearSelection
+
+
+@case
+def selection_assembly(ctx):
+    df = ctx.frame
+
+    def assemble(*args):
+        selection = Selection()
+        for column in df.columns:
+            selection.add(('synthetic', column), df[column])
+        return selection.frame()
+    return assemble, None
+
+
+@case
+def resample(ctx):
+    df = ctx.frame
+    return lambda *args: transform.resample(df, 'H', 'mean'), None
+
+
+@case
+def dataframe_changed(ctx):
+    viewer_gui, trees = ctx.gui()
+    viewer = viewer_gui.PandasViewer()
+    viewer.freq, viewer.agg = 'H', 'mean'
+    df = ctx.frame
+    return lambda *args: viewer.dataframe_changed(df), \
+        viewer.result_cache.clear
+
+
+@case
+def format_scroll(ctx):
+    df = ctx.frame
+    starts = np.linspace(0, max(len(df) - 50, 0), 200).astype(int)
+
+    def scroll(*args):
+        for start in starts:
+            formatting.format_block(df, start, start + 50)
+    return scroll, None
+
+
+@case
+def sort_filter(ctx):
+    df = ctx.frame
+
+    def sort(*args):
+        view = RowView(df)
+        view.sort(0)
+        view.add_filter(1, '>', '0')
+        view.sort(0, ascending=False)
+        formatting.format_block(df, 0, 256, rows=view.rows)
+    return sort, None
+
+
+@case
+def table_model_scroll(ctx):
+    viewer_gui, trees = ctx.gui()
+    from PySide import QtCore
+    df = ctx.frame
+    starts = np.linspace(0, max(len(df) - 50, 0), 200).astype(int)
+    columns = range(len(df.columns) + 1)
+
+    def scroll(model):
+        for start in starts:
+            for row in range(start, min(start + 50, len(df))):
+                for column in columns:
+                    model.data(model.index(row, column), QtCore.Qt.DisplayRole)
+    return scroll, lambda: viewer_gui.DataFrameTableModel(None, df)
+
+
+@case
+def plot_set_dataframe(ctx):
+    viewer_gui, trees = ctx.gui()
+    widget = viewer_gui.DataFramePlotWidget(pd.DataFrame())
+    df = ctx.frame
+
+    def plot(*args):
+        widget.set_dataframe(df)
+        widget.draw()
+    return plot, None
+
+
+def measure(func, setup=None, repeat=3):
+    """Return the best and mean time of repeat calls of func, each passed the
+    result of setup if given"""
+    times = []
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.time()
+        func(*args)
+        times.append(time.time() - start)
+    return dict(best=min(times), mean=sum(times) / len(times), repeat=repeat)
+
+
+def run(ctx, names, repeat):
+    """Run the cases names, returning the results keyed by name"""
+    results = OrderedDict()
+    for name in names:
+        try:
+            func, setup = CASES[name](ctx)
+        except Skipped as e:
+            results[name] = dict(skipped=str(e))
+        else:
+            results[name] = measure(func, setup, repeat)
+        print '{:<28}{}'.format(name, _format(results[name]))
+    return results
+
+
+def compare(results, baseline):
+    """Print the ratio of each time in results to the time in baseline"""
+    for name, result in results.iteritems():
+        old = baseline.get(name, {})
+        if 'best' in result and 'best' in old and old['best'] > 0:
+            print '{:<28}{:8.3f}s {:8.3f}s {:6.2f}x'.format(
+                name, old['best'], result['best'],
+                result['best'] / old['best'])
+
+
+def _format(result):
+    if 'skipped' in result:
+        return 'skipped ({})'.format(result['skipped'])
+    return '{best:.4f}s best, {mean:.4f}s mean'.format(**result)
+
+
+def _commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=ROOT).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--cols', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=2,
+                        help='levels of nested dicts in the tree cases')
+    parser.add_argument('--width', type=int, default=4,
+                        help='children of each nested dict')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--cases', nargs='+', choices=list(CASES),
+                        default=list(CASES))
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--compare', help='JSON of a previous run')
+    args = parser.parse_args(argv)
+    output_dir = tempfile.mkdtemp()
+    sidecar.CACHE_DIR = os.path.join(output_dir, 'sidecar')
+    try:
+        ctx = Context(args.rows, args.cols, args.depth, args.width, args.seed,
+                      output_dir)
+        results = run(ctx, args.cases, args.repeat)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    report = OrderedDict([
+        ('commit', _commit()),
+        ('time', time.strftime('%Y-%m-%dT%H:%M:%S')),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('pandas', pd.__version__),
+        ('numpy', np.__version__),
+        ('scale', OrderedDict([('rows', args.rows), ('cols', args.cols),
+                               ('depth', args.depth), ('width', args.width),
+                               ('seed', args.seed)])),
+        ('results', results)])
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)['results'])
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+from pandas_viewer import random, pickling
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def main(freq='T', n=20):
+    """Time dump/load against dump_packed/load_packed for a dict of n random
+    one month DataFrames at frequency freq"""
+    obj = dict(('df{}'.format(i), random.RandomDataFrame(freq=freq, cols=10))
+               for i in range(n))
+    output_dir = tempfile.mkdtemp()
+    try:
+        filepath = os.path.join(output_dir, 'plain.pickle')
+        print 'dump {:.3f}s'.format(timed(pickling.dump, obj, filepath))
+        print 'load {:.3f}s'.format(timed(pickling.load, filepath))
+        print 'size {:,} bytes'.format(os.path.getsize(filepath))
+        for codec in sorted(pickling.CODECS):
+            filepath = os.path.join(output_dir, '{}.pickle'.format(codec))
+            print 'dump_packed {} {:.3f}s'.format(
+                codec, timed(pickling.dump_packed, obj, filepath, codec=codec))
+            print 'load_packed {} {:.3f}s'.format(
+                codec, timed(pickling.load_packed, filepath))
+            print 'load_packed {} one key {:.3f}s'.format(
+                codec, timed(pickling.load_packed, filepath, key='df0'))
+            print 'size {:,} bytes'.format(os.path.getsize(filepath))
+    finally:
+        shutil.rmtree(output_dir)
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -1,21 +1,19 @@
 import sys
 import os
 import functools
+import threading
+from collections import OrderedDict
 
 from PySide import QtGui, QtCore
 import pandas as pd
 import numpy as np
-import h5py
-import matplotlib
 
-matplotlib.rcParams['backend.qt4'] = 'PySide'
-
-from matplotlib.backends.backend_qt4agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt4agg import NavigationToolbar2QT as NavigationToolbar
-from matplotlib.figure import Figure
-from matplotlib import pyplot as plt
-
-from pandas_viewer import pickling, trees
+from pandas_viewer import pickling, trees, formatting, decimate, transform
+from pandas_viewer import profiling, export, stats
+from pandas_viewer.plotting import datenum, plot_frame, update_lines
+from pandas_viewer.pipeline import Pipeline
+from pandas_viewer.cache import LRUCache
+from pandas_viewer.rowview import RowView, INDEX, parse_filter
 
 
 # ToDo Add email plot icon to navigation bar
@@ -27,18 +25,79 @@ from pandas_viewer import pickling, trees
 # ToDo fix bug where plot is not being cleared on loading new file
 
 
-def update_dataframe(obj):
-    @functools.wraps(obj)
-    def func(*args, **kwargs):
-        self = args[0]
-        result = obj(*args, **kwargs)
-        self.dataframe_changed(self.df)
-        return result
-    return func
+def update_dataframe(stage):
+    """Decorator that invalidates stage of the viewer pipeline after the
+    method is called and then reruns the pipeline, so that only the stages
+    downstream of stage are recomputed
+
+    Parameters
+    ----------
+    stage: str
+        One of 'source', 'resample', 'mask', 'table' or 'plot'
+    """
+    def decorator(obj):
+        @functools.wraps(obj)
+        def func(*args, **kwargs):
+            self = args[0]
+            result = obj(*args, **kwargs)
+            self.pipeline.invalidate(stage)
+            self.pipeline.run()
+            return result
+        return func
+    return decorator
+
+
+def import_plotting():
+    """Import the matplotlib Qt4Agg backend, deferred from startup until the
+    first plot or warm_imports
+
+    Returns
+    -------
+    (FigureCanvas, NavigationToolbar, Figure)
+    """
+    import matplotlib
+    matplotlib.rcParams['backend.qt4'] = 'PySide'
+    from matplotlib.backends.backend_qt4agg import FigureCanvasQTAgg
+    from matplotlib.backends.backend_qt4agg import NavigationToolbar2QT
+    from matplotlib.figure import Figure
+    return FigureCanvasQTAgg, NavigationToolbar2QT, Figure
+
+
+def warm_imports():
+    """Import the plotting stack and h5py on a background thread so they are
+    loaded by the time they are first needed
+
+    Returns
+    -------
+    threading.Thread
+    """
+    def run():
+        import_plotting()
+        from matplotlib import dates
+        try:
+            import h5py
+        except ImportError:
+            pass
+    thread = threading.Thread(target=run, name='warm_imports')
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+def _under(keys, key):
+    """Return whether keys, the keys of a tree item or a selection key of
+    several, include an item under the top level node key"""
+    if keys and isinstance(keys[0], tuple):
+        return any(k[0] == key for k in keys)
+    return bool(keys) and keys[0] == key
 
 
 class DataFrameTableView(QtGui.QTableView):
 
+    column_margin = 12
+    sort_indicator_width = 16
+    cache_widths = 4096
+
     def __init__(self, df):
         """Initiate the TableView with pd.DataFrame df
 
@@ -53,10 +112,17 @@ class DataFrameTableView(QtGui.QTableView):
         """
         QtGui.QTableView.__init__(self)
         self.resize(500, 500)
+        self.verticalScrollBar().valueChanged.connect(self.prefetch)
+        self.widest = LRUCache(self.cache_widths)
+        header = self.horizontalHeader()
+        header.setClickable(True)
+        header.sectionClicked.connect(self.sort_by_section)
+        header.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        header.customContextMenuRequested.connect(self.header_menu)
         if df is not None:
             self.set_dataframe(df)
 
-    def set_dataframe(self, df):
+    def set_dataframe(self, df, key=None):
         """Setter for the dataframe property
 
         Parameters
@@ -64,15 +130,155 @@ class DataFrameTableView(QtGui.QTableView):
 
         df: pd.DataFrame
             The pd.DataFrame to set the property
+        key: tuple, optional
+            Identifies the contents of df, e.g. the tree selection and the
+            settings it was derived with, for caching the column widths.
+            Widths are not cached if not given
         """
-        table_model = DataFrameTableModel(self, df)
-        self.df = df
-        self.setModel(table_model)
-        self.resizeColumnsToContents()
+        with profiling.profiler.span('table_model'):
+            table_model = DataFrameTableModel(self, df)
+            if self.model() is not None:
+                table_model.view.restore(self.model().view)
+            self.df = df
+            self.key = key
+            self.setModel(table_model)
+        self.update_sort_indicator()
+        with profiling.profiler.span('resize_columns'):
+            self.resize_columns()
+
+    def resize_columns(self):
+        """Size each column to the widest of a sample of its formatted values
+        and its header, rather than resizeColumnsToContents asking the model
+        for every cell.  The widest value is cached per column, keyed by the
+        key of the dataframe and the position, label, dtype and length of the
+        column
+        """
+        df = self.df
+        model = self.model()
+        positions = formatting.sample_positions(len(df))
+        metrics = self.fontMetrics()
+        header_metrics = self.horizontalHeader().fontMetrics()
+        for section in range(model.columnCount(None)):
+            if section == 0:
+                key = (INDEX, df.index.dtype.str, len(df))
+            else:
+                values = df.iloc[:, section - 1].values
+                key = (section, df.columns[section - 1], values.dtype.str,
+                       len(df))
+            key = None if self.key is None else self.key + key
+            text = self.widest.get(key)
+            if text is None:
+                if section == 0:
+                    text = formatting.widest_index(df.index, positions)
+                else:
+                    text = formatting.widest_value(values, positions)
+                if key is not None:
+                    self.widest[key] = text
+            label = model.headerData(section, QtCore.Qt.Horizontal,
+                                     QtCore.Qt.DisplayRole)
+            width = max(metrics.width(text),
+                        header_metrics.width(unicode(label)) +
+                        self.sort_indicator_width)
+            self.setColumnWidth(section, width + self.column_margin)
+
+    def sort_by_section(self, section):
+        """Sort the rows by the column of section, reversing the order if the
+        rows are already sorted by it
+
+        Parameters
+        ----------
+        section: int
+            The column of the table, 0 being the index
+        """
+        model = self.model()
+        if model is None:
+            return
+        header = self.horizontalHeader()
+        if header.isSortIndicatorShown() and \
+                header.sortIndicatorSection() == section and \
+                header.sortIndicatorOrder() == QtCore.Qt.AscendingOrder:
+            order = QtCore.Qt.DescendingOrder
+        else:
+            order = QtCore.Qt.AscendingOrder
+        model.sort(section, order)
+        self.update_sort_indicator()
+
+    def update_sort_indicator(self):
+        """Show the column and direction the rows of the model are sorted by
+        on the header"""
+        header = self.horizontalHeader()
+        view = self.model().view
+        section = self.model().section(view.sort_column)
+        header.setSortIndicatorShown(section is not None)
+        if section is not None:
+            header.setSortIndicator(section, QtCore.Qt.AscendingOrder
+                                    if view.ascending
+                                    else QtCore.Qt.DescendingOrder)
+
+    def header_menu(self, pos):
+        """Show the menu to filter or unsort the rows for the column header at
+        pos"""
+        model = self.model()
+        section = self.horizontalHeader().logicalIndexAt(pos)
+        if model is None or section < 0:
+            return
+        column = model.column(section)
+        menu = QtGui.QMenu(self)
+        menu.addAction('Filter...', functools.partial(self.edit_filter,
+                                                      section))
+        clear = menu.addAction('Clear Filter', functools.partial(
+            model.set_filter, section, ''))
+        clear.setEnabled(column in model.view.filters)
+        clear_all = menu.addAction('Clear All Filters', model.clear_filters)
+        clear_all.setEnabled(bool(model.view.filters))
+        menu.addSeparator()
+        unsort = menu.addAction('Unsort', self.unsort)
+        unsort.setEnabled(model.view.sort_column is not None)
+        menu.exec_(self.horizontalHeader().mapToGlobal(pos))
+
+    def edit_filter(self, section):
+        """Ask for the filter of the column of section, e.g. > 0, == 1.5 or
+        contains abc"""
+        model = self.model()
+        op, value = model.view.filters.get(model.column(section), ('', ''))
+        label = model.headerData(section, QtCore.Qt.Horizontal,
+                                 QtCore.Qt.DisplayRole)
+        text, ok = QtGui.QInputDialog.getText(
+            self, 'Filter', 'Show the rows where {}, e.g. > 0, == 1.5 or '
+            'contains abc'.format(label), text='{} {}'.format(op, value).strip())
+        if not ok:
+            return
+        try:
+            model.set_filter(section, text)
+        except (ValueError, TypeError) as e:
+            QtGui.QMessageBox.warning(self, 'Filter',
+                                      'Invalid filter {}: {}'.format(text, e))
+
+    def unsort(self):
+        self.model().sort(-1)
+        self.update_sort_indicator()
+
+    def prefetch(self, *args):
+        """Format the rows currently in the viewport, and the blocks either
+        side of them, so that scrolling only looks up cached strings
+        """
+        model = self.model()
+        if model is None:
+            return
+        first = self.rowAt(0)
+        last = self.rowAt(self.viewport().height() - 1)
+        if first < 0:
+            return
+        if last < 0:
+            last = model.rowCount(None) - 1
+        model.prefetch(first, last)
 
 
 class DataFrameTableModel(QtCore.QAbstractTableModel):
 
+    block_size = 256
+    cache_blocks = 64
+
     def __init__(self, parent, df):
         """Initiate the Table Model from a parent object, that should be a
         QtGui.QTableView and an initial pd.DataFrame, df
@@ -90,6 +296,8 @@ class DataFrameTableModel(QtCore.QAbstractTableModel):
         """
         QtCore.QAbstractTableModel.__init__(self, parent)
         self.df = df
+        self.view = RowView(df)
+        self.blocks = LRUCache(self.cache_blocks)
 
     def rowCount(self, parent):
         """Returns the length of the DataFrame property of the parent object
@@ -102,7 +310,7 @@ class DataFrameTableModel(QtCore.QAbstractTableModel):
         -------
         int
         """
-        return len(self.df)
+        return len(self.view)
 
     def columnCount(self, parent):
         """Returns the number of columns in the DataFrame with a plus one for
@@ -135,13 +343,51 @@ class DataFrameTableModel(QtCore.QAbstractTableModel):
         if not index.isValid() or role != QtCore.Qt.DisplayRole:
             value = None
         else:
-            col, row = index.column(), index.row()
-            if col == 0:
-                value = self.df.index[row].strftime('%d-%b-%y %H:%M')
-            else:
-                value = str(self.df.iloc[row, col-1])
+            row = index.row()
+            block = self.get_block(row // self.block_size)
+            value = block[row % self.block_size, index.column()]
         return value
 
+    def get_block(self, n):
+        """Return the formatted strings for block n of the DataFrame, formatting
+        the whole block at once if it is not already cached
+
+        Parameters
+        ----------
+        n: int
+            The number of the block, block n covers rows n * block_size to
+            (n + 1) * block_size
+
+        Returns
+        -------
+        np.ndarray
+            The formatted block with the index as the first column
+        """
+        block = self.blocks.get(n)
+        if block is None:
+            start = n * self.block_size
+            block = formatting.format_block(
+                self.df, start, start + self.block_size, rows=self.view.rows)
+            self.blocks[n] = block
+        return block
+
+    def prefetch(self, first, last):
+        """Format the blocks covering rows first to last plus the block either
+        side of them
+
+        Parameters
+        ----------
+        first: int
+            The first visible row
+        last: int
+            The last visible row
+        """
+        n_blocks = (len(self.view) - 1) // self.block_size + 1
+        start = max(first // self.block_size - 1, 0)
+        stop = min(last // self.block_size + 2, n_blocks)
+        for n in range(start, stop):
+            self.get_block(n)
+
     def headerData(self, idx, orientation, role):
         """Returns the column name of the dataframe at idx or 'Timestamp' if the
          idx = 0
@@ -159,18 +405,206 @@ class DataFrameTableModel(QtCore.QAbstractTableModel):
         """
         if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
             value = 'Timestamp' if idx == 0 else self.df.columns[idx-1]
+            if self.column(idx) in self.view.filters:
+                value = u'{} *'.format(value)
+        elif orientation == QtCore.Qt.Vertical and \
+                role == QtCore.Qt.DisplayRole:
+            value = self.view.position(idx) + 1
         else:
             value = None
         return value
 
+    def column(self, section):
+        """Return the column position of the RowView for section of the
+        table, None for no column"""
+        if section == 0:
+            return INDEX
+        if 0 < section <= len(self.df.columns):
+            return section - 1
+        return None
+
+    def section(self, column):
+        """Return the section of the table for column of the RowView, the
+        inverse of column"""
+        if column is INDEX:
+            return 0
+        if self.view.has_column(column):
+            return column + 1
+        return None
+
+    def sort(self, section, order=QtCore.Qt.AscendingOrder):
+        """Order the rows by the column of section through its cached
+        argsort, without copying the DataFrame.  A section of -1 restores the
+        original order
+
+        Parameters
+        ----------
+        section: int
+            The column of the table, 0 being the index
+        order: QtCore.Qt.SortOrder
+        """
+        with profiling.profiler.span('sort', rows=len(self.df)):
+            self.layoutAboutToBeChanged.emit()
+            self.view.sort(self.column(section),
+                           order == QtCore.Qt.AscendingOrder)
+            self.blocks.clear()
+            self.layoutChanged.emit()
+
+    def set_filter(self, section, text):
+        """Show only the rows passing the filter text, e.g. > 0, == 1.5 or
+        contains abc, on the column of section, an empty text removes the
+        filter
+
+        Parameters
+        ----------
+        section: int
+            The column of the table, 0 being the index
+        text: str
+        """
+        column = self.column(section)
+        op, value = parse_filter(text)
+        with profiling.profiler.span('filter', rows=len(self.df)):
+            self.beginResetModel()
+            try:
+                if value:
+                    self.view.add_filter(column, op, value)
+                else:
+                    self.view.remove_filter(column)
+            finally:
+                self.blocks.clear()
+                self.endResetModel()
+
+    def clear_filters(self):
+        self.beginResetModel()
+        self.view.clear_filters()
+        self.blocks.clear()
+        self.endResetModel()
+
+
+class StatsThread(QtCore.QThread):
+    """Thread that computes the statistics of columns, emitting them keyed by
+    column once all are computed"""
+
+    computed = QtCore.Signal(int, object)
+
+    def __init__(self, columns, generation=0, parent=None):
+        """Initiate the thread with the columns to compute
+
+        Parameters
+        ----------
+        columns: list((object, np.ndarray))
+            The key and values of each column
+        generation: int
+            Emitted with the statistics, so that those of columns cleared
+            from the cache since are dropped
+        parent: QtCore.QObject, optional
+
+        Returns
+        -------
+        StatsThread
+        """
+        QtCore.QThread.__init__(self, parent)
+        self.columns = columns
+        self.generation = generation
+        self.finished.connect(self.deleteLater)
+
+    def run(self):
+        with profiling.profiler.span('stats', columns=len(self.columns)):
+            result = dict((key, stats.column_stats(values))
+                          for key, values in self.columns)
+        self.computed.emit(self.generation, result)
+
+
+class DataFrameStatsView(QtGui.QTableWidget):
+    """Table of the statistics of each column of the displayed dataframe.
+    Statistics are computed on a StatsThread and cached by column key, so
+    only the columns not already cached are computed when the dataframe
+    changes
+
+    """
+
+    cache_columns = 4096
+
+    def __init__(self):
+        QtGui.QTableWidget.__init__(self, 0, len(stats.STATISTICS))
+        self.setHorizontalHeaderLabels(list(stats.STATISTICS))
+        self.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        self.cache = LRUCache(self.cache_columns)
+        self.keys = []
+        self.pending = set()
+        self.generation = 0
+
+    def set_dataframe(self, df, keys):
+        """Show the statistics of the columns of df, computing those not
+        cached on a background thread
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            The displayed dataframe
+        keys: list
+            The cache key of each column of df
+        """
+        self.keys = keys
+        self.setRowCount(len(keys))
+        self.setVerticalHeaderLabels([str(c) for c in df.columns])
+        missing = []
+        for row, key in enumerate(keys):
+            result = self.cache.get(key)
+            self.set_row(row, result)
+            if result is None and key not in self.pending:
+                self.pending.add(key)
+                missing.append((key, df.iloc[:, row].values))
+        if missing:
+            thread = StatsThread(missing, self.generation, self)
+            thread.computed.connect(self._computed)
+            thread.start()
+
+    def set_row(self, row, result):
+        """Show result, the statistics of a column, in row, or blank cells if
+        result is None"""
+        for column in range(len(stats.STATISTICS)):
+            text = '' if result is None else '{:.6g}'.format(result[column])
+            self.setItem(row, column, QtGui.QTableWidgetItem(text))
+
+    def clear_cache(self, key=None):
+        """Clear the cached statistics, those still being computed are
+        dropped when they arrive
+
+        Parameters
+        ----------
+        key: str, optional
+            Only clear the statistics of the columns of items under the top
+            level node key, e.g. after rows were appended to its file
+        """
+        if key is None:
+            self.cache.clear()
+        else:
+            for k in self.cache.keys():
+                if _under(k[0], key):
+                    self.cache.pop(k)
+        self.pending.clear()
+        self.generation += 1
+
+    def _computed(self, generation, results):
+        if generation != self.generation:
+            return
+        for key, result in results.iteritems():
+            self.cache[key] = result
+            self.pending.discard(key)
+        for row, key in enumerate(self.keys):
+            if key in results:
+                self.set_row(row, results[key])
+
 
 class DataFramePlotWidget(QtGui.QWidget):
     """QWidget to hold a matplotlib plot of the pd.DataFrame
 
     """
     def __init__(self, df=None):
-        """Initiates the figure, canvas, toolbar and subplot necessary for
-        plotting the dataframe
+        """Initiates the layout of the widget, the figure, canvas, toolbar and
+        subplot are created when the first non-empty dataframe is plotted so
+        that matplotlib is not imported at startup
 
         Parameters
         ----------
@@ -182,20 +616,38 @@ class DataFramePlotWidget(QtGui.QWidget):
         DataFramePlotWidget
         """
         QtGui.QWidget.__init__(self)
+        self.chart_type = 'line'
+        self.decimation = 'minmax'
+        self.legend_visible = True
+        self.fig = None
+        self.canvas = None
+        self.toolbar = None
+        self.subplot = None
+        self.legend = None
+        self.lines = []
+        self.columns = None
+        self.background = None
+        self.vbox = QtGui.QVBoxLayout()
+        self.setLayout(self.vbox)
+        self._replotting = False
+        self._xlim_cid = None
+        self.set_dataframe(df)
+
+    def init_canvas(self):
+        """Create the figure, canvas, toolbar and subplot if they have not
+        been created yet"""
+        if self.canvas is not None:
+            return
+        FigureCanvas, NavigationToolbar, Figure = import_plotting()
         self.fig = Figure()
         self.canvas = FigureCanvas(self.fig)
-        self.chart_type = 'line'
         self.canvas.setParent(self)
         self.toolbar = NavigationToolbar(self.canvas, self)
-
-        self.vbox = QtGui.QVBoxLayout()
         self.vbox.addWidget(self.toolbar)
         self.vbox.addWidget(self.canvas)
-
-        self.setLayout(self.vbox)
         self.subplot = self.fig.add_subplot(111)
         self.legend = self.subplot.legend([])
-        self.set_dataframe(df)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
 
     def set_dataframe(self, dataframe):
         """Set the pd.DataFrame for the widget and plot it on the subplot
@@ -206,28 +658,165 @@ class DataFramePlotWidget(QtGui.QWidget):
             The dataframe to plot
         """
         self.dataframe = dataframe
-        values = dataframe.cumsum(
-            axis=1).values if self.chart_type == 'stack' else dataframe.values
-        if not dataframe.empty:
+        if self.canvas is None and dataframe.empty:
+            return
+        self.init_canvas()
+        with profiling.profiler.span('plot'):
+            self.x = datenum(dataframe.index)
+            if not dataframe.empty:
+                self.plot()
+
+    def plot(self, xlim=None):
+        """Plot the dataframe on the subplot.  If decimation is set each series
+        is reduced to the points needed at the pixel width of the canvas.  If
+        the columns of a line chart are unchanged the data of the existing
+        lines is replaced, keeping the legend and axes
+
+        Parameters
+        ----------
+        xlim: (float, float), optional
+            The visible x range to plot, defaults to the whole dataframe
+        """
+        self._replotting = True
+        x, values = self.x, self.dataframe.values
+        if xlim is not None and self.decimation is not None:
+            visible = decimate.visible_slice(x, xlim)
+            x, values = x[visible], values[visible]
+        n_pixels = max(self.canvas.width(), 1)
+        columns = list(self.dataframe.columns)
+        if self.chart_type == 'line' and columns == self.columns and \
+                len(self.lines) == values.shape[1]:
+            limits = self.subplot.get_xlim(), self.subplot.get_ylim()
+            update_lines(self.lines, x, values, self.decimation, n_pixels)
+            if xlim is None:
+                self.subplot.relim()
+                self.subplot.autoscale_view()
+            if limits != (self.subplot.get_xlim(), self.subplot.get_ylim()):
+                self.background = None
+        else:
+            ylim = self.subplot.get_ylim()
+            if self._xlim_cid is not None:
+                self.subplot.callbacks.disconnect(self._xlim_cid)
             self.subplot.clear()
-            if self.chart_type == 'line':
-                self.subplot.plot_date(dataframe.index, values, '-')
-            elif self.chart_type == 'stack':
-                self.subplot.stackplot(dataframe.index, dataframe.values.transpose())
-            else:
-                raise ValueError('Chart type %s not recognised', self.chart_type)
+            plot_frame(self.subplot, x, values, self.chart_type,
+                       self.decimation, n_pixels)
             legend = self.subplot.legend(self.dataframe.columns)
-            legend.set_visible(self.legend.get_visible())
+            legend.set_visible(self.legend_visible)
             self.legend = legend
+            self.lines = self.subplot.get_lines() \
+                if self.chart_type == 'line' else []
+            for line in self.lines:
+                line.set_animated(True)
+            self.columns = columns
+            self.background = None
+            if xlim is not None:
+                self.subplot.set_xlim(xlim)
+                self.subplot.set_ylim(ylim)
+            self._xlim_cid = self.subplot.callbacks.connect(
+                'xlim_changed', self.on_xlim_changed)
+        self._replotting = False
+
+    def set_legend_visible(self, visible):
+        self.legend_visible = visible
+        if self.legend is not None:
+            self.legend.set_visible(visible)
+        self.background = None
+
+    def on_draw(self, event):
+        """Cache the background of the subplot, which is drawn without the
+        animated lines, and draw the lines over it.  Also draws the lines
+        when the figure is saved
+
+        Parameters
+        ----------
+        event: matplotlib.backend_bases.DrawEvent
+        """
+        if event.renderer is getattr(self.canvas, 'renderer', None):
+            self.background = self.canvas.copy_from_bbox(self.subplot.bbox)
+        for artist in self.animated():
+            artist.draw(event.renderer)
+
+    def animated(self):
+        """Return the artists drawn over the cached background, the lines and
+        the legend over them"""
+        artists = list(self.lines)
+        if artists and self.legend is not None and self.legend_visible:
+            artists.append(self.legend)
+        return artists
+
+    def on_xlim_changed(self, subplot):
+        """Re-decimate the dataframe for the new visible x range when the plot
+        is zoomed or panned
+
+        Parameters
+        ----------
+        subplot: matplotlib.axes.Axes
+            The axes whose x limits changed
+        """
+        if self._replotting or self.decimation is None:
+            return
+        self.plot(subplot.get_xlim())
+        self.canvas.draw_idle()
 
     def draw(self):
-        """Draw the Canvas for the plot Figure"""
-        self.canvas.draw()
+        """Draw the Canvas for the plot Figure.  If only the data of the lines
+        changed the cached background is restored and only the lines are
+        redrawn and blitted
+        """
+        if self.canvas is None:
+            return
+        with profiling.profiler.span('draw'):
+            if self.background is None:
+                self.canvas.draw()
+            else:
+                self.canvas.restore_region(self.background)
+                for artist in self.animated():
+                    self.subplot.draw_artist(artist)
+                self.canvas.blit(self.subplot.bbox)
+
+
+class ExportThread(QtCore.QThread):
+    """Thread that writes a DataFrame with export.export, emitting its
+    progress"""
+
+    progress = QtCore.Signal(int)
+    exported = QtCore.Signal(str)
+    failed = QtCore.Signal(str, str)
+
+    def __init__(self, df, filepath, parent=None):
+        QtCore.QThread.__init__(self, parent)
+        self.df = df
+        self.filepath = filepath
+        self.cancelled = False
+        self.finished.connect(self.deleteLater)
+
+    def cancel(self):
+        """Abandon the export after the chunk being written"""
+        self.cancelled = True
+
+    def run(self):
+        try:
+            export.export(self.df, self.filepath, self.progress.emit,
+                          lambda: self.cancelled)
+        except export.ExportCancelled:
+            self.failed.emit(self.filepath, '')
+        except Exception as e:
+            self.failed.emit(self.filepath, str(e))
+        else:
+            self.exported.emit(self.filepath)
 
 
 class PandasViewer(QtGui.QMainWindow):
     """Main window for the GUI"""
 
+    result_cache_bytes = 512 * 2 ** 20
+    update_interval = 500
+    export_filters = OrderedDict([
+        ('CSV (*.csv)', '.csv'), ('NumPy (*.npy)', '.npy'),
+        ('NumPy archive (*.npz)', '.npz'), ('HDF5 (*.h5 *.hdf5)', '.h5'),
+        ('Packed pickle (*.pickle)', '.pickle')])
+    profiled = QtCore.Signal(object)
+
     def __init__(self, obj=None):
         """Initiate pandas viewer
 
@@ -260,6 +849,14 @@ class PandasViewer(QtGui.QMainWindow):
         self.filepath = None
         self.df = pd.DataFrame()
         self.displayed_df = pd.DataFrame()
+        self.result_cache = LRUCache(
+            int(self.settings.value('result_cache_bytes',
+                                    self.result_cache_bytes)),
+            sizeof=transform.nbytes)
+        self._pending_update = None
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self.apply_update)
         window = QtGui.QWidget()
         self.setCentralWidget(window)
         main_layout = QtGui.QVBoxLayout()
@@ -273,33 +870,56 @@ class PandasViewer(QtGui.QMainWindow):
         splitter.addWidget(left_panel)
         self.obj = obj
         self.tree_widget = trees.PandasTreeWidget(self, obj=obj)
+        self.tree_widget.memory.budget = int(self.settings.value(
+            'memory_budget', self.tree_widget.memory_budget))
+        self.memory_label = QtGui.QLabel()
+        self.statusBar().addPermanentWidget(self.memory_label)
+        self.tree_widget.memory_changed.connect(self.show_memory)
+        self.tree_widget.evict_objects()
         self.tree_widget.selection_made.connect(self.dataframe_changed)
+        self.tree_widget.selection_updated.connect(self.dataframe_updated)
+        self.tree_widget.tree_changed.connect(self.result_cache.clear)
+        self.tree_widget.rows_appended.connect(self.drop_cached)
+        self.filter_edit = QtGui.QLineEdit()
+        self.filter_edit.setPlaceholderText('Filter')
+        self.filter_edit.textChanged.connect(self.tree_widget.set_filter)
+        left_layout.addWidget(self.filter_edit)
         left_layout.addWidget(self.tree_widget)
         self.df_viewer = DataFrameTableView(None)
-        left_layout.addWidget(self.df_viewer)
+        self.stats_viewer = DataFrameStatsView()
+        self.tree_widget.tree_changed.connect(self.stats_viewer.clear_cache)
+        self.tree_widget.rows_appended.connect(self.stats_viewer.clear_cache)
+        table_splitter = QtGui.QSplitter(QtCore.Qt.Orientation.Horizontal)
+        table_splitter.addWidget(self.df_viewer)
+        table_splitter.addWidget(self.stats_viewer)
+        left_layout.addWidget(table_splitter)
 
         self.df_plot_viewer = DataFramePlotWidget(self.df)
         splitter.addWidget(self.df_plot_viewer)
         self.init_menu()
+        self.init_pipeline()
+        self.profiled.connect(self.show_profile)
+        profiling.profiler.listeners.append(self.profiled.emit)
 
     def init_action_menu(self):
         self.action_menu = QtGui.QMenu('Actions')
         self.menubar.addMenu(self.action_menu)
         self._create_action(self.action_menu, 'open', 'Open',
                            QtGui.QKeySequence.Open, self.open_file)
-        if os.path.exists('/md'):
-            self._create_action(self.action_menu, 'open_archive', 'Open Archive',
-                                'Ctrl+A', lambda: self.open_file('/md'))
+        self._create_action(self.action_menu, 'open_archive', 'Open Archive',
+                            'Ctrl+A', self.open_archive)
         self._create_action(self.action_menu, 'collapse_action', 'Collapse All',
                             'Ctrl+Shift+C', self.tree_widget.collapseAll)
         self._create_action(self.action_menu, 'expand_all', 'Expand All',
                             'Ctrl+Shift+E', self.tree_widget.expandAll)
+        self._create_action(self.action_menu, 'filter_action', 'Filter',
+                            'Ctrl+F', self.filter_edit.setFocus)
 
     def init_data_menu(self):
         data_menu = QtGui.QMenu('Data')
         self.menubar.addMenu(data_menu)
-        self._create_action(data_menu, 'save_to_csv', 'Save to csv',
-                           QtGui.QKeySequence.Save, self.save_to_csv)
+        self._create_action(data_menu, 'export_action', 'Export',
+                            QtGui.QKeySequence.Save, self.export_dataframe)
 
     def init_style_menu(self):
         self.style_menu = QtGui.QMenu('Style')
@@ -313,41 +933,194 @@ class PandasViewer(QtGui.QMainWindow):
         self._create_submenu(
             self.style_menu, 'chart_type', dict(L='line', R='stack'),
             self.change_chart)
+        self._create_submenu(
+            self.style_menu, 'decimation', dict(N='none', X='minmax', B='lttb'),
+            self.change_decimation)
         self._create_action(self.style_menu, 'strip_zeros', 'Strip Zeros',
                             'Ctrl+0', self.change_strip_zeros, checkable=True)
         self._create_action(self.style_menu, 'legend_action', 'Legend',
                             'Ctrl+L', self.change_legend, checkable=True)
 
+    def init_profile_menu(self):
+        profile_menu = QtGui.QMenu('Profile')
+        self.menubar.addMenu(profile_menu)
+        self._create_action(profile_menu, 'profile_action', 'Record Timings',
+                            'Ctrl+Shift+P', self.change_profile, checkable=True)
+        self.profile_action.setChecked(profiling.profiler.enabled)
+        self._create_action(profile_menu, 'export_trace', 'Export Trace',
+                            'Ctrl+Alt+T', self.export_trace)
+        self._create_action(profile_menu, 'clear_trace', 'Clear Trace', '',
+                            profiling.profiler.clear)
+
     def init_menu(self):
         """Initiate the drop down menus for the window"""
         self.menubar = QtGui.QMenuBar(self)
         self.init_action_menu()
         self.init_data_menu()
         self.init_style_menu()
+        self.init_profile_menu()
+
+    def init_pipeline(self):
+        """Initiate the pipeline of stages from the selected dataframe to the
+        table, plot and statistics, source -> resample -> mask -> table, plot
+        and stats
+        """
+        self.pipeline = Pipeline()
+        self.pipeline.add_stage('source', lambda: self.df)
+        self.pipeline.add_stage('resample', self._resample, 'source')
+        self.pipeline.add_stage('mask', self._mask, 'resample')
+        self.pipeline.add_stage('table', self._update_table, 'mask')
+        self.pipeline.add_stage('plot', self._update_plot, 'mask')
+        self.pipeline.add_stage('stats', self._update_stats, 'mask')
 
     def dataframe_changed(self, df):
-        """Set the dataframe in the dataframe viewer to df
+        """Set the dataframe in the dataframe viewer to df.  Resampled and
+        zero stripped views are cached by tree selection, freq, agg and strip
+        zeros up to a total of result_cache_bytes.  A pending update of
+        dataframe_updated is dropped as it was for the previous dataframe
 
         Parameters
         ----------
         df: pd.DataFrame
             The dataframe to set
         """
+        self._pending_update = None
+        self._update_timer.stop()
         self.df = df
-        self.displayed_df = self.df if self.freq is None else self.df.resample(
-            self.freq, how=self.agg)
-        if self.strip_zeros.isChecked():
-            for col, ts in self.displayed_df.iteritems():
-                self.displayed_df.ix[ts == 0, col] = np.nan
-        self.df_viewer.set_dataframe(self.displayed_df)
-        self.df_plot_viewer.set_dataframe(self.displayed_df)
+        with profiling.profiler.span('dataframe_changed', shape=list(df.shape)):
+            self.pipeline.invalidate('source')
+            self.pipeline.run()
+
+    def dataframe_updated(self, df, appended):
+        """Update the views for df, the selected dataframe after a watched
+        file changed, at most once every update_interval milliseconds
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            The selected dataframe
+        appended: bool
+            Whether df only has rows appended to the dataframe shown
+        """
+        if self._pending_update is not None:
+            appended = appended and self._pending_update[1]
+        self._pending_update = (df, appended)
+        if not self._update_timer.isActive():
+            self._update_timer.start(self.update_interval)
+
+    def apply_update(self):
+        """Show the pending update of dataframe_updated.  If only rows were
+        appended the resample is recomputed for the appended rows only"""
+        if self._pending_update is None:
+            return
+        df, appended = self._pending_update
+        self._pending_update = None
+        start = len(self.df)
+        if not appended or 'resample' not in self.pipeline.values or \
+                list(df.columns) != list(self.df.columns) or \
+                not df.index[:start].equals(self.df.index):
+            self.dataframe_changed(df)
+            return
+        self.df = df
+        with profiling.profiler.span('dataframe_appended',
+                                     shape=list(df.shape), start=start):
+            self.pipeline.set('source', df)
+            resampled = transform.resample_append(
+                self.pipeline['resample'], df, start, self.freq, self.agg)
+            if self.freq is not None:
+                self.result_cache[(self.tree_widget.selection_key, self.freq,
+                                   self.agg, 'resample')] = resampled
+            self.pipeline.set('resample', resampled)
+            self.pipeline.run()
+
+    def drop_cached(self, key):
+        """Drop the cached results of the selections with items under the top
+        level node key, e.g. after rows were appended to its file
+
+        Parameters
+        ----------
+        key: str
+            The key of the top level node
+        """
+        for k in self.result_cache.keys():
+            if _under(k[0], key):
+                self.result_cache.pop(k)
+
+    def _cached(self, key, func, df):
+        key = (self.tree_widget.selection_key, self.freq, self.agg) + key
+        result = self.result_cache.get(key)
+        if result is None:
+            result = func(df)
+            self.result_cache[key] = result
+        return result
+
+    def _resample(self, df):
+        if self.freq is None:
+            return df
+        return self._cached(
+            ('resample',), lambda x: transform.resample(x, self.freq, self.agg),
+            df)
+
+    def _mask(self, df):
+        if not self.strip_zeros.isChecked():
+            return df
+        return self._cached(('strip_zeros',), transform.strip_zeros, df)
+
+    def _update_table(self, df):
+        self.displayed_df = df
+        self.df_viewer.set_dataframe(
+            df, (self.tree_widget.selection_key, self.freq, self.agg,
+                 self.strip_zeros.isChecked()))
+
+    def _update_stats(self, df):
+        keys = self.tree_widget.selection.column_keys()
+        if len(keys) != len(df.columns):
+            selection_key = self.tree_widget.selection_key
+            keys = [(selection_key, i, label)
+                    for i, label in enumerate(df.columns)]
+        settings = (self.freq, self.agg, self.strip_zeros.isChecked())
+        self.stats_viewer.set_dataframe(df, [key + settings for key in keys])
+
+    def _update_plot(self, df):
+        self.df_plot_viewer.set_dataframe(df)
         self.df_plot_viewer.draw()
 
-    def save_to_csv(self):
-        """Save the contents of the currently selected DataFrame to a csv file
+    def export_dataframe(self):
+        """Export the displayed DataFrame on a background thread, in the
+        format of the extension chosen, showing the progress of the export
         """
-        filepath, _ = QtGui.QFileDialog.getSaveFileName(self, 'Enter filename')
-        self.df_plot_viewer.dataframe.to_csv(filepath)
+        filepath, selected = QtGui.QFileDialog.getSaveFileName(
+            self, 'Export', '', ';;'.join(self.export_filters))
+        if not filepath:
+            return
+        if os.path.splitext(filepath)[1].lower() not in export.FORMATS:
+            filepath += self.export_filters[selected]
+        thread = ExportThread(self.displayed_df, filepath, self)
+        dialog = QtGui.QProgressDialog(
+            'Exporting {}'.format(os.path.basename(filepath)), 'Cancel', 0,
+            100, self)
+        dialog.setWindowModality(QtCore.Qt.NonModal)
+        thread.progress.connect(dialog.setValue)
+        dialog.canceled.connect(thread.cancel)
+        thread.finished.connect(dialog.close)
+        thread.finished.connect(dialog.deleteLater)
+        thread.exported.connect(self._exported)
+        thread.failed.connect(self._export_failed)
+        thread.start()
+
+    def show_memory(self, total):
+        """Show the memory held by the objects of the tree against the budget
+        on the status bar"""
+        self.memory_label.setText('Memory {:.2f} / {:.2f} GB'.format(
+            total / 2.0 ** 30, self.tree_widget.memory.budget / 2.0 ** 30))
+
+    def _exported(self, filepath):
+        self.statusBar().showMessage('Exported {}'.format(filepath), 5000)
+
+    def _export_failed(self, filepath, message):
+        if message:
+            QtGui.QMessageBox.warning(
+                self, 'Export failed', '{}\n{}'.format(filepath, message))
 
     @staticmethod
     def action(*args, **kwargs):
@@ -357,7 +1130,7 @@ class PandasViewer(QtGui.QMainWindow):
             action.triggered.connect(event)
         return action
 
-    @update_dataframe
+    @update_dataframe('resample')
     def change_freq(self, freq):
         """Resample the original pd.DataFrame to frequency freq
 
@@ -370,7 +1143,7 @@ class PandasViewer(QtGui.QMainWindow):
         for action in self.freq_submenu.actions():
             action.setChecked(action.text() == freq)
 
-    @update_dataframe
+    @update_dataframe('resample')
     def change_agg(self, how):
         """Change the method of aggregation/resample
 
@@ -383,25 +1156,67 @@ class PandasViewer(QtGui.QMainWindow):
         for action in self.how_submenu.actions():
             action.setChecked(action.text() == how)
 
-    @update_dataframe
+    @update_dataframe('plot')
     def change_chart(self, chart_type):
         self.df_plot_viewer.chart_type = chart_type
         for action in self.chart_type_submenu.actions():
             action.setChecked(action.text() == chart_type)
 
+    @update_dataframe('plot')
+    def change_decimation(self, method):
+        """Change the method used to reduce each series to the pixel width of
+        the plot, 'none' plots every point
+
+        Parameters
+        ----------
+        method: str
+            One of 'none', 'minmax' or 'lttb'
+        """
+        self.df_plot_viewer.decimation = None if method == 'none' else method
+        for action in self.decimation_submenu.actions():
+            action.setChecked(action.text() == method)
+
     def change_legend(self):
         """Set the visibility of the subplot legend to match the checked status
         of the submenu item.  The submenu item is checkable and as such changes
         state automatically when clicked
         """
-        self.df_plot_viewer.legend.set_visible(self.legend_action.isChecked())
+        self.df_plot_viewer.set_legend_visible(self.legend_action.isChecked())
         self.df_plot_viewer.draw()
 
-    @update_dataframe
+    def change_profile(self):
+        """Record timings of the hot paths while the menu item is checked"""
+        profiling.profiler.enabled = self.profile_action.isChecked()
+        if not profiling.profiler.enabled:
+            self.statusBar().clearMessage()
+
+    def show_profile(self, events):
+        """Show the timings of the spans of a top level span in the status bar
+
+        Parameters
+        ----------
+        events: list(dict)
+            The spans, the top level span last
+        """
+        self.statusBar().showMessage(profiling.format_events(events))
+
+    def export_trace(self):
+        """Save the recorded timings as a Chrome trace or a JSON list"""
+        chrome = 'Chrome trace (*.json)'
+        filepath, selected = QtGui.QFileDialog.getSaveFileName(
+            self, 'Export trace', '', ';;'.join([chrome, 'JSON (*.json)']))
+        if not filepath:
+            return
+        if selected == chrome:
+            profiling.profiler.to_chrome_trace(filepath)
+        else:
+            profiling.profiler.to_json(filepath)
+
+    @update_dataframe('mask')
     def change_strip_zeros(self):
         pass
 
-    @update_dataframe
+    @update_dataframe('source')
     def open_file(self):
         open_dirpath = self.settings.value('open_dirpath')
         if open_dirpath is None:
@@ -412,6 +1227,22 @@ class PandasViewer(QtGui.QMainWindow):
         if filepath != '':
             self.tree_widget.add_file_to_tree(filepath)
 
+    def open_archive(self):
+        """Choose a directory, /md by default, and add it to the tree as an
+        archive.  The directory is scanned into an index on a background
+        thread and files are only loaded when their items are selected
+        """
+        archive_dirpath = self.settings.value('archive_dirpath')
+        if archive_dirpath is None:
+            archive_dirpath = '/md' if os.path.exists('/md') \
+                else os.path.expanduser('~')
+        dirpath = QtGui.QFileDialog.getExistingDirectory(
+            self, 'Select archive to open', archive_dirpath)
+        if dirpath != '':
+            dirpath = os.path.normpath(dirpath)
+            self.settings.setValue('archive_dirpath', dirpath)
+            self.tree_widget.add_file_to_tree(dirpath)
+
     def reset_all(self):
         [action.setChecked(False) for action in self.freq_submenu.actions()]
         [action.setChecked(False) for action in self.how_submenu.actions()]
@@ -453,6 +1284,7 @@ def main():
     app = QtGui.QApplication(sys.argv)
     pandas_viewer = PandasViewer()
     pandas_viewer.show()
+    QtCore.QTimer.singleShot(0, warm_imports)
     app.exec_()
 
 if __name__ == '__main__':